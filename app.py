@@ -1,10 +1,20 @@
 import argparse
+import cProfile
 import json
 import logging
-
-from prismfolio import brapi
+import sys
+
+from prismfolio import brapi, instrumentation
+from prismfolio.batch import BatchRebalancer
+from prismfolio.instrumentation import Metrics
+from prismfolio.quote import QuoteBook
+from prismfolio.quotestore import QuoteStore
+from prismfolio.suggestionoutput import OUTPUT_FORMATS, TABLE, write_suggestion
+from prismfolio.throttling import CircuitBreaker, RateLimiter
 from prismfolio.investmentsuggestion import WalletInvestmentSuggestion
 from prismfolio.wallet import Wallet
+from prismfolio.walletloader import JSON, NDJSON, WalletDocumentError, iter_documents
+from prismfolio.wholesharesuggestion import WholeShareInvestmentSuggestion
 
 
 def argument_parser():
@@ -12,6 +22,38 @@ def argument_parser():
     parser.add_argument('input_data')
     parser.add_argument('new_investment_value', type=float)
     parser.add_argument('-d', '--dry-run', action='store_true')
+    parser.add_argument('-j', '--max-workers', type=int, default=None,
+                        help='price the assets one ticker per request using this many threads')
+    parser.add_argument('-w', '--whole-shares', action='store_true',
+                        help='spend the money left after rounding down to whole shares')
+    parser.add_argument('--max-requests-per-second', type=float, default=None)
+    parser.add_argument('--max-requests-per-minute', type=float, default=None)
+    parser.add_argument('--quote-store', default=None,
+                        help='SQLite file used to keep quotes between runs')
+    parser.add_argument('--max-age', type=float, default=3600.0,
+                        help='seconds a stored quote is served without fetching it again')
+    parser.add_argument('--offline', action='store_true',
+                        help='price only from the last quotes kept in --quote-store')
+    parser.add_argument('--batch', action='store_true',
+                        help='read one wallet per line of input_data and print one JSON result '
+                             'per wallet')
+    parser.add_argument('--stream', action='store_true',
+                        help='read the wallets of input_data one at a time and suggest for each')
+    parser.add_argument('--input-format', choices=[NDJSON, JSON], default=None,
+                        help='format of input_data in --stream and --batch modes; by default '
+                             '--batch reads one wallet per line and --stream detects a JSON '
+                             'array or a sequence of JSON objects')
+    parser.add_argument('--output-format', choices=OUTPUT_FORMATS, default=TABLE,
+                        help='print the suggestion as a table, one JSON document, one JSON '
+                             'object per asset or CSV rows')
+    parser.add_argument('--metrics-output', default=None,
+                        help="write a summary of stage timings and upstream calls to this file "
+                             "('-' for stderr)")
+    parser.add_argument('--metrics-format', choices=['json', 'prometheus'], default='json')
+    parser.add_argument('--profile', default=None,
+                        help='run under cProfile and write the stats to this file')
+    parser.add_argument('--processes', type=int, default=None,
+                        help='number of processes computing suggestions in --batch mode')
     return parser.parse_args()
 
 
@@ -19,52 +61,155 @@ def dry_run_function(_):
     return 1.0
 
 
-def display_suggestion(suggestion: WalletInvestmentSuggestion):
-    _display_group_layout = "{}\t Investment: R$ {:5.2f}"
-    _table_header = "asset\t| investment\t| quantity\t| unit price\t| left\t\t| % to buy one more | current participation"
-    _display_asset_layout = "{}\t| R$ {:5.2f}\t| {:4d} shares\t| R$ {:5.2f}\t| R$ {:5.2f}\t| {:15.2f} % | {:2.2f} %"
+def dry_run_bulk_function(codes):
+    return {code: dry_run_function(code) for code in codes}
+
+
+def read_batch_documents(path, new_investment_value, input_format=None):
+    if input_format == JSON:
+        for number, document in enumerate(iter_documents(path, input_format), start=1):
+            if not isinstance(document, dict):
+                yield number, document, new_investment_value
+                continue
+            yield (document.get('id', number), document,
+                   document.get('contribution', new_investment_value))
+        return
+
+    with open(path, encoding="utf-8") as fp:
+        for line_number, line in enumerate(fp, start=1):
+            if not line.strip():
+                continue
+
+            try:
+                document = json.loads(line)
+            except ValueError:
+                yield line_number, None, new_investment_value
+                continue
+
+            if not isinstance(document, dict):
+                yield line_number, document, new_investment_value
+                continue
+
+            yield (document.get('id', line_number), document,
+                   document.get('contribution', new_investment_value))
 
-    for group in suggestion:
-        if group.get_suggested_investment() == 0:
-            pass
 
-        print(_display_group_layout.format(group.get_investment_group().get_name(),
-                                           group.get_suggested_investment()))
-        print(_table_header)
-        for asset in group:
-            if asset.get_suggested_investment() == 0:
-                pass
-            print(_display_asset_layout.format(
-                asset.get_asset().get_code().ljust(6),
-                asset.get_suggested_investment(),
-                int(asset.get_suggested_shares_buying()),
-                asset.get_asset().get_price(),
-                asset.get_remainder(),
-                100 * (asset.get_remainder() / asset.get_asset().get_price()),
-                asset.get_asset().get_current_participation()))
+def display_suggestion(suggestion: WalletInvestmentSuggestion, output_format=TABLE,
+                       header=True, wallet_id=None):
+    write_suggestion(suggestion, sys.stdout, output_format, header, wallet_id)
 
 
 def main():
     args = argument_parser()
-    stock_price_acquisition_function = brapi.get_current_stock_price
-    stock_price_earning_acquisitiong_function = brapi.get_price_earning
+    if args.metrics_output is not None:
+        instrumentation.set_metrics(Metrics())
+
+    try:
+        if args.profile is None:
+            run(args)
+        else:
+            profiler = cProfile.Profile()
+            try:
+                profiler.runcall(run, args)
+            finally:
+                profiler.dump_stats(args.profile)
+    finally:
+        if args.metrics_output is not None:
+            write_metrics(instrumentation.get_metrics(), args.metrics_output, args.metrics_format)
+
+
+def write_metrics(metrics: Metrics, path, metrics_format):
+    summary = metrics.to_prometheus() if metrics_format == 'prometheus' else metrics.to_json()
+    if path == '-':
+        sys.stderr.write(summary)
+        return
+
+    with open(path, 'w', encoding="utf-8") as fp:
+        fp.write(summary)
+
+
+def run(args):
+    brapi.set_default_client(brapi.BrapiClient(
+        pool_size=args.max_workers or 10,
+        rate_limiter=RateLimiter(args.max_requests_per_second, args.max_requests_per_minute),
+        circuit_breaker=CircuitBreaker(),
+        fallback_to_last_quote=True))
+
+    if args.offline and args.quote_store is None:
+        logging.error("--offline requires --quote-store.")
+        return
+
+    if args.quote_store is not None:
+        quote_book = QuoteStore(args.quote_store,
+                                None if args.offline else brapi.get_quote,
+                                None if args.offline else brapi.get_quotes,
+                                max_age=args.max_age)
+    else:
+        quote_book = QuoteBook(brapi.get_quote, brapi.get_quotes)
+    stock_price_acquisition_function = quote_book.get_price
+    stock_price_bulk_acquisition_function = quote_book.get_prices
+    stock_price_earning_acquisitiong_function = quote_book.get_price_earnings
 
     if args.dry_run:
         stock_price_acquisition_function = dry_run_function
+        stock_price_bulk_acquisition_function = dry_run_bulk_function
         stock_price_earning_acquisitiong_function = dry_run_function
 
-    with open(args.input_data, encoding="utf-8") as fp:
-        input_dict = json.load(fp)
+    suggestion_class = WalletInvestmentSuggestion
+    if args.whole_shares:
+        suggestion_class = WholeShareInvestmentSuggestion
+
+    if args.batch:
+        rebalancer = BatchRebalancer(stock_price_bulk_acquisition_function, suggestion_class,
+                                     max_workers=args.processes)
+        try:
+            for result in rebalancer.run(read_batch_documents(
+                    args.input_data, args.new_investment_value, args.input_format)):
+                print(json.dumps(result.to_dict()))
+        except WalletDocumentError as err:
+            logging.error(err)
+        return
+
+    def suggest(wallet):
+        if args.max_workers is None:
+            wallet.update_asset_values_in_bulk(stock_price_bulk_acquisition_function)
+        else:
+            wallet.update_asset_values(stock_price_acquisition_function,
+                                       max_workers=args.max_workers)
+        return suggestion_class(wallet, args.new_investment_value)
+
+    if args.stream:
+        _header = True
+        try:
+            for number, document in enumerate(iter_documents(args.input_data,
+                                                             args.input_format), start=1):
+                if args.output_format == TABLE:
+                    print(f"Wallet {number}")
+                try:
+                    with instrumentation.stage('load_input'):
+                        wallet = Wallet.from_dict_in_bulk(document)
+                    suggestion = suggest(wallet)
+                except Exception as err:
+                    logging.error(err)
+                    continue
+                with instrumentation.stage('display'):
+                    display_suggestion(suggestion, args.output_format, _header, number)
+                _header = False
+        except WalletDocumentError as err:
+            logging.error(err)
+        return
 
     try:
-        wallet = Wallet.from_dict(input_dict)
-        wallet.update_asset_values(stock_price_acquisition_function)
-        suggestion = WalletInvestmentSuggestion(wallet, args.new_investment_value)
+        with instrumentation.stage('load_input'):
+            with open(args.input_data, encoding="utf-8") as fp:
+                wallet = Wallet.from_dict(json.load(fp))
+        suggestion = suggest(wallet)
     except Exception as err:
         logging.error(err)
         return
 
-    display_suggestion(suggestion)
+    with instrumentation.stage('display'):
+        display_suggestion(suggestion, args.output_format)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,65 @@
+from benchmarks.synthetic import generate_prices, generate_wallet_dict
+from prismfolio.asset import Asset
+from prismfolio.investmentsuggestion import WalletInvestmentSuggestion
+from prismfolio.wallet import Wallet
+
+import argparse
+import gc
+import json
+import logging
+import tracemalloc
+
+
+def argument_parser():
+    parser = argparse.ArgumentParser(
+        description='measure the memory held by a large synthetic wallet and its suggestion')
+    parser.add_argument('--assets', type=int, default=200000)
+    parser.add_argument('--groups', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    return parser.parse_args()
+
+
+def build_wallet(number_of_assets, number_of_groups, seed):
+    wallet = Wallet.from_dict(generate_wallet_dict(number_of_assets, number_of_groups, seed))
+    prices = generate_prices(wallet.get_asset_codes(), seed)
+    wallet.update_asset_values_in_bulk(lambda x: prices)
+    return wallet
+
+
+def measure(function):
+    gc.collect()
+    tracemalloc.start()
+    _before = tracemalloc.take_snapshot()
+    result = function()
+    gc.collect()
+    _after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    return result, sum(x.size_diff for x in _after.compare_to(_before, 'filename'))
+
+
+def build_assets(codes):
+    return [Asset(x, 1, 1.0) for x in codes]
+
+
+def main():
+    args = argument_parser()
+    logging.getLogger().setLevel(logging.ERROR)
+    _number_of_assets = args.assets
+    _codes = ['A{}'.format(x) for x in range(_number_of_assets)]
+    _assets, asset_bytes = measure(lambda: build_assets(_codes))
+    del _assets
+    wallet, wallet_bytes = measure(lambda: build_wallet(args.assets, args.groups, args.seed))
+    _suggestion, suggestion_bytes = measure(lambda: WalletInvestmentSuggestion(wallet, 10000.0))
+    print(json.dumps({
+        'assets': _number_of_assets,
+        'groups': args.groups,
+        'asset_object_bytes': asset_bytes / _number_of_assets,
+        'wallet_bytes': wallet_bytes,
+        'wallet_bytes_per_asset': wallet_bytes / _number_of_assets,
+        'suggestion_bytes': suggestion_bytes,
+        'suggestion_bytes_per_asset': suggestion_bytes / _number_of_assets,
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+from benchmarks.synthetic import generate_prices, generate_wallet_dict
+from prismfolio.investmentsuggestion import WalletInvestmentSuggestion
+from prismfolio.wallet import Wallet
+from prismfolio.wholesharesuggestion import WholeShareInvestmentSuggestion
+
+import app
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import platform
+import subprocess
+import time
+import tracemalloc
+
+
+def argument_parser():
+    parser = argparse.ArgumentParser(
+        description='time the wallet pipeline on synthetic wallets and print the results as JSON')
+    parser.add_argument('--assets', type=int, nargs='+', default=[10, 1000, 10000, 100000])
+    parser.add_argument('--groups', type=int, default=20)
+    parser.add_argument('--codes', type=int, default=None,
+                        help='number of distinct tickers; by default every asset has its own')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--contribution', type=float, default=10000.0)
+    parser.add_argument('--no-memory', action='store_true',
+                        help='skip the tracemalloc pass that measures peak memory')
+    parser.add_argument('-o', '--output', default=None, help='write the JSON results to a file')
+    return parser.parse_args()
+
+
+def get_stages():
+    stages = [('json_load', lambda x: json.loads(x['text'])),
+              ('from_dict', lambda x: Wallet.from_dict(x['document']))]
+    if hasattr(Wallet, 'from_dict_in_bulk'):
+        stages.append(('from_dict_in_bulk', lambda x: Wallet.from_dict_in_bulk(x['document'])))
+
+    stages += [('update_asset_values', lambda x: x['wallet'].update_asset_values(
+                   x['prices'].__getitem__)),
+               ('suggestion', lambda x: consume(WalletInvestmentSuggestion(
+                   x['wallet'], x['contribution']))),
+               ('whole_share_suggestion', lambda x: consume(WholeShareInvestmentSuggestion(
+                   x['wallet'], x['contribution']))),
+               ('display_suggestion', lambda x: render(x['suggestion']))]
+    return stages
+
+
+def consume(suggestion):
+    for group_suggestion in suggestion:
+        group_suggestion.get_suggested_investment()
+        for asset_suggestion in group_suggestion:
+            asset_suggestion.get_suggested_shares_buying()
+    return suggestion
+
+
+def render(suggestion):
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        app.display_suggestion(suggestion)
+    return output.getvalue()
+
+
+def prepare(number_of_assets, args):
+    document = generate_wallet_dict(number_of_assets, min(args.groups, number_of_assets),
+                                    args.seed, args.codes)
+    wallet = Wallet.from_dict(document)
+    prices = generate_prices(wallet.get_asset_codes(), args.seed)
+    wallet.update_asset_values(prices.__getitem__)
+    return {'document': document, 'text': json.dumps(document), 'wallet': wallet,
+            'prices': prices, 'contribution': args.contribution,
+            'suggestion': consume(WalletInvestmentSuggestion(wallet, args.contribution))}
+
+
+def time_stage(function, context, repeat):
+    durations = list()
+    for _ in range(repeat):
+        _start = time.perf_counter()
+        function(context)
+        durations.append(time.perf_counter() - _start)
+    return min(durations), sum(durations) / len(durations)
+
+
+def measure_peak_memory(function, context):
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        _baseline = tracemalloc.get_traced_memory()[0]
+        function(context)
+        return tracemalloc.get_traced_memory()[1] - _baseline
+    finally:
+        tracemalloc.stop()
+
+
+def get_metadata(args):
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {'commit': commit, 'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(), 'groups': args.groups, 'codes': args.codes,
+            'seed': args.seed, 'repeat': args.repeat, 'contribution': args.contribution}
+
+
+def run(args):
+    results = list()
+    for number_of_assets in args.assets:
+        context = prepare(number_of_assets, args)
+        for stage, function in get_stages():
+            best, mean = time_stage(function, context, args.repeat)
+            results.append({
+                'stage': stage,
+                'assets': number_of_assets,
+                'best_seconds': best,
+                'mean_seconds': mean,
+                'assets_per_second': number_of_assets / best if best > 0 else None,
+                'peak_memory_bytes': None if args.no_memory else
+                measure_peak_memory(function, context)})
+
+    return {'metadata': get_metadata(args), 'results': results}
+
+
+def main():
+    args = argument_parser()
+    logging.getLogger().setLevel(logging.ERROR)
+    report = json.dumps(run(args), indent=2)
+    if args.output is None:
+        print(report)
+        return
+
+    with open(args.output, 'w', encoding="utf-8") as fp:
+        fp.write(report + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+import random
+
+
+def generate_wallet_dict(number_of_assets, number_of_groups=10, seed=0, number_of_codes=None):
+    if number_of_groups < 1 or number_of_assets < number_of_groups:
+        raise ValueError(f"Expected at least one asset per group. Received {number_of_assets} "
+                         f"assets for {number_of_groups} groups")
+
+    _random = random.Random(seed)
+    _group_sizes = [number_of_assets // number_of_groups + (x < number_of_assets % number_of_groups)
+                    for x in range(number_of_groups)]
+    investment_groups = list()
+    _asset_number = 0
+    for group_number, (group_size, target_participation) in enumerate(
+            zip(_group_sizes, _split_percentage(_random, number_of_groups))):
+        assets = list()
+        for asset_target_participation in _split_percentage(_random, group_size):
+            _code_number = _asset_number if number_of_codes is None else \
+                _random.randrange(number_of_codes)
+            assets.append({'code': 'T{:06d}'.format(_code_number),
+                           'quantity': _random.randint(1, 1000),
+                           'target_participation': asset_target_participation})
+            _asset_number += 1
+
+        investment_groups.append({'name': 'Group {}'.format(group_number),
+                                  'target_participation': target_participation,
+                                  'assets': assets})
+
+    return {'investment_groups': investment_groups}
+
+
+def generate_prices(codes, seed=0):
+    _random = random.Random(seed)
+    return {x: round(_random.uniform(1.0, 200.0), 2) for x in sorted(codes)}
+
+
+def _split_percentage(_random, parts):
+    weights = [_random.uniform(1.0, 10.0) for _ in range(parts)]
+    _total = sum(weights)
+    percentages = [round(100.0 * x / _total, 6) for x in weights[:-1]]
+    percentages.append(max(0.0, 100.0 - sum(percentages)))
+    return percentages
@@ -1 +1,97 @@
-# it is intentionally left blank
+from prismfolio.asset import Asset
+from prismfolio.investmentgroup import InvestmentGroup
+from prismfolio.quote import Quote
+from prismfolio.wallet import Wallet
+
+import json
+import random
+import requests
+
+
+class FakeClock:
+    def __init__(self, now=0.0, step=0.0):
+        self.now = now
+        self._step = step
+
+    def __call__(self):
+        self.now += self._step
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class FakeResponse:
+    def __init__(self, status_code, data, headers=None, text=None):
+        self.status_code = status_code
+        self.headers = headers or dict()
+        self.text = text if text is not None else json.dumps(data)
+        self._data = data
+
+    def json(self):
+        if self._data is None:
+            raise requests.JSONDecodeError("Expecting value", self.text, 0)
+        return self._data
+
+
+class FakeSession:
+    def __init__(self, failures=None):
+        self.requested_urls = list()
+        self.timeouts = list()
+        self._failures = list(failures or [])
+
+    def get(self, url, params=None, timeout=None):
+        self.requested_urls.append(url)
+        self.timeouts.append(timeout)
+        if self._failures:
+            failure = self._failures.pop(0)
+            if isinstance(failure, Exception):
+                raise failure
+            return failure
+
+        codes = url.rsplit('/', 1)[-1].split(',')
+        return FakeResponse(200, {'results': [
+            {'symbol': code, 'regularMarketPrice': float(len(code)), 'priceEarnings': 2.0}
+            for code in codes if code != 'MISSING']})
+
+    def close(self):
+        pass
+
+
+def counting_quote_function(calls, price=10.0, price_earnings=3.0):
+    def quote_function(code):
+        calls.append(code)
+        return Quote(code, price, price_earnings)
+    return quote_function
+
+
+def make_wallet(priced=True):
+    w = Wallet()
+    stocks = InvestmentGroup('Stocks', 60.0)
+    stocks.add_asset(Asset('BBAS3', 10, 50.0))
+    stocks.add_asset(Asset('ITSA4', 5, 50.0))
+    reits = InvestmentGroup('REITs', 40.0)
+    reits.add_asset(Asset('MXRF11', 20, 100.0))
+    w.add_investment_group(stocks)
+    w.add_investment_group(reits)
+    if priced:
+        w.update_asset_values(lambda x: float(len(x)))
+    return w
+
+
+def make_random_wallet(seed, number_of_groups=5, assets_per_group=6, max_price=500.0,
+                       vary_group_sizes=False):
+    rng = random.Random(seed)
+    prices = dict()
+    w = Wallet()
+    for i in range(number_of_groups):
+        g = InvestmentGroup('G{}'.format(i), 100.0 / number_of_groups)
+        number_of_assets = rng.randint(1, assets_per_group) if vary_group_sizes else \
+            assets_per_group
+        for j in range(number_of_assets):
+            code = 'A{}_{}'.format(i, j)
+            prices[code] = round(rng.uniform(1.0, max_price), 2)
+            g.add_asset(Asset(code, rng.randint(1, 50), 100.0 / number_of_assets))
+        w.add_investment_group(g)
+    w.update_asset_values(prices.get)
+    return w
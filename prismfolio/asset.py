@@ -1,4 +1,5 @@
 from prismfolio.targetparticipation import TargetParticipation
+from prismfolio.walletschema import check_value, get_code_error, get_quantity_error
 
 import json
 
@@ -12,15 +13,19 @@ class AssetWithNoPrice(Exception):
 
 
 class Asset(TargetParticipation):
+    __slots__ = ('_code', '_quantity', '_price', '_price_earnings', '_current_participation',
+                 '_observers')
+
     def __init__(self, code: str, quantity: int, target_participation: float):
-        self._check_code_argument(code)
-        self._check_quantity_argument(quantity)
+        check_value(code, get_code_error)
+        check_value(quantity, get_quantity_error)
         super().__init__(target_participation)
         self._code = code
         self._quantity = quantity
         self._price = None
         self._price_earnings = 0.0
         self._current_participation = 0.0
+        self._observers = tuple()
 
     # Public
     def has_current_price(self):
@@ -46,18 +51,22 @@ class Asset(TargetParticipation):
         return self._current_participation
 
     def buy(self, quantity: int):
-        self._check_quantity_argument(quantity)
+        check_value(quantity, get_quantity_error)
+        _old_amount = self._get_total_amount_or_none()
         self._quantity += quantity
+        self._notify_change(_old_amount)
 
     def update_current_participation(self, total_budget):
         self._current_participation = 100 * (self.get_total_amount() / total_budget)
 
     def update_price(self, pricing_function):
+        _old_amount = self._get_total_amount_or_none()
         try:
             self._price = pricing_function(self._code)
         except Exception as err:
             raise AssetPricingError(f"It is not possible to get the price of {self._code}. "
                                     f"{err}")
+        self._notify_change(_old_amount)
         return self._price
 
     def update_price_earnings(self, price_earnings_function):
@@ -68,6 +77,36 @@ class Asset(TargetParticipation):
                                     f"{err}")
         return self._price_earnings
 
+    async def update_price_async(self, pricing_function):
+        _old_amount = self._get_total_amount_or_none()
+        try:
+            self._price = await pricing_function(self._code)
+        except Exception as err:
+            raise AssetPricingError(f"It is not possible to get the price of {self._code}. "
+                                    f"{err}")
+        self._notify_change(_old_amount)
+        return self._price
+
+    async def update_price_earnings_async(self, price_earnings_function):
+        try:
+            self._price_earnings = await price_earnings_function(self._code)
+        except Exception as err:
+            raise AssetPricingError(f"It is not possible to get the price earning of {self._code}. "
+                                    f"{err}")
+        return self._price_earnings
+
+    def update_quote(self, quote_function):
+        try:
+            quote = quote_function(self._code)
+        except Exception as err:
+            raise AssetPricingError(f"It is not possible to get the quote of {self._code}. "
+                                    f"{err}")
+        _old_amount = self._get_total_amount_or_none()
+        self._price = quote.get_price()
+        self._price_earnings = quote.get_price_earnings()
+        self._notify_change(_old_amount)
+        return quote
+
     def get_total_amount(self):
         return self.get_price() * self.get_quantity()
 
@@ -82,16 +121,28 @@ class Asset(TargetParticipation):
         return cls(code=dict_data.get('code'), quantity=dict_data.get('quantity'),
                    target_participation=dict_data.get('target_participation'))
 
-    def _check_code_argument(self, code: str):
-        if not isinstance(code, str):
-            raise TypeError(f"Code value must be a string. Got {type(code)} {code}")
-
-        if len(code) == 0:
-            raise ValueError("Code value must be a non empty string.")
+    # Private
+    @classmethod
+    def _from_trusted(cls, code, quantity, target_participation):
+        _asset = cls.__new__(cls)
+        _asset._set_trusted_target_participation(target_participation)
+        _asset._code = code
+        _asset._quantity = quantity
+        _asset._price = None
+        _asset._price_earnings = 0.0
+        _asset._current_participation = 0.0
+        _asset._observers = tuple()
+        return _asset
+
+    def _add_observer(self, observer):
+        self._observers += (observer,)
+
+    def _get_total_amount_or_none(self):
+        if not self.has_current_price():
+            return None
+        return self.get_total_amount()
 
-    def _check_quantity_argument(self, quantity: int):
-        if isinstance(quantity, bool) or not isinstance(quantity, int):
-            raise TypeError(f"Quantity value must be an integer. Got {type(quantity)} {quantity}")
+    def _notify_change(self, old_amount):
+        for observer in self._observers:
+            observer._on_asset_changed(self, old_amount)
 
-        if quantity < 0:
-            raise ValueError(f"Quantity value can't be negative. Received {quantity}")
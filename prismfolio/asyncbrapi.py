@@ -0,0 +1,41 @@
+from prismfolio.brapi import BrapiClient, MAX_TICKERS_PER_REQUEST
+
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import functools
+
+
+class AsyncBrapiClient:
+    def __init__(self, client: BrapiClient = None, max_concurrency=10):
+        self._client = client if client is not None else BrapiClient(pool_size=max_concurrency)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency)
+
+    # Public
+    async def get_quote(self, stock_code):
+        return await self._run(self._client.get_quote, stock_code)
+
+    async def get_quotes(self, stock_codes, batch_size=MAX_TICKERS_PER_REQUEST):
+        return await self._run(self._client.get_quotes, stock_codes, batch_size)
+
+    async def get_current_stock_price(self, stock_code):
+        return (await self.get_quote(stock_code)).get_price()
+
+    async def get_price_earning(self, stock_code):
+        return (await self.get_quote(stock_code)).get_price_earnings()
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self._client.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        self.close()
+
+    # Private
+    async def _run(self, function, *args):
+        async with self._semaphore:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, functools.partial(function, *args))
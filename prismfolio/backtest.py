@@ -0,0 +1,309 @@
+from prismfolio.columnarwallet import ColumnarWallet
+from prismfolio.vectorizedsuggestion import allocate_amounts, sum_by_group
+from prismfolio.wallet import Wallet
+
+import argparse
+import csv
+import io
+import json
+import math
+import sys
+
+import numpy as np
+
+
+class PriceHistory:
+    def __init__(self, dates, codes, prices):
+        self._dates = list(dates)
+        self._codes = list(codes)
+        self._prices = np.asarray(prices, dtype=np.float64).reshape(len(self._dates),
+                                                                     len(self._codes))
+        if len(set(self._codes)) != len(self._codes):
+            raise ValueError("Each ticker should have a single price column.")
+
+        if (self._prices <= 0).any():
+            raise ValueError("Prices should be positive values.")
+
+        self._index = {x: i for i, x in enumerate(self._codes)}
+
+    # Public
+    def get_dates(self):
+        return self._dates
+
+    def get_codes(self):
+        return self._codes
+
+    def get_prices(self):
+        return self._prices
+
+    def get_prices_of(self, codes):
+        _missing = [x for x in codes if x not in self._index]
+        if _missing:
+            raise KeyError(f"The price history has no prices for {', '.join(sorted(_missing))}")
+
+        return _forward_fill(self._prices[:, [self._index[x] for x in codes]])
+
+    def __len__(self):
+        return len(self._dates)
+
+    @classmethod
+    def from_csv(cls, path):
+        with open(path, newline='', encoding="utf-8") as fp:
+            rows = list(csv.reader(fp))
+        if not rows:
+            raise ValueError(f"{path} has no price rows.")
+
+        header = [x.strip().lower() for x in rows[0]]
+        if header == ['date', 'code', 'price']:
+            return cls.from_records((x[0], x[1], float(x[2])) for x in rows[1:] if x)
+
+        return cls([x[0] for x in rows[1:] if x], rows[0][1:],
+                   [[_parse_price(y) for y in x[1:]] for x in rows[1:] if x])
+
+    @classmethod
+    def from_parquet(cls, path):
+        try:
+            import pandas as pd
+        except ImportError as err:
+            raise ImportError("Reading Parquet price histories requires pandas with a Parquet "
+                              "engine such as pyarrow.") from err
+
+        frame = pd.read_parquet(path)
+        if {'date', 'code', 'price'} <= set(frame.columns):
+            frame = frame.pivot(index='date', columns='code', values='price')
+        else:
+            frame = frame.set_index(frame.columns[0])
+        frame = frame.sort_index()
+        return cls([str(x) for x in frame.index], [str(x) for x in frame.columns],
+                   frame.to_numpy(dtype=np.float64))
+
+    @classmethod
+    def from_file(cls, path):
+        if str(path).lower().endswith('.parquet'):
+            return cls.from_parquet(path)
+        return cls.from_csv(path)
+
+    @classmethod
+    def from_records(cls, records):
+        _prices = dict()
+        for date, code, price in records:
+            _prices[(date, code)] = price
+        dates = sorted({x for x, _ in _prices})
+        codes = sorted({x for _, x in _prices})
+        _date_index = {x: i for i, x in enumerate(dates)}
+        _code_index = {x: i for i, x in enumerate(codes)}
+        prices = np.full((len(dates), len(codes)), np.nan)
+        for (date, code), price in _prices.items():
+            prices[_date_index[date], _code_index[code]] = price
+        return cls(dates, codes, prices)
+
+
+class BacktestResult:
+    def __init__(self, dates, codes, group_names, contributions, values, cash, quantities,
+                 group_drifts, asset_drifts):
+        self._dates = dates
+        self._codes = codes
+        self._group_names = group_names
+        self._contributions = contributions
+        self._values = values
+        self._cash = cash
+        self._quantities = quantities
+        self._group_drifts = group_drifts
+        self._asset_drifts = asset_drifts
+
+    # Public
+    def get_dates(self):
+        return self._dates
+
+    def get_codes(self):
+        return self._codes
+
+    def get_group_names(self):
+        return self._group_names
+
+    def get_contributions(self):
+        return self._contributions
+
+    def get_invested(self):
+        return np.cumsum(self._contributions)
+
+    def get_values(self):
+        return self._values
+
+    def get_cash(self):
+        return self._cash
+
+    def get_quantities(self):
+        return self._quantities
+
+    def get_group_drifts(self):
+        return self._group_drifts
+
+    def get_asset_drifts(self):
+        return self._asset_drifts
+
+    def get_max_group_drifts(self):
+        return np.abs(self._group_drifts).max(axis=1, initial=0.0)
+
+    def iter_rows(self):
+        _invested = self.get_invested().tolist()
+        _max_drifts = self.get_max_group_drifts().tolist()
+        for period, date in enumerate(self._dates):
+            row = {'date': date,
+                   'contribution': float(self._contributions[period]),
+                   'invested': _invested[period],
+                   'value': float(self._values[period]),
+                   'cash': float(self._cash[period]),
+                   'max_group_drift': _max_drifts[period]}
+            row.update(('drift:' + x, float(y))
+                       for x, y in zip(self._group_names, self._group_drifts[period]))
+            yield row
+
+    def to_dict(self):
+        return {'codes': self._codes,
+                'group_names': self._group_names,
+                'periods': list(self.iter_rows()),
+                'final_quantities': dict(zip(self._codes,
+                                             self._quantities[-1].tolist() if len(self._dates)
+                                             else []))}
+
+
+class Backtest:
+    def __init__(self, wallet, price_history: PriceHistory, contributions, carry_cash=True):
+        self._wallet = wallet if isinstance(wallet, ColumnarWallet) else \
+            ColumnarWallet.from_wallet(wallet)
+        self._price_history = price_history
+        self._contributions = get_contribution_schedule(contributions, len(price_history))
+        self._carry_cash = carry_cash
+
+    # Public
+    def run(self):
+        _wallet = self._wallet
+        _codes = _wallet.get_codes().tolist()
+        _group_index = _wallet.get_group_index()
+        _number_of_groups = len(_wallet.get_group_names())
+        _asset_targets = _wallet.get_asset_targets()
+        _group_targets = _wallet.get_group_targets()
+        prices = self._price_history.get_prices_of(_codes)
+        _periods = len(prices)
+
+        values = np.zeros(_periods)
+        cash = np.zeros(_periods)
+        quantities = np.zeros((_periods, len(_codes)), dtype=np.int64)
+        group_drifts = np.zeros((_periods, _number_of_groups))
+        asset_drifts = np.zeros((_periods, len(_codes)))
+        _quantities = _wallet.get_quantities().copy()
+        _cash = 0.0
+        for period in range(_periods):
+            _prices = prices[period]
+            _available = ~np.isnan(_prices)
+            _contribution = self._contributions[period] + _cash
+
+            _asset_amounts = np.where(_available, _prices * _quantities, 0.0)
+            _group_amounts = sum_by_group(_asset_amounts, _group_index, _number_of_groups)
+            _, _asset_investments = allocate_amounts(
+                _asset_amounts, _group_amounts, _group_amounts.sum(keepdims=True),
+                _asset_targets, _group_targets, _group_index, _contribution)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                _shares = np.where(_available, np.floor_divide(_asset_investments, _prices), 0)
+            _shares = _shares.astype(np.int64)
+            _quantities += _shares
+            _spent = float(np.dot(_shares, np.where(_available, _prices, 0.0)))
+            _cash = _contribution - _spent if self._carry_cash else 0.0
+
+            _asset_amounts = np.where(_available, _prices * _quantities, 0.0)
+            _group_amounts = sum_by_group(_asset_amounts, _group_index, _number_of_groups)
+            values[period] = _group_amounts.sum()
+            cash[period] = _cash
+            quantities[period] = _quantities
+            group_drifts[period] = _get_participations(_group_amounts, values[period]) - \
+                _group_targets
+            asset_drifts[period] = _get_participations(
+                _asset_amounts, _group_amounts[_group_index]) - _asset_targets
+
+        return BacktestResult(self._price_history.get_dates(), _codes,
+                              list(_wallet.get_group_names()), self._contributions, values, cash,
+                              quantities, group_drifts, asset_drifts)
+
+
+def get_contribution_schedule(contributions, periods):
+    if isinstance(contributions, (int, float)):
+        return np.full(periods, float(contributions))
+
+    contributions = np.asarray(contributions, dtype=np.float64)
+    if contributions.shape != (periods,):
+        raise ValueError(f"Expected one contribution per period ({periods}). "
+                         f"Received {contributions.shape[0] if contributions.ndim else 1}")
+    if (contributions < 0).any():
+        raise ValueError("Contributions should not be negative values.")
+    return contributions
+
+
+def _get_participations(amounts, totals):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(totals == 0, 0.0, 100 * (amounts / totals))
+
+
+def _forward_fill(prices):
+    _valid = ~np.isnan(prices)
+    _last = np.where(_valid, np.arange(len(prices))[:, None], 0)
+    np.maximum.accumulate(_last, axis=0, out=_last)
+    filled = prices[_last, np.arange(prices.shape[1])]
+    _seen = np.maximum.accumulate(_valid, axis=0)
+    filled[~_seen] = np.nan
+    return filled
+
+
+def _parse_price(value):
+    value = value.strip()
+    return float(value) if value else math.nan
+
+
+def _read_contributions(value):
+    try:
+        return float(value)
+    except ValueError:
+        with open(value, encoding="utf-8") as fp:
+            return [float(x) for x in fp.read().split()]
+
+
+def argument_parser():
+    parser = argparse.ArgumentParser(
+        description='replay the contribution rule over a historical price table')
+    parser.add_argument('input_data', help='wallet JSON file')
+    parser.add_argument('price_history',
+                        help='CSV or Parquet table, either wide (date, one column per ticker) '
+                             'or long (date, code, price)')
+    parser.add_argument('contributions',
+                        help='contribution per period, or a file with one value per period')
+    parser.add_argument('--no-carry-cash', action='store_true',
+                        help='drop the money left after rounding down to whole shares instead '
+                             'of adding it to the next contribution')
+    parser.add_argument('--output-format', choices=['csv', 'json'], default='csv')
+    return parser.parse_args()
+
+
+def main():
+    args = argument_parser()
+    with open(args.input_data, encoding="utf-8") as fp:
+        wallet = Wallet.from_dict_in_bulk(json.load(fp))
+    result = Backtest(wallet, PriceHistory.from_file(args.price_history),
+                      _read_contributions(args.contributions),
+                      carry_cash=not args.no_carry_cash).run()
+
+    if args.output_format == 'json':
+        sys.stdout.write(json.dumps(result.to_dict()) + '\n')
+        return
+
+    output = io.StringIO()
+    writer = None
+    for row in result.iter_rows():
+        if writer is None:
+            writer = csv.DictWriter(output, list(row), lineterminator='\n')
+            writer.writeheader()
+        writer.writerow(row)
+    sys.stdout.write(output.getvalue())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,158 @@
+from prismfolio.investmentsuggestion import WalletInvestmentSuggestion
+from prismfolio.wallet import Wallet
+
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import itertools
+import logging
+
+
+class BatchResult:
+    def __init__(self, wallet_id, contribution, suggestion=None, error=None):
+        self._wallet_id = wallet_id
+        self._contribution = contribution
+        self._suggestion = suggestion
+        self._error = error
+
+    # Public
+    def get_wallet_id(self):
+        return self._wallet_id
+
+    def get_contribution(self):
+        return self._contribution
+
+    def get_suggestion(self):
+        return self._suggestion
+
+    def get_error(self):
+        return self._error
+
+    def is_ok(self):
+        return self._error is None
+
+    def to_dict(self):
+        if not self.is_ok():
+            return {'id': self._wallet_id, 'contribution': self._contribution,
+                    'error': self._error}
+        return {'id': self._wallet_id, 'contribution': self._contribution,
+                'suggestion': self._suggestion}
+
+
+class BatchRebalancer:
+    def __init__(self, bulk_pricing_function, suggestion_class=WalletInvestmentSuggestion,
+                 max_workers=None, window_size=1000, executor=None):
+        if window_size < 1:
+            raise ValueError(f"Window size should be at least 1. Received {window_size}")
+
+        self._bulk_pricing_function = bulk_pricing_function
+        self._suggestion_class = suggestion_class
+        self._max_workers = max_workers
+        self._window_size = window_size
+        self._executor = executor
+        self._prices = dict()
+
+    # Public
+    def get_prices(self):
+        return self._prices
+
+    def run(self, documents):
+        if self._executor is not None:
+            yield from self._run(documents, self._executor)
+            return
+
+        with ProcessPoolExecutor(max_workers=self._max_workers) as executor:
+            yield from self._run(documents, executor)
+
+    # Private
+    def _run(self, documents, executor):
+        _documents = iter(documents)
+        pending = set()
+        while True:
+            window, error = _read_window(_documents, self._window_size)
+            if window:
+                results, futures = self._submit_window(window, executor)
+                yield from results
+                pending.update(futures)
+            if error is not None or not window:
+                break
+
+            while len(pending) > self._window_size:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                yield from (x.result() for x in done)
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            yield from (x.result() for x in done)
+
+        if error is not None:
+            raise error
+
+    def _submit_window(self, window, executor):
+        results, futures, _codes_by_wallet = list(), list(), list()
+        for wallet_id, wallet_data, contribution in window:
+            try:
+                _codes_by_wallet.append(_get_asset_codes(wallet_data))
+            except Exception as err:
+                _codes_by_wallet.append(None)
+                results.append(BatchResult(wallet_id, contribution,
+                                           error=f"Invalid wallet document. {err}"))
+
+        _pricing_errors = self._price(
+            set(itertools.chain.from_iterable(x for x in _codes_by_wallet if x)))
+
+        for (wallet_id, wallet_data, contribution), codes in zip(window, _codes_by_wallet):
+            if codes is None:
+                continue
+
+            _failed = sorted(x for x in codes if x in _pricing_errors)
+            if _failed:
+                results.append(BatchResult(
+                    wallet_id, contribution,
+                    error=f"It is not possible to get the price of {', '.join(_failed)}. "
+                          f"{_pricing_errors[_failed[0]]}"))
+                continue
+
+            futures.append(executor.submit(
+                _suggest, wallet_id, wallet_data, contribution,
+                {x: self._prices[x] for x in codes if x in self._prices},
+                self._suggestion_class))
+
+        return results, futures
+
+    def _price(self, codes):
+        _missing = sorted(x for x in codes if x not in self._prices)
+        if not _missing:
+            return dict()
+
+        try:
+            self._prices.update(self._bulk_pricing_function(_missing))
+        except Exception as err:
+            logging.error("It is not possible to price %d tickers. %s" % (len(_missing), err))
+            return {x: str(err) for x in _missing}
+        return dict()
+
+
+def _read_window(documents, window_size):
+    window = list()
+    try:
+        for document in itertools.islice(documents, window_size):
+            window.append(document)
+    except Exception as err:
+        return window, err
+    return window, None
+
+
+def _get_asset_codes(wallet_data):
+    if not isinstance(wallet_data, dict):
+        raise TypeError(f"Expected a dict. Got a {type(wallet_data)}")
+    return {asset['code'] for group in wallet_data['investment_groups']
+            for asset in group['assets']}
+
+
+def _suggest(wallet_id, wallet_data, contribution, prices, suggestion_class):
+    try:
+        wallet = Wallet.from_dict_in_bulk(wallet_data)
+        wallet.update_asset_values_in_bulk(lambda x: prices)
+        suggestion = suggestion_class(wallet, contribution)
+        return BatchResult(wallet_id, contribution, suggestion=suggestion.to_dict())
+    except Exception as err:
+        return BatchResult(wallet_id, contribution, error=str(err))
@@ -1,32 +1,246 @@
+from prismfolio import instrumentation
+from prismfolio.quote import Quote
+from prismfolio.throttling import CircuitBreaker, CircuitOpenError, RateLimiter
+
 import requests
+import requests.adapters
+import logging
 import os
+import random
+import time
 
 
-def get_current_stock_price(stock_code):
-    url = "https://brapi.dev/api/quote/{}".format(stock_code.upper())
-    params = {
-        'token': os.getenv('STOCK_API_KEY'),
-    }
-    response = requests.get(url, params=params)
+QUOTE_URL = "https://brapi.dev/api/quote/{}"
+MAX_TICKERS_PER_REQUEST = 20
+MAX_URL_LENGTH = 2000
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+_UPSTREAM_ERRORS = (requests.HTTPError, requests.ConnectionError, requests.Timeout,
+                    CircuitOpenError)
+
+
+class BrapiClient:
+    def __init__(self, token=None, timeout=10.0, max_retries=3, backoff_factor=0.5,
+                 max_backoff=30.0, pool_size=10, session=None, rate_limiter: RateLimiter = None,
+                 circuit_breaker: CircuitBreaker = None, fallback_to_last_quote=False):
+        self._token = token
+        self._timeout = timeout
+        self._max_retries = max_retries
+        self._backoff_factor = backoff_factor
+        self._max_backoff = max_backoff
+        self._session = session if session is not None else self._create_session(pool_size)
+        self._rate_limiter = rate_limiter
+        self._circuit_breaker = circuit_breaker
+        self._fallback_to_last_quote = fallback_to_last_quote
+        self._last_quotes = dict()
+
+    # Public
+    def get_quote(self, stock_code):
+        try:
+            data = self._request_quotes([stock_code.upper()])
+        except _UPSTREAM_ERRORS as err:
+            if not self._has_last_quote(stock_code):
+                raise
+            logging.warning("Using the last known quote of %s. %s" % (stock_code, err))
+            return self._last_quotes[stock_code.upper()]
+
+        quote = Quote.from_dict(data.get('results')[0])
+        self._remember_quote(quote)
+        return quote
+
+    def get_quotes(self, stock_codes, batch_size=MAX_TICKERS_PER_REQUEST):
+        quotes = dict()
+        for batch in _split_in_batches(stock_codes, batch_size):
+            try:
+                data = self._request_quotes(batch)
+            except _UPSTREAM_ERRORS as err:
+                if not all(self._has_last_quote(x) for x in batch):
+                    raise
+                logging.warning("Using the last known quotes of %s. %s" % (', '.join(batch), err))
+                quotes.update({x: self._last_quotes[x] for x in batch})
+                continue
+
+            for result in data.get('results', []):
+                quote = Quote.from_dict(result)
+                self._remember_quote(quote)
+                quotes[quote.get_code().upper()] = quote
+
+        return {code: quotes[code.upper()] for code in stock_codes if code.upper() in quotes}
+
+    def get_current_stock_price(self, stock_code):
+        return self.get_quote(stock_code).get_price()
+
+    def get_price_earning(self, stock_code):
+        return self.get_quote(stock_code).get_price_earnings()
+
+    def close(self):
+        self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    # Private
+    def _create_session(self, pool_size):
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size,
+                                                pool_maxsize=pool_size)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def _get_token(self):
+        if self._token is not None:
+            return self._token
+        return os.getenv('STOCK_API_KEY')
+
+    def _has_last_quote(self, stock_code):
+        return self._fallback_to_last_quote and stock_code.upper() in self._last_quotes
+
+    def _remember_quote(self, quote):
+        if self._fallback_to_last_quote:
+            self._last_quotes[quote.get_code().upper()] = quote
+
+    def _request_quotes(self, codes):
+        _metrics = instrumentation.get_metrics()
+        if _metrics is None:
+            return self._request(QUOTE_URL.format(','.join(codes)))
+
+        _start = time.perf_counter()
+        try:
+            data = self._request(QUOTE_URL.format(','.join(codes)))
+        except Exception as err:
+            for code in codes:
+                _metrics.increment('brapi_fetch_failures', ticker=code, error=type(err).__name__)
+            raise
+        finally:
+            _elapsed = time.perf_counter() - _start
+            _metrics.observe('brapi_request_seconds', _elapsed)
+
+        for code in codes:
+            _metrics.observe('brapi_fetch_seconds', _elapsed, ticker=code)
+        return data
+
+    def _request(self, url):
+        if self._circuit_breaker is not None:
+            self._circuit_breaker.before_call()
+
+        try:
+            response = self._request_with_retries(url)
+        except Exception:
+            self._record_failure()
+            raise
+
+        if response.status_code in RETRY_STATUS_CODES:
+            self._record_failure()
+        elif self._circuit_breaker is not None:
+            self._circuit_breaker.record_success()
+
+        if response.status_code != 200:
+            raise requests.HTTPError(f"Request failed with status code "
+                                     f"{response.status_code}.\n\t{_get_body(response)}")
+
+        return response.json()
+
+    def _request_with_retries(self, url):
+        params = {
+            'token': self._get_token(),
+        }
+        attempt = 0
+        while True:
+            if self._rate_limiter is not None:
+                self._rate_limiter.acquire()
 
-    if response.status_code != 200:
-        raise requests.HTTPError(f"Request failed with status code {response.status_code}."
-                                 f"\n\t{response.json()}")
+            try:
+                response = self._session.get(url, params=params, timeout=self._timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self._max_retries:
+                    raise
+                instrumentation.increment('brapi_retries')
+                time.sleep(self._get_backoff(attempt))
+                attempt += 1
+                continue
 
-    data = response.json()
-    return data.get('results')[0].get('regularMarketPrice')
+            if response.status_code in RETRY_STATUS_CODES and attempt < self._max_retries:
+                instrumentation.increment('brapi_retries')
+                time.sleep(self._get_backoff(attempt, response))
+                attempt += 1
+                continue
+
+            return response
+
+    def _record_failure(self):
+        if self._circuit_breaker is not None:
+            self._circuit_breaker.record_failure()
+
+    def _get_backoff(self, attempt, response=None):
+        _retry_after = None if response is None else response.headers.get('Retry-After')
+        if _retry_after is not None and _retry_after.isdigit():
+            return min(self._max_backoff, float(_retry_after))
+
+        return random.uniform(0, min(self._max_backoff, self._backoff_factor * 2 ** attempt))
+
+
+_default_client = None
+
+
+def get_default_client():
+    global _default_client
+    if _default_client is None:
+        _default_client = BrapiClient()
+    return _default_client
+
+
+def set_default_client(client: BrapiClient):
+    global _default_client
+    _default_client = client
+
+
+def get_quote(stock_code):
+    return get_default_client().get_quote(stock_code)
+
+
+def get_current_stock_price(stock_code):
+    return get_default_client().get_current_stock_price(stock_code)
 
 
 def get_price_earning(stock_code):
-    url = "https://brapi.dev/api/quote/{}".format(stock_code.upper())
-    params = {
-        'token': os.getenv('STOCK_API_KEY'),
-    }
-    response = requests.get(url, params=params)
-
-    if response.status_code != 200:
-        raise requests.HTTPError(f"Request failed with status code {response.status_code}."
-                                 f"\n\t{response.json()}")
-
-    data = response.json()
-    return data.get('results')[0].get('priceEarnings', 0.0)
+    return get_default_client().get_price_earning(stock_code)
+
+
+def get_quotes(stock_codes, batch_size=MAX_TICKERS_PER_REQUEST):
+    return get_default_client().get_quotes(stock_codes, batch_size)
+
+
+def get_current_stock_prices(stock_codes, batch_size=MAX_TICKERS_PER_REQUEST):
+    return {x: y.get_price() for x, y in get_quotes(stock_codes, batch_size).items()}
+
+
+def get_price_earnings(stock_codes, batch_size=MAX_TICKERS_PER_REQUEST):
+    return {x: y.get_price_earnings() for x, y in get_quotes(stock_codes, batch_size).items()}
+
+
+def _get_body(response):
+    try:
+        return response.json()
+    except ValueError:
+        return response.text
+
+
+def _split_in_batches(stock_codes, batch_size):
+    _max_path_length = MAX_URL_LENGTH - len(QUOTE_URL.format(''))
+    batch = list()
+    batch_length = 0
+    for code in sorted({x.upper() for x in stock_codes}):
+        _length = len(code) + (1 if batch else 0)
+        if batch and (len(batch) >= batch_size or batch_length + _length > _max_path_length):
+            yield batch
+            batch = list()
+            batch_length = 0
+            _length = len(code)
+        batch.append(code)
+        batch_length += _length
+
+    if batch:
+        yield batch
@@ -0,0 +1,344 @@
+from prismfolio.asset import AssetPricingError, AssetWithNoPrice
+from prismfolio.wallet import Wallet
+from prismfolio.walletschema import (check_value, get_code_error, get_name_error,
+                                     get_quantity_error, get_target_participation_error)
+
+from concurrent.futures import ThreadPoolExecutor
+import json
+import logging
+import math
+
+import numpy as np
+
+
+class ColumnarWallet:
+    __slots__ = ('_codes', '_quantities', '_prices', '_price_earnings', '_asset_targets',
+                 '_current_participations', '_group_names', '_group_targets', '_group_offsets',
+                 '_group_index', '_group_versions', '_version', '_investment_groups',
+                 '_unique_codes', '_code_index')
+
+    def __init__(self, codes, quantities, asset_targets, group_names, group_targets,
+                 group_offsets, prices=None):
+        self._codes = np.asarray(codes, dtype=str)
+        self._quantities = np.asarray(quantities, dtype=np.int64)
+        self._asset_targets = np.asarray(asset_targets, dtype=np.float64)
+        self._group_names = list(group_names)
+        self._group_targets = np.asarray(group_targets, dtype=np.float64)
+        self._group_offsets = np.asarray(group_offsets, dtype=np.intp)
+        _number_of_assets = len(self._codes)
+        if len(self._group_offsets) != len(self._group_names) + 1 or \
+                self._group_offsets[0] != 0 or self._group_offsets[-1] != _number_of_assets:
+            raise ValueError(f"Group offsets should go from 0 to {_number_of_assets} with one "
+                             f"offset per group plus one. Received {list(self._group_offsets)}")
+
+        self._prices = np.full(_number_of_assets, np.nan) if prices is None else \
+            np.asarray(prices, dtype=np.float64)
+        self._price_earnings = np.zeros(_number_of_assets)
+        self._current_participations = np.zeros(_number_of_assets)
+        self._group_index = np.repeat(np.arange(len(self._group_names), dtype=np.intp),
+                                      np.diff(self._group_offsets))
+        self._group_versions = [0] * len(self._group_names)
+        self._version = 0
+        self._investment_groups = None
+        self._unique_codes, self._code_index = np.unique(self._codes, return_inverse=True)
+
+    # Public
+    def get_investment_groups(self):
+        if self._investment_groups is None:
+            self._investment_groups = [_ColumnarInvestmentGroup(self, x)
+                                       for x in range(len(self._group_names))]
+        return self._investment_groups
+
+    def has_investment_group(self):
+        return len(self._group_names) > 0
+
+    def get_total_amount(self):
+        self._check_prices()
+        return float(np.dot(self._prices, self._quantities))
+
+    def get_total_amounts(self):
+        self._check_prices()
+        return self._prices * self._quantities
+
+    def get_group_total_amounts(self):
+        return np.bincount(self._group_index, weights=self.get_total_amounts(),
+                           minlength=len(self._group_names))
+
+    def get_asset_codes(self):
+        return set(self._unique_codes.tolist())
+
+    def get_assets_by_code(self, code):
+        _assets = [x for group in self.get_investment_groups() for x in group.get_assets()]
+        return [_assets[x] for x in np.flatnonzero(self._codes == code)]
+
+    def get_codes(self):
+        return self._codes
+
+    def get_quantities(self):
+        return self._quantities
+
+    def get_prices(self):
+        return self._prices
+
+    def get_asset_targets(self):
+        return self._asset_targets
+
+    def get_current_participations(self):
+        return self._current_participations
+
+    def get_group_names(self):
+        return self._group_names
+
+    def get_group_targets(self):
+        return self._group_targets
+
+    def get_group_offsets(self):
+        return self._group_offsets
+
+    def get_group_index(self):
+        return self._group_index
+
+    def update_asset_values(self, pricing_function, max_workers=None):
+        self._set_prices(self._get_unique_values(pricing_function, 'price', max_workers))
+
+    def update_asset_values_in_bulk(self, bulk_pricing_function):
+        prices = bulk_pricing_function(self.get_asset_codes())
+        self.update_asset_values(lambda code: prices[code])
+
+    def update_asset_price_earnings(self, price_earnings_function):
+        self._price_earnings = self._get_unique_values(
+            price_earnings_function, 'price earning')[self._code_index]
+
+    def update_current_participation(self):
+        _amounts = self.get_total_amounts()
+        _group_amounts = np.bincount(self._group_index, weights=_amounts,
+                                     minlength=len(self._group_names))[self._group_index]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self._current_participations = np.where(_group_amounts == 0, 0.0,
+                                                    100 * (_amounts / _group_amounts))
+
+    def to_wallet(self):
+        wallet = Wallet.from_dict(self.to_dict())
+        _assets = [x for group in wallet.get_investment_groups() for x in group.get_assets()]
+        for asset, price in zip(_assets, self._prices.tolist()):
+            if not math.isnan(price):
+                asset.update_price(lambda _, price=price: price)
+        return wallet
+
+    def to_dict(self):
+        return {'investment_groups': [
+            {'name': self._group_names[x],
+             'target_participation': float(self._group_targets[x]),
+             'assets': [{'code': str(self._codes[y]), 'quantity': int(self._quantities[y]),
+                         'target_participation': float(self._asset_targets[y])}
+                        for y in range(self._group_offsets[x], self._group_offsets[x + 1])]}
+            for x in range(len(self._group_names))]}
+
+    @classmethod
+    def from_wallet(cls, wallet: Wallet):
+        codes, quantities, asset_targets, prices, group_offsets = [], [], [], [], [0]
+        groups = wallet.get_investment_groups()
+        for group in groups:
+            for asset in group.get_assets():
+                codes.append(asset.get_code())
+                quantities.append(asset.get_quantity())
+                asset_targets.append(asset.get_target_participation())
+                prices.append(asset.get_price() if asset.has_current_price() else np.nan)
+            group_offsets.append(len(codes))
+
+        return cls(codes, quantities, asset_targets, [x.get_name() for x in groups],
+                   [x.get_target_participation() for x in groups], group_offsets, prices)
+
+    @classmethod
+    def from_json(cls, json_data):
+        return cls.from_dict(json.loads(json_data))
+
+    @classmethod
+    def from_dict(cls, dict_data):
+        if not isinstance(dict_data, dict):
+            raise TypeError(f"Expected a dict. Got a {type(dict_data)}")
+
+        codes, quantities, asset_targets, group_offsets = [], [], [], [0]
+        group_names, group_targets = [], []
+        for group in dict_data.get('investment_groups'):
+            if not isinstance(group, dict):
+                raise TypeError(f"Expected a dict. Got a {type(group)}")
+
+            group_names.append(check_value(group.get('name'), get_name_error))
+            group_targets.append(check_value(group.get('target_participation'),
+                                             get_target_participation_error))
+            for asset in group.get('assets'):
+                if not isinstance(asset, dict):
+                    raise TypeError(f"Expected a dict. Got a {type(asset)}")
+
+                codes.append(check_value(asset.get('code'), get_code_error))
+                quantities.append(check_value(asset.get('quantity'), get_quantity_error))
+                asset_targets.append(check_value(asset.get('target_participation'),
+                                                 get_target_participation_error))
+            group_offsets.append(len(codes))
+
+        _wallet = cls(codes, quantities, asset_targets, group_names, group_targets,
+                      group_offsets)
+        _wallet._warn_about_target_participation()
+        return _wallet
+
+    # Private
+    def _get_version(self):
+        return self._version
+
+    def _get_layout_version(self):
+        return 0
+
+    def _get_group_version(self, group_index):
+        return self._group_versions[group_index]
+
+    def _check_prices(self):
+        _missing = np.isnan(self._prices)
+        if _missing.any():
+            _code = self._codes[np.argmax(_missing)]
+            raise AssetWithNoPrice(
+                f'{_code} has no price yet. Call the method update_price() first.')
+
+    def _get_unique_values(self, function, name, max_workers=None):
+        _codes = self._unique_codes.tolist()
+        if max_workers is None:
+            return np.array([_call(function, x, name) for x in _codes], dtype=np.float64)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return np.array(list(executor.map(lambda x: _call(function, x, name), _codes)),
+                            dtype=np.float64)
+
+    def _set_prices(self, unique_prices):
+        self._prices = unique_prices[self._code_index]
+        self._group_versions = [x + 1 for x in self._group_versions]
+        self._version += 1
+        self.update_current_participation()
+
+    def _on_asset_changed(self, position):
+        self._group_versions[self._group_index[position]] += 1
+        self._version += 1
+
+    def _warn_about_target_participation(self):
+        _asset_totals = np.bincount(self._group_index, weights=self._asset_targets,
+                                    minlength=len(self._group_names))
+        for name, total in zip(self._group_names, _asset_totals.tolist()):
+            if math.isclose(total, 100.0, abs_tol=0.001):
+                continue
+
+            if total > 100.0:
+                logging.warning("The total asset participation on group '%s' is %.2f%%, which "
+                                "is greater than 100%%." % (name, total))
+
+            if total < 100.0:
+                logging.warning("The total asset participation on group '%s' is %.2f%%, which "
+                                "is lower than 100%%." % (name, total))
+
+        _total = float(self._group_targets.sum())
+        if _total > 100.0:
+            logging.warning("The total investment groups on wallet is %.2f%%, which is "
+                            "greater than 100%%." % _total)
+
+        if _total < 100.0:
+            logging.warning("The total investment groups participation on wallet is %.2f%%, "
+                            "which is lower than 100%%." % _total)
+
+
+class _ColumnarInvestmentGroup:
+    __slots__ = ('_wallet', '_index', '_assets')
+
+    def __init__(self, wallet: ColumnarWallet, index):
+        self._wallet = wallet
+        self._index = index
+        self._assets = None
+
+    # Public
+    def get_name(self):
+        return self._wallet._group_names[self._index]
+
+    def get_target_participation(self):
+        return float(self._wallet._group_targets[self._index])
+
+    def get_assets(self):
+        if self._assets is None:
+            self._assets = [_ColumnarAsset(self._wallet, x) for x in range(*self._get_bounds())]
+        return self._assets
+
+    def get_asset_codes(self):
+        _start, _end = self._get_bounds()
+        return set(self._wallet._codes[_start:_end].tolist())
+
+    def has_asset(self):
+        _start, _end = self._get_bounds()
+        return _end > _start
+
+    def get_total_amount(self):
+        _start, _end = self._get_bounds()
+        self._wallet._check_prices()
+        return float(np.dot(self._wallet._prices[_start:_end],
+                            self._wallet._quantities[_start:_end]))
+
+    def update_current_participation(self):
+        self._wallet.update_current_participation()
+
+    # Private
+    def _get_bounds(self):
+        return int(self._wallet._group_offsets[self._index]), \
+            int(self._wallet._group_offsets[self._index + 1])
+
+    def _get_version(self):
+        return self._wallet._get_group_version(self._index)
+
+
+class _ColumnarAsset:
+    __slots__ = ('_wallet', '_position')
+
+    def __init__(self, wallet: ColumnarWallet, position):
+        self._wallet = wallet
+        self._position = position
+
+    # Public
+    def has_current_price(self):
+        return not math.isnan(self._wallet._prices[self._position])
+
+    def get_price(self):
+        if not self.has_current_price():
+            raise AssetWithNoPrice(
+                f'{self.get_code()} has no price yet. Call the method update_price() first.')
+
+        return float(self._wallet._prices[self._position])
+
+    def get_price_earnings(self):
+        return float(self._wallet._price_earnings[self._position])
+
+    def get_code(self):
+        return str(self._wallet._codes[self._position])
+
+    def get_quantity(self):
+        return int(self._wallet._quantities[self._position])
+
+    def get_target_participation(self):
+        return float(self._wallet._asset_targets[self._position])
+
+    def get_current_participation(self):
+        return float(self._wallet._current_participations[self._position])
+
+    def get_total_amount(self):
+        return self.get_price() * self.get_quantity()
+
+    def buy(self, quantity: int):
+        check_value(quantity, get_quantity_error)
+        self._wallet._quantities[self._position] += quantity
+        self._wallet._on_asset_changed(self._position)
+
+    def update_price(self, pricing_function):
+        price = _call(pricing_function, self.get_code(), 'price')
+        self._wallet._prices[self._position] = price
+        self._wallet._on_asset_changed(self._position)
+        return price
+
+
+def _call(function, code, name):
+    try:
+        return function(code)
+    except Exception as err:
+        raise AssetPricingError(f"It is not possible to get the {name} of {code}. {err}")
@@ -0,0 +1,145 @@
+import json
+import threading
+import time
+
+PROMETHEUS_PREFIX = 'prismfolio_'
+
+
+class Metrics:
+    def __init__(self, clock=time.perf_counter):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._summaries = dict()
+        self._counters = dict()
+
+    # Public
+    def timer(self, name, **labels):
+        return _Timer(self, name, labels)
+
+    def observe(self, name, value, **labels):
+        _key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            summary = self._summaries.get(_key)
+            if summary is None:
+                self._summaries[_key] = [1, value, value, value]
+                return
+
+            summary[0] += 1
+            summary[1] += value
+            summary[2] = min(summary[2], value)
+            summary[3] = max(summary[3], value)
+
+    def increment(self, name, value=1, **labels):
+        _key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[_key] = self._counters.get(_key, 0) + value
+
+    def get_summary(self, name, **labels):
+        summary = self._summaries.get((name, tuple(sorted(labels.items()))))
+        if summary is None:
+            return None
+        return dict(zip(('count', 'sum', 'min', 'max'), summary))
+
+    def get_counter(self, name, **labels):
+        return self._counters.get((name, tuple(sorted(labels.items()))), 0)
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                'summaries': [dict(name=name, labels=dict(labels),
+                                   **dict(zip(('count', 'sum', 'min', 'max'), summary)))
+                              for (name, labels), summary in sorted(self._summaries.items())],
+                'counters': [{'name': name, 'labels': dict(labels), 'value': value}
+                             for (name, labels), value in sorted(self._counters.items())]}
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self):
+        lines = list()
+        with self._lock:
+            _summaries = sorted(self._summaries.items())
+            _counters = sorted(self._counters.items())
+
+        _last_name = None
+        for (name, labels), (count, total, _, _) in _summaries:
+            if name != _last_name:
+                lines.append(f"# TYPE {PROMETHEUS_PREFIX}{name} summary")
+                _last_name = name
+            lines.append(f"{PROMETHEUS_PREFIX}{name}_sum{_format_labels(labels)} {total!r}")
+            lines.append(f"{PROMETHEUS_PREFIX}{name}_count{_format_labels(labels)} {count}")
+
+        _last_name = None
+        for (name, labels), value in _counters:
+            if name != _last_name:
+                lines.append(f"# TYPE {PROMETHEUS_PREFIX}{name}_total counter")
+                _last_name = name
+            lines.append(f"{PROMETHEUS_PREFIX}{name}_total{_format_labels(labels)} {value!r}")
+
+        return '\n'.join(lines) + '\n'
+
+
+class _Timer:
+    __slots__ = ('_metrics', '_name', '_labels', '_start')
+
+    def __init__(self, metrics: Metrics, name, labels):
+        self._metrics = metrics
+        self._name = name
+        self._labels = labels
+        self._start = None
+
+    def __enter__(self):
+        self._start = self._metrics._clock()
+        return self
+
+    def __exit__(self, *args):
+        self._metrics.observe(self._name, self._metrics._clock() - self._start, **self._labels)
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+_metrics = None
+
+
+def get_metrics():
+    return _metrics
+
+
+def set_metrics(metrics: Metrics):
+    global _metrics
+    _metrics = metrics
+
+
+def timer(name, **labels):
+    if _metrics is None:
+        return _NULL_TIMER
+    return _metrics.timer(name, **labels)
+
+
+def stage(name):
+    if _metrics is None:
+        return _NULL_TIMER
+    return _metrics.timer('stage_seconds', stage=name)
+
+
+def increment(name, value=1, **labels):
+    if _metrics is not None:
+        _metrics.increment(name, value, **labels)
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+
+    _escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+                for _, value in labels)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(labels, _escaped)) + '}'
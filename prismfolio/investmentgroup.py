@@ -1,17 +1,24 @@
 from prismfolio.asset import Asset
 from prismfolio.targetparticipation import TargetParticipation
+from prismfolio.walletschema import check_value, get_name_error
 
+import asyncio
 import json
 import logging
 import math
 
 
 class InvestmentGroup(TargetParticipation):
+    __slots__ = ('_name', '_assets', '_total_amount', '_observers', '_version')
+
     def __init__(self, name: str, target_participation: float):
-        self._check_name_argument(name)
+        check_value(name, get_name_error)
         super().__init__(target_participation)
         self._name = name
         self._assets = list()
+        self._total_amount = None
+        self._observers = list()
+        self._version = 0
 
     # Public
     def get_name(self):
@@ -19,28 +26,62 @@ class InvestmentGroup(TargetParticipation):
 
     def add_asset(self, asset: Asset):
         self._assets.append(asset)
+        asset._add_observer(self)
+        self._total_amount = None
+        self._version += 1
+        for observer in self._observers:
+            observer._on_asset_added(self, asset)
 
     def has_asset(self):
         return len(self._assets) > 0
 
     def get_total_amount(self):
-        return sum(x.get_total_amount() for x in self._assets)
+        if self._total_amount is None:
+            self._total_amount = sum(x.get_total_amount() for x in self._assets)
+        return self._total_amount
 
     def update_asset_values(self, pricing_function):
+        self._reset_total_amount()
         for asset in self._assets:
             asset.update_price(pricing_function)
 
+        self.update_current_participation()
+
+    async def update_asset_values_async(self, pricing_function):
+        self._reset_total_amount()
+        await asyncio.gather(*(x.update_price_async(pricing_function) for x in self._assets))
+        self.update_current_participation()
+
+    def update_current_participation(self):
         total_amount = self.get_total_amount()
         for asset in self._assets:
             asset.update_current_participation(total_amount)
 
+    def update_asset_values_in_bulk(self, bulk_pricing_function):
+        prices = bulk_pricing_function(self.get_asset_codes())
+        self.update_asset_values(lambda code: prices[code])
+
+    def update_asset_quotes(self, quote_function):
+        self._reset_total_amount()
+        for asset in self._assets:
+            asset.update_quote(quote_function)
+
+        self.update_current_participation()
+
     def update_asset_price_earnings(self, price_earnings_function):
         for asset in self._assets:
             asset.update_price_earnings(price_earnings_function)
 
+    async def update_asset_price_earnings_async(self, price_earnings_function):
+        await asyncio.gather(*(x.update_price_earnings_async(price_earnings_function)
+                               for x in self._assets))
+
     def get_assets(self):
         return self._assets
 
+    def get_asset_codes(self):
+        return {x.get_code() for x in self._assets}
+
     @classmethod
     def from_json(cls, json_data):
         return cls.from_dict(json.loads(json_data))
@@ -73,12 +114,39 @@ class InvestmentGroup(TargetParticipation):
         return _investment_group
 
     # Private
-    def _check_name_argument(self, name: str):
-        if not isinstance(name, str):
-            raise TypeError(f"Name value must be a string. Got {type(name)} {name}")
-
-        if len(name) == 0:
-            raise ValueError("Name value must be a non empty string.")
+    @classmethod
+    def _from_trusted(cls, name, target_participation, assets):
+        _investment_group = cls.__new__(cls)
+        _investment_group._set_trusted_target_participation(target_participation)
+        _investment_group._name = name
+        _investment_group._assets = assets
+        _investment_group._total_amount = None
+        _investment_group._observers = list()
+        _investment_group._version = 0
+        for asset in assets:
+            asset._observers = (_investment_group,)
+        return _investment_group
 
     def _get_total_asset_target_participation(self):
         return sum(x.get_target_participation() for x in self._assets)
+
+    def _add_observer(self, observer):
+        self._observers.append(observer)
+
+    def _get_version(self):
+        return self._version
+
+    def _reset_total_amount(self):
+        self._total_amount = None
+
+    def _on_asset_changed(self, asset: Asset, old_amount):
+        _difference = None
+        if self._total_amount is not None and old_amount is not None and asset.has_current_price():
+            _difference = asset.get_total_amount() - old_amount
+            self._total_amount += _difference
+        else:
+            self._total_amount = None
+
+        self._version += 1
+        for observer in self._observers:
+            observer._on_group_changed(self, _difference)
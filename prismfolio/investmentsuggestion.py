@@ -1,3 +1,4 @@
+from prismfolio import instrumentation
 from prismfolio.investmentgroup import InvestmentGroup
 from prismfolio.asset import Asset
 from prismfolio.wallet import Wallet
@@ -8,31 +9,43 @@ class SuggestionNotReady(Exception):
 
 
 class _BaseSuggestionDict:
+    __slots__ = ()
+
     def __init__(self):
         self._suggestion = dict()
 
     def get_remainder(self):
-        return sum(x.get_remainder() for x in self._suggestion.values())
+        return sum(x.get_remainder() for x in self)
 
     def __getitem__(self, item):
+        self._refresh()
         return self._suggestion[item]
 
     def __len__(self):
+        self._refresh()
         return len(self._suggestion)
 
     def __iter__(self):
+        self._refresh()
         for _, _v in self._suggestion.items():
             yield _v
 
+    def _refresh(self):
+        pass
+
 
 class _BaseSuggestion:
+    __slots__ = ('_item', '_new_contribution', '_ideal_contribution', '_ideal_investing',
+                 '_total_ideal_investing', '_fixed_investing')
+
     def __init__(self, item, total_amount, new_contribution):
         self._item = item
         self._new_contribution = new_contribution
-        _total_after_new_contribution = total_amount + new_contribution
-        self._ideal_investing = max(0, 0.01 * item.get_target_participation()
-                                    * (_total_after_new_contribution)-item.get_total_amount())
-        self._actual_investing = None
+        self._ideal_contribution = new_contribution
+        self._ideal_investing = None
+        self._total_ideal_investing = None
+        self._fixed_investing = None
+        self._update_ideal_investing(total_amount)
 
     def _get_ideal_investment(self):
         return self._ideal_investing
@@ -41,79 +54,209 @@ class _BaseSuggestion:
         self._new_contribution = new_contribution
 
     def get_suggested_investment(self):
-        if self._actual_investing is None:
+        self._refresh()
+        if self._fixed_investing is not None:
+            return self._fixed_investing
+
+        _total_ideal_investing = self._get_total_ideal_investing()
+        if _total_ideal_investing is None:
             raise SuggestionNotReady("This asset suggestion is not ready, you cant instantiate "
                                      "this class directly.")
-        return self._actual_investing
+
+        if _total_ideal_investing == 0:
+            return 0
+
+        return (self._ideal_investing / _total_ideal_investing)*self._get_new_contribution()
 
     def _calculate_actual_investing(self, total_ideal_investing):
-        if total_ideal_investing == 0:
-            self._actual_investing = 0
-            return
+        self._total_ideal_investing = total_ideal_investing
+
+    def _update_ideal_investing(self, total_amount):
+        _total_after_new_contribution = total_amount + self._ideal_contribution
+        self._ideal_investing = max(0, 0.01 * self._item.get_target_participation()
+                                    * (_total_after_new_contribution)-self._item.get_total_amount())
+
+    def _get_total_ideal_investing(self):
+        return self._total_ideal_investing
+
+    def _get_new_contribution(self):
+        return self._new_contribution
 
-        self._actual_investing = (self._ideal_investing /
-                                  total_ideal_investing)*self._new_contribution
+    def _refresh(self):
+        pass
 
 
 class _AssetSuggestion(_BaseSuggestion):
-    def __init__(self, asset: Asset, total_amount, new_contribution):
+    __slots__ = ('_group_suggestion', '_whole_shares', '_derived', '_derived_version')
+
+    def __init__(self, asset: Asset, total_amount, new_contribution, group_suggestion=None):
         super().__init__(asset, total_amount, new_contribution)
+        self._group_suggestion = group_suggestion
+        self._whole_shares = None
+        self._derived = None
+        self._derived_version = None
 
     def get_suggested_shares_buying(self):
-        return self.get_suggested_investment() // self._item.get_price()
+        return self._get_derived()[0]
 
     def get_asset(self):
         return self._item
 
     def get_remainder(self):
-        if self.get_suggested_shares_buying() == 0:
-            return self.get_suggested_investment()
+        return self._get_derived()[1]
+
+    def get_percent_to_next_share(self):
+        return self._get_derived()[2]
 
-        return self.get_suggested_investment() % (self.get_suggested_shares_buying() *
-                                                  self._item.get_price())
+    def set_new_contribution(self, new_contribution):
+        super().set_new_contribution(new_contribution)
+        self._derived = None
+
+    def _calculate_actual_investing(self, total_ideal_investing):
+        super()._calculate_actual_investing(total_ideal_investing)
+        self._derived = None
+
+    def _get_derived(self):
+        _version = self._get_distribution_version()
+        if self._derived is not None and self._derived_version == _version:
+            return self._derived
+
+        _investment = self.get_suggested_investment()
+        _price = self._item.get_price()
+        _shares = self._whole_shares
+        if _shares is None:
+            _shares = _investment // _price
+
+        _remainder = _investment if _shares == 0 else _investment % (_shares * _price)
+        self._derived = (_shares, _remainder, 100 * (_remainder / _price))
+        self._derived_version = self._get_distribution_version()
+        return self._derived
+
+    def _get_distribution_version(self):
+        if self._group_suggestion is None:
+            return None
+        self._group_suggestion._refresh()
+        return self._group_suggestion._distribution_version
+
+    def to_dict(self):
+        _shares, _remainder, _percent_to_next_share = self._get_derived()
+        return {'code': self._item.get_code(),
+                'investment': self.get_suggested_investment(),
+                'shares': int(_shares),
+                'price': self._item.get_price(),
+                'remainder': _remainder,
+                'percent_to_next_share': _percent_to_next_share,
+                'current_participation': self._item.get_current_participation()}
+
+    def _set_whole_shares(self, shares):
+        self._whole_shares = shares
+        self._fixed_investing = shares * self._item.get_price()
+        self._derived = None
+
+    def _get_total_ideal_investing(self):
+        if self._group_suggestion is None:
+            return self._total_ideal_investing
+        return self._group_suggestion._assets_total_ideal_investing
+
+    def _get_new_contribution(self):
+        if self._group_suggestion is None:
+            return self._new_contribution
+        return self._group_suggestion._assets_contribution
+
+    def _refresh(self):
+        if self._group_suggestion is not None:
+            self._group_suggestion._refresh()
 
     def __repr__(self):
         return f"""
             Asset: {self._item.get_code()}
-            It is recommended to invest ${self._actual_investing:.2f},
+            It is recommended to invest ${self.get_suggested_investment():.2f},
             which corresponds to {self.get_suggested_shares_buying()} shares.
             """
 
 
 class _InvestmentGroupSuggestion(_BaseSuggestion, _BaseSuggestionDict):
-    def __init__(self, group: InvestmentGroup, total_amount, new_contribution):
+    __slots__ = ('_suggestion', '_wallet_suggestion', '_assets_contribution',
+                 '_distribution_version', '_group_version', '_assets_total_ideal_investing')
+
+    def __init__(self, group: InvestmentGroup, total_amount, new_contribution,
+                 wallet_suggestion=None):
         super().__init__(group, total_amount, new_contribution)
+        self._wallet_suggestion = wallet_suggestion
+        self._assets_contribution = new_contribution
+        self._distribution_version = 0
+        _group_total_amount = group.get_total_amount()
         self._suggestion = {x: _AssetSuggestion(
-            x, group.get_total_amount(), new_contribution) for x in group.get_assets()}
-
-        _total_ideal_investing = sum(
-            self._suggestion[x]._get_ideal_investment() for x in self._suggestion)
-
-        for item, suggestion in self._suggestion.items():
-            suggestion._calculate_actual_investing(_total_ideal_investing)
+            x, _group_total_amount, new_contribution, self) for x in group.get_assets()}
+        self._group_version = group._get_version()
+        self._assets_total_ideal_investing = self._sum_assets_ideal_investing()
 
     def update_contribution_value(self, contribution_value):
-        _total_ideal_investing = sum(
-            self._suggestion[x]._get_ideal_investment() for x in self._suggestion)
-        for item, suggestion in self._suggestion.items():
-            suggestion.set_new_contribution(contribution_value)
-            suggestion._calculate_actual_investing(_total_ideal_investing)
+        self._assets_contribution = contribution_value
+        self._distribution_version += 1
 
     def get_investment_group(self):
         return self._item
 
+    def to_dict(self):
+        return {'name': self._item.get_name(),
+                'investment': self.get_suggested_investment(),
+                'remainder': self.get_remainder(),
+                'assets': [x.to_dict() for x in self]}
+
+    def _sum_assets_ideal_investing(self):
+        return sum(x._get_ideal_investment() for x in self._suggestion.values())
+
+    def _update(self, total_amount):
+        self._update_ideal_investing(total_amount)
+        if self._group_version == self._item._get_version():
+            return
+
+        self._group_version = self._item._get_version()
+        _group_total_amount = self._item.get_total_amount()
+        for suggestion in self._suggestion.values():
+            suggestion._update_ideal_investing(_group_total_amount)
+        self._assets_total_ideal_investing = self._sum_assets_ideal_investing()
+
+    def _refresh(self):
+        if self._wallet_suggestion is not None:
+            self._wallet_suggestion._refresh()
+
     def __repr__(self):
         return f"""
             Group: {self._item.get_name()}
-            It is recommended to invest ${self._actual_investing:.2f}.
+            It is recommended to invest ${self.get_suggested_investment():.2f}.
             """
 
 
 class WalletInvestmentSuggestion(_BaseSuggestionDict):
+    __slots__ = ('_suggestion', '_wallet', '_new_contribution', '_wallet_version',
+                 '_wallet_layout_version')
+
     def __init__(self, wallet: Wallet, new_contribution):
         super().__init__()
+        self._wallet = wallet
+        self._new_contribution = new_contribution
+        with instrumentation.stage('build_suggestion'):
+            self._build()
+
+    # Public
+    def to_dict(self):
+        return {'contribution': self._new_contribution,
+                'remainder': self.get_remainder(),
+                'investment_groups': [x.to_dict() for x in self]}
+
+    # Private
+    def _build(self):
+        self._wallet_version = self._wallet._get_version()
+        self._wallet_layout_version = self._wallet._get_layout_version()
+        _wallet_total_amount = self._wallet.get_total_amount()
         self._suggestion = {x: _InvestmentGroupSuggestion(
-            x, wallet.get_total_amount(), new_contribution) for x in wallet.get_investment_groups()}
+            x, _wallet_total_amount, self._new_contribution, self)
+            for x in self._wallet.get_investment_groups()}
+        self._distribute()
+
+    def _distribute(self):
         _total_ideal_investing = sum(
             self._suggestion[x]._get_ideal_investment() for x in self._suggestion)
         for item, suggestion in self._suggestion.items():
@@ -121,6 +264,24 @@ class WalletInvestmentSuggestion(_BaseSuggestionDict):
         for item, suggestion in self._suggestion.items():
             suggestion.update_contribution_value(suggestion.get_suggested_investment())
 
+    def _is_outdated(self):
+        return self._wallet_version != self._wallet._get_version()
+
+    def _refresh(self):
+        if not self._is_outdated():
+            return
+
+        with instrumentation.stage('refresh_suggestion'):
+            if self._wallet_layout_version != self._wallet._get_layout_version():
+                self._build()
+                return
+
+            self._wallet_version = self._wallet._get_version()
+            _wallet_total_amount = self._wallet.get_total_amount()
+            for suggestion in self._suggestion.values():
+                suggestion._update(_wallet_total_amount)
+            self._distribute()
+
     def __repr__(self):
         _s = ""
         for _group in self:
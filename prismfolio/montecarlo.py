@@ -0,0 +1,214 @@
+from prismfolio import brapi
+from prismfolio.backtest import get_contribution_schedule
+from prismfolio.columnarwallet import ColumnarWallet
+from prismfolio.quote import QuoteBook
+from prismfolio.vectorizedsuggestion import allocate_amounts, get_group_matrix, sum_by_group
+from prismfolio.wallet import Wallet
+
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import functools
+import json
+import math
+import sys
+
+import numpy as np
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+class ProjectionResult:
+    def __init__(self, initial_value, contributions, values):
+        self._initial_value = initial_value
+        self._contributions = contributions
+        self._values = values
+
+    # Public
+    def get_initial_value(self):
+        return self._initial_value
+
+    def get_contributions(self):
+        return self._contributions
+
+    def get_invested(self):
+        return np.cumsum(self._contributions)
+
+    def get_values(self):
+        return self._values
+
+    def get_final_values(self):
+        return self._values[-1]
+
+    def get_number_of_paths(self):
+        return self._values.shape[1]
+
+    def get_percentiles(self, percentiles=PERCENTILES):
+        return np.percentile(self._values, percentiles, axis=1)
+
+    def get_probability_below(self, value):
+        return float((self.get_final_values() < value).mean())
+
+    def to_dict(self, percentiles=PERCENTILES):
+        _percentiles = self.get_percentiles(percentiles)
+        return {'paths': self.get_number_of_paths(),
+                'periods': len(self._contributions),
+                'initial_value': self._initial_value,
+                'invested': self.get_invested().tolist(),
+                'mean': self._values.mean(axis=1).tolist(),
+                'percentiles': {str(x): y.tolist() for x, y in zip(percentiles, _percentiles)},
+                'probability_below_invested': self.get_probability_below(
+                    self._initial_value + float(self.get_invested()[-1]))}
+
+
+class MonteCarloProjection:
+    def __init__(self, wallet, contributions, periods, drifts=0.0, volatilities=0.0,
+                 periods_per_year=12, paths=10000, seed=None, chunk_size=5000, max_workers=None,
+                 executor=None, carry_cash=True):
+        if periods < 1 or paths < 1 or chunk_size < 1 or periods_per_year <= 0:
+            raise ValueError(f"Periods, paths, chunk size and periods per year should be "
+                             f"positive values. Received {periods}, {paths}, {chunk_size} and "
+                             f"{periods_per_year}")
+
+        self._wallet = wallet if isinstance(wallet, ColumnarWallet) else \
+            ColumnarWallet.from_wallet(wallet)
+        self._wallet._check_prices()
+        self._codes, self._code_index = np.unique(self._wallet.get_codes(), return_inverse=True)
+        self._contributions = get_contribution_schedule(contributions, periods)
+        self._drifts = _get_per_code_values(drifts, self._codes.tolist(), 'drift')
+        self._volatilities = _get_per_code_values(volatilities, self._codes.tolist(),
+                                                  'volatility')
+        if (self._volatilities < 0).any():
+            raise ValueError("Volatilities should not be negative values.")
+
+        self._periods_per_year = periods_per_year
+        self._paths = paths
+        self._seed = seed
+        self._chunk_size = chunk_size
+        self._max_workers = max_workers
+        self._executor = executor
+        self._carry_cash = carry_cash
+
+    # Public
+    def run(self):
+        _chunks = [min(self._chunk_size, self._paths - x)
+                   for x in range(0, self._paths, self._chunk_size)]
+        _seeds = np.random.SeedSequence(self._seed).spawn(len(_chunks))
+        _initial_prices = np.zeros(len(self._codes))
+        _initial_prices[self._code_index] = self._wallet.get_prices()
+        simulate = functools.partial(
+            _simulate, _initial_prices, self._code_index, self._wallet.get_quantities(),
+            self._wallet.get_asset_targets(), self._wallet.get_group_targets(),
+            self._wallet.get_group_index(), self._drifts, self._volatilities,
+            self._contributions, 1.0 / self._periods_per_year, self._carry_cash)
+
+        if self._executor is not None:
+            values = list(self._executor.map(simulate, _seeds, _chunks))
+        elif len(_chunks) == 1 or self._max_workers == 1:
+            values = list(map(simulate, _seeds, _chunks))
+        else:
+            with ProcessPoolExecutor(max_workers=self._max_workers) as executor:
+                values = list(executor.map(simulate, _seeds, _chunks))
+
+        return ProjectionResult(self._wallet.get_total_amount(), self._contributions,
+                                np.concatenate(values, axis=1))
+
+
+def _simulate(initial_prices, code_index, quantities, asset_targets, group_targets, group_index,
+              drifts, volatilities, contributions, period_length, carry_cash, seed_sequence,
+              paths):
+    _random = np.random.default_rng(seed_sequence)
+    _log_drift = (drifts - 0.5 * volatilities ** 2) * period_length
+    _log_volatility = volatilities * math.sqrt(period_length)
+    _group_matrix = get_group_matrix(group_index, len(group_targets))
+    _shared_codes = len(code_index) != len(initial_prices)
+
+    prices = np.tile(initial_prices, (paths, 1))
+    quantities = np.tile(np.asarray(quantities, dtype=np.float64), (paths, 1))
+    cash = np.zeros(paths)
+    values = np.empty((len(contributions), paths))
+    for period, contribution in enumerate(contributions.tolist()):
+        _asset_prices = prices[:, code_index] if _shared_codes else prices
+        _contribution = cash + contribution
+        _shares = _get_whole_shares(_asset_prices, quantities, _contribution, asset_targets,
+                                    group_targets, group_index, _group_matrix)
+        quantities += _shares
+        cash = _contribution - np.einsum('ij,ij->i', _shares, _asset_prices) if carry_cash \
+            else np.zeros(paths)
+
+        prices *= np.exp(_log_drift + _log_volatility * _random.standard_normal(prices.shape))
+        _asset_prices = prices[:, code_index] if _shared_codes else prices
+        values[period] = np.einsum('ij,ij->i', _asset_prices, quantities) + cash
+    return values
+
+
+def _get_whole_shares(prices, quantities, contributions, asset_targets, group_targets,
+                      group_index, group_matrix):
+    asset_amounts = prices * quantities
+    group_amounts = sum_by_group(asset_amounts, group_index, len(group_targets), group_matrix)
+    _, asset_investments = allocate_amounts(
+        asset_amounts, group_amounts, group_amounts.sum(axis=-1, keepdims=True), asset_targets,
+        group_targets, group_index, contributions, group_matrix)
+    return np.floor(asset_investments / prices)
+
+
+def _get_per_code_values(values, codes, name):
+    if isinstance(values, (int, float)):
+        return np.full(len(codes), float(values))
+
+    _missing = [x for x in codes if x not in values]
+    if _missing:
+        raise KeyError(f"Missing the {name} of {', '.join(_missing)}")
+    return np.array([float(values[x]) for x in codes])
+
+
+def argument_parser():
+    parser = argparse.ArgumentParser(
+        description='project the wallet value under random price paths while contributing by '
+                    'the suggestion rule')
+    parser.add_argument('input_data', help='wallet JSON file')
+    parser.add_argument('contribution', type=float, help='contribution per period')
+    parser.add_argument('--years', type=float, default=10.0)
+    parser.add_argument('--periods-per-year', type=int, default=12)
+    parser.add_argument('--drift', type=float, default=0.08,
+                        help='annual drift used for every ticker not in --parameters')
+    parser.add_argument('--volatility', type=float, default=0.25,
+                        help='annual volatility used for every ticker not in --parameters')
+    parser.add_argument('--parameters', default=None,
+                        help='JSON file mapping tickers to {"drift": x, "volatility": y}')
+    parser.add_argument('--paths', type=int, default=10000)
+    parser.add_argument('--chunk-size', type=int, default=5000)
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--no-carry-cash', action='store_true',
+                        help='drop the money left after rounding down to whole shares instead '
+                             'of adding it to the next contribution')
+    parser.add_argument('-d', '--dry-run', action='store_true')
+    return parser.parse_args()
+
+
+def main():
+    args = argument_parser()
+    with open(args.input_data, encoding="utf-8") as fp:
+        wallet = ColumnarWallet.from_wallet(Wallet.from_dict_in_bulk(json.load(fp)))
+    if args.dry_run:
+        wallet.update_asset_values(lambda _: 1.0)
+    else:
+        wallet.update_asset_values_in_bulk(QuoteBook(brapi.get_quote, brapi.get_quotes).get_prices)
+
+    parameters = dict()
+    if args.parameters is not None:
+        with open(args.parameters, encoding="utf-8") as fp:
+            parameters = json.load(fp)
+    _codes = wallet.get_asset_codes()
+    drifts = {x: parameters.get(x, {}).get('drift', args.drift) for x in _codes}
+    volatilities = {x: parameters.get(x, {}).get('volatility', args.volatility) for x in _codes}
+
+    result = MonteCarloProjection(
+        wallet, args.contribution, max(1, round(args.years * args.periods_per_year)), drifts,
+        volatilities, args.periods_per_year, args.paths, args.seed, args.chunk_size,
+        args.processes, carry_cash=not args.no_carry_cash).run()
+    sys.stdout.write(json.dumps(result.to_dict()) + '\n')
+
+
+if __name__ == '__main__':
+    main()
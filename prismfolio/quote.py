@@ -0,0 +1,99 @@
+import json
+
+
+class Quote:
+    def __init__(self, code: str, price, price_earnings=0.0, name=None, currency=None,
+                 change_percent=None, market_time=None):
+        self._code = code
+        self._price = price
+        self._price_earnings = price_earnings
+        self._name = name
+        self._currency = currency
+        self._change_percent = change_percent
+        self._market_time = market_time
+
+    # Public
+    def get_code(self):
+        return self._code
+
+    def get_price(self):
+        return self._price
+
+    def get_price_earnings(self):
+        return self._price_earnings
+
+    def get_name(self):
+        return self._name
+
+    def get_currency(self):
+        return self._currency
+
+    def get_change_percent(self):
+        return self._change_percent
+
+    def get_market_time(self):
+        return self._market_time
+
+    def to_dict(self):
+        return {'symbol': self._code,
+                'regularMarketPrice': self._price,
+                'priceEarnings': self._price_earnings,
+                'shortName': self._name,
+                'currency': self._currency,
+                'regularMarketChangePercent': self._change_percent,
+                'regularMarketTime': self._market_time}
+
+    @classmethod
+    def from_json(cls, json_data):
+        return cls.from_dict(json.loads(json_data))
+
+    @classmethod
+    def from_dict(cls, dict_data):
+        if not isinstance(dict_data, dict):
+            raise TypeError(f"Expected a dict. Got a {type(dict_data)}")
+
+        return cls(code=dict_data.get('symbol'),
+                   price=dict_data.get('regularMarketPrice'),
+                   price_earnings=dict_data.get('priceEarnings', 0.0),
+                   name=dict_data.get('shortName'),
+                   currency=dict_data.get('currency'),
+                   change_percent=dict_data.get('regularMarketChangePercent'),
+                   market_time=dict_data.get('regularMarketTime'))
+
+
+class QuoteBook:
+    def __init__(self, quote_function, bulk_quote_function=None):
+        self._quote_function = quote_function
+        self._bulk_quote_function = bulk_quote_function
+        self._quotes = dict()
+
+    # Public
+    def get_quote(self, code):
+        if code not in self._quotes:
+            self._quotes[code] = self._quote_function(code)
+        return self._quotes[code]
+
+    def get_quotes(self, codes):
+        if self._bulk_quote_function is None:
+            return {x: self.get_quote(x) for x in codes}
+
+        _missing = {x for x in codes if x not in self._quotes}
+        if _missing:
+            self._quotes.update(self._bulk_quote_function(_missing))
+
+        return {x: self._quotes[x] for x in codes if x in self._quotes}
+
+    def get_price(self, code):
+        return self.get_quote(code).get_price()
+
+    def get_price_earnings(self, code):
+        return self.get_quote(code).get_price_earnings()
+
+    def get_prices(self, codes):
+        return {x: y.get_price() for x, y in self.get_quotes(codes).items()}
+
+    def get_prices_earnings(self, codes):
+        return {x: y.get_price_earnings() for x, y in self.get_quotes(codes).items()}
+
+    def clear(self):
+        self._quotes.clear()
@@ -0,0 +1,101 @@
+from prismfolio.quote import QuoteBook
+
+from collections import OrderedDict
+import threading
+import time
+
+
+class QuoteCache(QuoteBook):
+    def __init__(self, quote_function, bulk_quote_function=None, ttl=60.0, max_size=4096,
+                 clock=time.monotonic):
+        super().__init__(quote_function, bulk_quote_function)
+        if ttl <= 0:
+            raise ValueError(f"TTL should be a positive value. Received {ttl}")
+
+        if max_size <= 0:
+            raise ValueError(f"Max size should be a positive value. Received {max_size}")
+
+        self._quotes = OrderedDict()
+        self._ttl = ttl
+        self._max_size = max_size
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    # Public
+    def get_quote(self, code):
+        with self._lock:
+            quote = self._get_fresh_quote(code)
+        if quote is not None:
+            return quote
+
+        quote = self._quote_function(code)
+        with self._lock:
+            self._store_quote(code, quote)
+        return quote
+
+    def get_quotes(self, codes):
+        if self._bulk_quote_function is None:
+            return {x: self.get_quote(x) for x in codes}
+
+        quotes = dict()
+        with self._lock:
+            for code in codes:
+                quote = self._get_fresh_quote(code)
+                if quote is not None:
+                    quotes[code] = quote
+
+        _missing = {x for x in codes if x not in quotes}
+        if _missing:
+            _fetched = self._bulk_quote_function(_missing)
+            with self._lock:
+                for code, quote in _fetched.items():
+                    self._store_quote(code, quote)
+            quotes.update(_fetched)
+
+        return {x: quotes[x] for x in codes if x in quotes}
+
+    def get_hits(self):
+        return self._hits
+
+    def get_misses(self):
+        return self._misses
+
+    def get_hit_rate(self):
+        _lookups = self._hits + self._misses
+        return self._hits / _lookups if _lookups else 0.0
+
+    def invalidate(self, code):
+        with self._lock:
+            self._quotes.pop(code, None)
+
+    def clear(self):
+        with self._lock:
+            self._quotes.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def __len__(self):
+        return len(self._quotes)
+
+    def __contains__(self, code):
+        with self._lock:
+            return code in self._quotes and self._quotes[code][0] > self._clock()
+
+    # Private
+    def _get_fresh_quote(self, code):
+        entry = self._quotes.get(code)
+        if entry is None or entry[0] <= self._clock():
+            self._misses += 1
+            return None
+
+        self._quotes.move_to_end(code)
+        self._hits += 1
+        return entry[1]
+
+    def _store_quote(self, code, quote):
+        self._quotes[code] = (self._clock() + self._ttl, quote)
+        self._quotes.move_to_end(code)
+        while len(self._quotes) > self._max_size:
+            self._quotes.popitem(last=False)
@@ -0,0 +1,121 @@
+from prismfolio.quote import Quote, QuoteBook
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+
+
+class QuoteNotStored(Exception):
+    pass
+
+
+class QuoteStore(QuoteBook):
+    _SELECT_CHUNK_SIZE = 500
+
+    def __init__(self, path, quote_function=None, bulk_quote_function=None, max_age=3600.0,
+                 clock=time.time):
+        super().__init__(quote_function, bulk_quote_function)
+        self._max_age = max_age
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute("CREATE TABLE IF NOT EXISTS quotes ("
+                                     "code TEXT NOT NULL, "
+                                     "fetched_at REAL NOT NULL, "
+                                     "data TEXT NOT NULL, "
+                                     "PRIMARY KEY (code, fetched_at))")
+
+    # Public
+    def is_offline(self):
+        return self._quote_function is None
+
+    def get_quote(self, code):
+        stored = self._select_latest([code]).get(code)
+        if stored is not None and (self.is_offline() or self._is_fresh(stored[0])):
+            return stored[1]
+
+        if self.is_offline():
+            raise QuoteNotStored(f"There is no stored quote for {code}.")
+
+        try:
+            quote = self._quote_function(code)
+        except Exception as err:
+            if stored is None:
+                raise
+            logging.warning("Using the stored quote of %s. %s" % (code, err))
+            return stored[1]
+
+        self.put_quotes({code: quote})
+        return quote
+
+    def get_quotes(self, codes):
+        stored = self._select_latest(codes)
+        quotes = {x: y[1] for x, y in stored.items() if self.is_offline() or self._is_fresh(y[0])}
+        if self.is_offline():
+            return quotes
+
+        _missing = [x for x in codes if x not in quotes]
+        if _missing and self._bulk_quote_function is None:
+            quotes.update({x: self.get_quote(x) for x in _missing})
+        elif _missing:
+            try:
+                _fetched = self._bulk_quote_function(_missing)
+            except Exception as err:
+                _stale = {x: stored[x][1] for x in _missing if x in stored}
+                if not _stale:
+                    raise
+                logging.warning("Using the stored quotes of %s. %s" % (', '.join(_stale), err))
+                _fetched = _stale
+            else:
+                self.put_quotes(_fetched)
+            quotes.update(_fetched)
+
+        return {x: quotes[x] for x in codes if x in quotes}
+
+    def put_quotes(self, quotes, fetched_at=None):
+        fetched_at = self._clock() if fetched_at is None else fetched_at
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO quotes (code, fetched_at, data) VALUES (?, ?, ?)",
+                [(x, fetched_at, json.dumps(y.to_dict())) for x, y in quotes.items()])
+
+    def prune(self, keep_last=1):
+        with self._lock, self._connection:
+            self._connection.execute(
+                "DELETE FROM quotes WHERE (SELECT COUNT(*) FROM quotes AS newer "
+                "WHERE newer.code = quotes.code AND newer.fetched_at > quotes.fetched_at) >= ?",
+                (keep_last,))
+
+    def clear(self):
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM quotes")
+
+    def close(self):
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    # Private
+    def _is_fresh(self, fetched_at):
+        return self._clock() - fetched_at <= self._max_age
+
+    def _select_latest(self, codes):
+        codes = list(dict.fromkeys(codes))
+        latest = dict()
+        with self._lock:
+            for i in range(0, len(codes), self._SELECT_CHUNK_SIZE):
+                _chunk = codes[i:i + self._SELECT_CHUNK_SIZE]
+                rows = self._connection.execute(
+                    "SELECT code, MAX(fetched_at), data FROM quotes WHERE code IN ({}) "
+                    "GROUP BY code".format(', '.join('?' * len(_chunk))), _chunk)
+                for code, fetched_at, data in rows:
+                    latest[code] = (fetched_at, Quote.from_json(data))
+
+        return latest
@@ -0,0 +1,287 @@
+from prismfolio import brapi
+from prismfolio.asset import AssetPricingError
+from prismfolio.investmentsuggestion import WalletInvestmentSuggestion
+from prismfolio.quotecache import QuoteCache
+from prismfolio.wallet import Wallet
+from prismfolio.walletschema import WalletValidationError, check_value
+from prismfolio.wholesharesuggestion import WholeShareInvestmentSuggestion
+
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+import argparse
+import json
+import logging
+import math
+import threading
+
+MAX_BODY_SIZE = 64 * 1024 * 1024
+
+
+class UnknownWalletError(KeyError):
+    pass
+
+
+class SuggestionService:
+    def __init__(self, bulk_pricing_function, suggestion_class=WalletInvestmentSuggestion):
+        self._bulk_pricing_function = bulk_pricing_function
+        self._suggestion_class = suggestion_class
+        self._lock = threading.Lock()
+        self._wallets = dict()
+
+    # Public
+    def get_wallet_ids(self):
+        with self._lock:
+            return sorted(self._wallets)
+
+    def get_wallet(self, wallet_id):
+        return self._get_entry(wallet_id).get_wallet()
+
+    def has_wallet(self, wallet_id):
+        with self._lock:
+            return wallet_id in self._wallets
+
+    def add_wallet(self, wallet_id, dict_data):
+        entry = _WalletEntry(Wallet.from_dict_in_bulk(dict_data))
+        with self._lock:
+            self._wallets[wallet_id] = entry
+        return entry.get_wallet()
+
+    def remove_wallet(self, wallet_id):
+        with self._lock:
+            if self._wallets.pop(wallet_id, None) is None:
+                raise UnknownWalletError(wallet_id)
+
+    def suggest(self, wallet_id, contribution):
+        check_value(contribution, get_contribution_error)
+        entry = self._get_entry(wallet_id)
+        with entry.get_lock():
+            try:
+                entry.get_wallet().update_asset_values_in_bulk(self._bulk_pricing_function)
+            except AssetPricingError:
+                raise
+            except Exception as err:
+                raise AssetPricingError(f"It is not possible to price the wallet {wallet_id}. "
+                                        f"{err}") from err
+            return entry.get_suggestion(self._suggestion_class, float(contribution)).to_dict()
+
+    # Private
+    def _get_entry(self, wallet_id):
+        with self._lock:
+            entry = self._wallets.get(wallet_id)
+        if entry is None:
+            raise UnknownWalletError(wallet_id)
+        return entry
+
+
+def get_contribution_error(contribution):
+    if isinstance(contribution, bool) or not isinstance(contribution, (int, float)):
+        return TypeError(f"Contribution value must be a number. Got {type(contribution)} "
+                         f"{contribution}")
+
+    if not math.isfinite(contribution):
+        return ValueError(f"Contribution value must be a finite number. Got {contribution}")
+
+
+class _WalletEntry:
+    __slots__ = ('_wallet', '_lock', '_suggestion', '_contribution')
+
+    def __init__(self, wallet: Wallet):
+        self._wallet = wallet
+        self._lock = threading.Lock()
+        self._suggestion = None
+        self._contribution = None
+
+    # Public
+    def get_wallet(self):
+        return self._wallet
+
+    def get_lock(self):
+        return self._lock
+
+    def get_suggestion(self, suggestion_class, contribution):
+        if self._suggestion is None or self._contribution != contribution:
+            self._suggestion = suggestion_class(self._wallet, contribution)
+            self._contribution = contribution
+        return self._suggestion
+
+
+class SuggestionRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    # Public
+    def do_GET(self):
+        path, query = self._get_route()
+        if path == ['health']:
+            return self._send(HTTPStatus.OK, {'status': 'ok'})
+
+        if path == ['wallets']:
+            return self._send(HTTPStatus.OK, {'wallets': self.server.service.get_wallet_ids()})
+
+        if len(path) == 3 and path[0] == 'wallets' and path[2] == 'suggestion':
+            try:
+                contribution = float(query['contribution'][0])
+            except (KeyError, ValueError):
+                return self._send_error(HTTPStatus.BAD_REQUEST,
+                                        "Expected a numeric 'contribution' query parameter.")
+            return self._suggest(path[1], contribution)
+
+        self._send_error(HTTPStatus.NOT_FOUND, f"No route for {self.path}.")
+
+    def do_POST(self):
+        path, _ = self._get_route()
+        if len(path) != 3 or path[0] != 'wallets' or path[2] != 'suggestion':
+            return self._send_error(HTTPStatus.NOT_FOUND, f"No route for {self.path}.")
+
+        body = self._read_json()
+        if body is None:
+            return
+        if not isinstance(body, dict) or 'contribution' not in body:
+            return self._send_error(HTTPStatus.BAD_REQUEST,
+                                    "Expected a JSON object with a 'contribution' value.")
+        self._suggest(path[1], body['contribution'])
+
+    def do_PUT(self):
+        path, _ = self._get_route()
+        if len(path) != 2 or path[0] != 'wallets':
+            return self._send_error(HTTPStatus.NOT_FOUND, f"No route for {self.path}.")
+
+        body = self._read_json()
+        if body is None:
+            return
+        try:
+            self.server.service.add_wallet(path[1], body)
+        except (WalletValidationError, TypeError, ValueError) as err:
+            return self._send_error(HTTPStatus.BAD_REQUEST, str(err))
+        self._send(HTTPStatus.CREATED, {'id': path[1]})
+
+    def do_DELETE(self):
+        path, _ = self._get_route()
+        if len(path) != 2 or path[0] != 'wallets':
+            return self._send_error(HTTPStatus.NOT_FOUND, f"No route for {self.path}.")
+
+        try:
+            self.server.service.remove_wallet(path[1])
+        except UnknownWalletError:
+            return self._send_error(HTTPStatus.NOT_FOUND, f"Unknown wallet {path[1]}.")
+        self._send(HTTPStatus.OK, {'id': path[1]})
+
+    def parse_request(self):
+        self._body_read = False
+        return super().parse_request()
+
+    def log_message(self, format, *args):
+        logging.debug("%s - " + format, self.address_string(), *args)
+
+    # Private
+    def _get_route(self):
+        _url = urlsplit(self.path)
+        return [unquote(x) for x in _url.path.split('/') if x], parse_qs(_url.query)
+
+    def _suggest(self, wallet_id, contribution):
+        error = get_contribution_error(contribution)
+        if error is not None:
+            return self._send_error(HTTPStatus.BAD_REQUEST, str(error))
+
+        try:
+            suggestion = self.server.service.suggest(wallet_id, contribution)
+        except UnknownWalletError:
+            return self._send_error(HTTPStatus.NOT_FOUND, f"Unknown wallet {wallet_id}.")
+        except AssetPricingError as err:
+            return self._send_error(HTTPStatus.BAD_GATEWAY, str(err))
+        except Exception as err:
+            logging.exception(err)
+            return self._send_error(HTTPStatus.INTERNAL_SERVER_ERROR, str(err))
+        self._send(HTTPStatus.OK, suggestion)
+
+    def _read_json(self):
+        try:
+            _length = int(self.headers.get('Content-Length', 0))
+        except ValueError:
+            _length = -1
+        if _length < 0 or _length > MAX_BODY_SIZE:
+            self._send_error(HTTPStatus.BAD_REQUEST, "Invalid Content-Length.")
+            return None
+
+        _body = self.rfile.read(_length)
+        self._body_read = True
+        try:
+            return json.loads(_body)
+        except ValueError as err:
+            self._send_error(HTTPStatus.BAD_REQUEST, f"Invalid JSON body. {err}")
+            return None
+
+    def _has_unread_body(self):
+        return not self._body_read and (
+            'Transfer-Encoding' in self.headers or
+            self.headers.get('Content-Length', '0').strip() not in ('', '0'))
+
+    def _send_error(self, status, message):
+        self._send(status, {'error': message})
+
+    def _send(self, status, data):
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if self._has_unread_body():
+            self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class SuggestionServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, service: SuggestionService):
+        super().__init__(address, SuggestionRequestHandler)
+        self.service = service
+
+
+def argument_parser():
+    parser = argparse.ArgumentParser(
+        description='keep wallets and quotes in memory and answer suggestion requests over HTTP')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--wallet', action='append', default=[], metavar='ID=PATH',
+                        help='load the wallet in PATH under ID at startup; may be repeated')
+    parser.add_argument('--ttl', type=float, default=60.0,
+                        help='seconds a quote is served from memory before fetching it again')
+    parser.add_argument('-d', '--dry-run', action='store_true')
+    parser.add_argument('-w', '--whole-shares', action='store_true',
+                        help='spend the money left after rounding down to whole shares')
+    return parser.parse_args()
+
+
+def main():
+    args = argument_parser()
+    logging.getLogger().setLevel(logging.INFO)
+    if args.dry_run:
+        bulk_pricing_function = _dry_run_bulk_function
+    else:
+        bulk_pricing_function = QuoteCache(brapi.get_quote, brapi.get_quotes,
+                                           ttl=args.ttl).get_prices
+
+    service = SuggestionService(bulk_pricing_function,
+                                WholeShareInvestmentSuggestion if args.whole_shares
+                                else WalletInvestmentSuggestion)
+    for value in args.wallet:
+        wallet_id, _, path = value.partition('=')
+        with open(path, encoding="utf-8") as fp:
+            service.add_wallet(wallet_id, json.load(fp))
+
+    with SuggestionServer((args.host, args.port), service) as server:
+        logging.info("Serving %d wallets on http://%s:%d", len(service.get_wallet_ids()),
+                     *server.server_address[:2])
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+def _dry_run_bulk_function(codes):
+    return {x: 1.0 for x in codes}
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+from prismfolio.investmentsuggestion import WalletInvestmentSuggestion
+
+import csv
+import io
+import json
+
+TABLE = 'table'
+JSON = 'json'
+NDJSON = 'ndjson'
+CSV = 'csv'
+OUTPUT_FORMATS = (TABLE, JSON, NDJSON, CSV)
+ASSET_FIELDS = ('group', 'code', 'investment', 'shares', 'price', 'remainder',
+                'percent_to_next_share', 'current_participation')
+
+_GROUP_LAYOUT = "{}\t Investment: R$ {:5.2f}\n"
+_TABLE_HEADER = ("asset\t| investment\t| quantity\t| unit price\t| left\t\t| % to buy one more "
+                 "| current participation\n")
+_ASSET_LAYOUT = ("{:<6}\t| R$ {:5.2f}\t| {:4d} shares\t| R$ {:5.2f}\t| R$ {:5.2f}\t| {:15.2f} % "
+                 "| {:2.2f} %\n")
+
+
+def iter_asset_rows(suggestion: WalletInvestmentSuggestion, wallet_id=None):
+    for group in suggestion.to_dict()['investment_groups']:
+        for asset in group['assets']:
+            row = {'group': group['name']} if wallet_id is None else \
+                {'wallet': wallet_id, 'group': group['name']}
+            row.update(asset)
+            yield row
+
+
+def format_suggestion(suggestion: WalletInvestmentSuggestion, output_format=TABLE, header=True,
+                      wallet_id=None):
+    if output_format == TABLE:
+        return _format_table(suggestion)
+
+    if output_format == JSON:
+        data = suggestion.to_dict()
+        if wallet_id is not None:
+            data = dict(wallet=wallet_id, **data)
+        return json.dumps(data) + '\n'
+
+    if output_format == NDJSON:
+        return ''.join(json.dumps(x) + '\n' for x in iter_asset_rows(suggestion, wallet_id))
+
+    if output_format == CSV:
+        _fields = ASSET_FIELDS if wallet_id is None else ('wallet',) + ASSET_FIELDS
+        output = io.StringIO()
+        writer = csv.DictWriter(output, _fields, lineterminator='\n')
+        if header:
+            writer.writeheader()
+        writer.writerows(iter_asset_rows(suggestion, wallet_id))
+        return output.getvalue()
+
+    raise ValueError(f"Output format should be one of {', '.join(OUTPUT_FORMATS)}. "
+                     f"Received {output_format}")
+
+
+def write_suggestion(suggestion: WalletInvestmentSuggestion, fp, output_format=TABLE,
+                     header=True, wallet_id=None):
+    fp.write(format_suggestion(suggestion, output_format, header, wallet_id))
+
+
+def _format_table(suggestion: WalletInvestmentSuggestion):
+    lines = list()
+    for group in suggestion.to_dict()['investment_groups']:
+        lines.append(_GROUP_LAYOUT.format(group['name'], group['investment']))
+        lines.append(_TABLE_HEADER)
+        lines.extend(_ASSET_LAYOUT.format(x['code'], x['investment'], x['shares'], x['price'],
+                                          x['remainder'], x['percent_to_next_share'],
+                                          x['current_participation'])
+                     for x in group['assets'])
+    return ''.join(lines)
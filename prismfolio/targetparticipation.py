@@ -1,18 +1,17 @@
-class TargetParticipation:
-    def __init__(self, target_participation: float):
-        if not isinstance(target_participation, float):
-            raise TypeError(
-                f"Participation should be a float value. Received {target_participation}")
+from prismfolio.walletschema import check_value, get_target_participation_error
 
-        if target_participation < 0:
-            raise ValueError("Participation should not be a negative value. "
-                             f"Received {target_participation}")
 
-        if target_participation > 100.0:
-            raise ValueError(f"Participation value should not be higher than 100%. "
-                             f"Received {target_participation}.")
-        self.__target_participation = target_participation
+class TargetParticipation:
+    __slots__ = ('__target_participation',)
+
+    def __init__(self, target_participation: float):
+        self.__target_participation = check_value(target_participation,
+                                                  get_target_participation_error)
 
     # Public
     def get_target_participation(self):
         return self.__target_participation
+
+    # Private
+    def _set_trusted_target_participation(self, target_participation):
+        self.__target_participation = target_participation
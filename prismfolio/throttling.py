@@ -0,0 +1,129 @@
+import threading
+import time
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class TokenBucket:
+    _TOLERANCE = 1e-9
+
+    def __init__(self, rate: float, capacity: float, clock=time.monotonic):
+        if rate <= 0:
+            raise ValueError(f"Rate should be a positive value. Received {rate}")
+
+        if capacity < 1:
+            raise ValueError(f"Capacity should be at least 1. Received {capacity}")
+
+        self._rate = rate
+        self._capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._updated_at = clock()
+
+    # Public
+    def try_acquire(self, tokens=1):
+        if self.get_wait_time(tokens) > 0:
+            return False
+
+        self._tokens = max(0.0, self._tokens - tokens)
+        return True
+
+    def get_wait_time(self, tokens=1):
+        self._refill()
+        _missing_tokens = tokens - self._tokens
+        if _missing_tokens <= self._TOLERANCE:
+            return 0.0
+        return _missing_tokens / self._rate
+
+    # Private
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated_at) * self._rate)
+        self._updated_at = now
+
+
+class RateLimiter:
+    def __init__(self, per_second=None, per_minute=None, clock=time.monotonic, sleep=time.sleep):
+        self._buckets = list()
+        if per_second is not None:
+            self._buckets.append(TokenBucket(per_second, max(1, per_second), clock))
+
+        if per_minute is not None:
+            self._buckets.append(TokenBucket(per_minute / 60.0, max(1, per_minute), clock))
+
+        self._sleep = sleep
+        self._lock = threading.Lock()
+
+    # Public
+    def acquire(self):
+        with self._lock:
+            while True:
+                _wait_time = max((x.get_wait_time() for x in self._buckets), default=0.0)
+                if _wait_time <= 0:
+                    break
+                self._sleep(_wait_time)
+
+            for bucket in self._buckets:
+                bucket.try_acquire()
+
+
+class CircuitBreaker:
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, clock=time.monotonic):
+        if failure_threshold < 1:
+            raise ValueError(f"Failure threshold should be at least 1. "
+                             f"Received {failure_threshold}")
+
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+
+    # Public
+    def get_state(self):
+        with self._lock:
+            return self._get_state()
+
+    def before_call(self):
+        with self._lock:
+            _state = self._get_state()
+            if _state == self.CLOSED:
+                return
+
+            if _state == self.HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return
+
+        raise CircuitOpenError(f"The circuit is open after {self._failures} consecutive "
+                               f"failures. Not calling the upstream service.")
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or self._failures >= self._failure_threshold:
+                self._opened_at = self._clock()
+            self._trial_running = False
+
+    # Private
+    def _get_state(self):
+        if self._opened_at is None:
+            return self.CLOSED
+
+        if self._clock() - self._opened_at >= self._reset_timeout:
+            return self.HALF_OPEN
+
+        return self.OPEN
@@ -0,0 +1,213 @@
+from prismfolio.columnarwallet import ColumnarWallet
+from prismfolio.wallet import Wallet
+
+import numpy as np
+
+
+class WalletArrays:
+    __slots__ = ('_codes', '_prices', '_quantities', '_asset_targets', '_group_names',
+                 '_group_targets', '_group_index')
+
+    def __init__(self, codes, prices, quantities, asset_targets, group_names, group_targets,
+                 group_index):
+        self._codes = list(codes)
+        self._prices = np.asarray(prices, dtype=np.float64)
+        self._quantities = np.asarray(quantities, dtype=np.int64)
+        self._asset_targets = np.asarray(asset_targets, dtype=np.float64)
+        self._group_names = list(group_names)
+        self._group_targets = np.asarray(group_targets, dtype=np.float64)
+        self._group_index = np.asarray(group_index, dtype=np.intp)
+
+    # Public
+    def get_codes(self):
+        return self._codes
+
+    def get_prices(self):
+        return self._prices
+
+    def get_quantities(self):
+        return self._quantities
+
+    def get_asset_targets(self):
+        return self._asset_targets
+
+    def get_group_names(self):
+        return self._group_names
+
+    def get_group_targets(self):
+        return self._group_targets
+
+    def get_group_index(self):
+        return self._group_index
+
+    def get_number_of_assets(self):
+        return len(self._codes)
+
+    def get_number_of_groups(self):
+        return len(self._group_names)
+
+    @classmethod
+    def from_wallet(cls, wallet: Wallet):
+        if isinstance(wallet, ColumnarWallet):
+            wallet._check_prices()
+            return cls(wallet.get_codes().tolist(), wallet.get_prices(), wallet.get_quantities(),
+                       wallet.get_asset_targets(), wallet.get_group_names(),
+                       wallet.get_group_targets(), wallet.get_group_index())
+
+        codes, prices, quantities, asset_targets, group_index = [], [], [], [], []
+        groups = wallet.get_investment_groups()
+        for index, group in enumerate(groups):
+            for asset in group.get_assets():
+                codes.append(asset.get_code())
+                prices.append(asset.get_price())
+                quantities.append(asset.get_quantity())
+                asset_targets.append(asset.get_target_participation())
+                group_index.append(index)
+
+        return cls(codes, prices, quantities, asset_targets,
+                   [x.get_name() for x in groups],
+                   [x.get_target_participation() for x in groups],
+                   group_index)
+
+
+class VectorizedInvestmentSuggestion:
+    def __init__(self, wallet, new_contribution):
+        self._arrays = wallet if isinstance(wallet, WalletArrays) else \
+            WalletArrays.from_wallet(wallet)
+        self._new_contribution = new_contribution
+
+        _arrays = self._arrays
+        self._group_investments, self._asset_investments = _allocate(
+            _arrays.get_prices(), _arrays.get_quantities(), _arrays.get_asset_targets(),
+            _arrays.get_group_targets(), _arrays.get_group_index(), new_contribution)
+        self._shares = np.floor_divide(self._asset_investments, _arrays.get_prices())
+        self._remainders = _get_remainders(self._asset_investments, self._shares,
+                                           _arrays.get_prices())
+
+    # Public
+    def get_wallet_arrays(self):
+        return self._arrays
+
+    def get_group_investments(self):
+        return self._group_investments
+
+    def get_asset_investments(self):
+        return self._asset_investments
+
+    def get_suggested_shares_buying(self):
+        return self._shares
+
+    def get_remainders(self):
+        return self._remainders
+
+    def get_remainder(self):
+        return float(self._remainders.sum())
+
+    def get_group_remainders(self):
+        return sum_by_group(self._remainders, self._arrays.get_group_index(),
+                             self._arrays.get_number_of_groups())
+
+    def __len__(self):
+        return self._arrays.get_number_of_groups()
+
+
+class ContributionSweep:
+    def __init__(self, wallet, contributions):
+        self._arrays = wallet if isinstance(wallet, WalletArrays) else \
+            WalletArrays.from_wallet(wallet)
+        self._contributions = np.asarray(contributions, dtype=np.float64).ravel()
+
+        _arrays = self._arrays
+        _asset_amounts, _group_amounts, _wallet_amount = _get_amounts(
+            _arrays.get_prices(), _arrays.get_quantities(), _arrays.get_group_index(),
+            _arrays.get_number_of_groups())
+        self._group_investments, self._asset_investments = allocate_amounts(
+            _asset_amounts, _group_amounts, _wallet_amount, _arrays.get_asset_targets(),
+            _arrays.get_group_targets(), _arrays.get_group_index(), self._contributions)
+        self._shares = np.floor_divide(self._asset_investments, _arrays.get_prices())
+        self._remainders = _get_remainders(self._asset_investments, self._shares,
+                                           _arrays.get_prices())
+
+    # Public
+    def get_wallet_arrays(self):
+        return self._arrays
+
+    def get_contributions(self):
+        return self._contributions
+
+    def get_group_investments(self):
+        return self._group_investments
+
+    def get_asset_investments(self):
+        return self._asset_investments
+
+    def get_suggested_shares_buying(self):
+        return self._shares
+
+    def get_remainders(self):
+        return self._remainders
+
+    def get_remainder(self):
+        return self._remainders.sum(axis=-1)
+
+    def __len__(self):
+        return len(self._contributions)
+
+
+def get_group_matrix(group_index, number_of_groups):
+    return np.eye(number_of_groups)[group_index]
+
+
+def sum_by_group(values, group_index, number_of_groups, group_matrix=None):
+    if group_matrix is not None:
+        return values @ group_matrix
+
+    values = np.asarray(values, dtype=np.float64)
+    _leading_shape = values.shape[:-1]
+    _rows = int(np.prod(_leading_shape, dtype=np.intp))
+    _bins = (np.arange(_rows, dtype=np.intp)[:, None] * number_of_groups + group_index).ravel()
+    return np.bincount(_bins, weights=values.reshape(_rows, -1).ravel(),
+                       minlength=_rows * number_of_groups).reshape(
+                           _leading_shape + (number_of_groups,))
+
+
+def allocate_amounts(asset_amounts, group_amounts, wallet_amount, asset_targets, group_targets,
+                     group_index, contribution, group_matrix=None):
+    contribution = np.asarray(contribution, dtype=np.float64)[..., None]
+
+    group_ideal = np.maximum(0, 0.01 * group_targets * (wallet_amount + contribution)
+                             - group_amounts)
+    group_investments = _distribute(group_ideal, group_ideal.sum(axis=-1, keepdims=True),
+                                    contribution)
+
+    asset_ideal = np.maximum(0, 0.01 * asset_targets * (group_amounts[..., group_index]
+                                                        + contribution) - asset_amounts)
+    asset_total_ideal = sum_by_group(asset_ideal, group_index, group_targets.shape[-1],
+                                     group_matrix)
+    asset_investments = _distribute(asset_ideal, asset_total_ideal[..., group_index],
+                                    group_investments[..., group_index])
+    return group_investments, asset_investments
+
+
+def _distribute(ideal_investments, total_ideal_investments, contribution):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(total_ideal_investments == 0, 0.0,
+                        (ideal_investments / total_ideal_investments) * contribution)
+
+
+def _get_amounts(prices, quantities, group_index, number_of_groups):
+    asset_amounts = prices * quantities
+    group_amounts = sum_by_group(asset_amounts, group_index, number_of_groups)
+    return asset_amounts, group_amounts, group_amounts.sum(axis=-1, keepdims=True)
+
+
+def _allocate(prices, quantities, asset_targets, group_targets, group_index, contribution):
+    return allocate_amounts(*_get_amounts(prices, quantities, group_index,
+                                           group_targets.shape[-1]),
+                             asset_targets, group_targets, group_index, contribution)
+
+
+def _get_remainders(asset_investments, shares, prices):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(shares == 0, asset_investments,
+                        np.fmod(asset_investments, shares * prices))
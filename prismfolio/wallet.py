@@ -1,12 +1,25 @@
+from prismfolio import instrumentation
+from prismfolio.asset import Asset
 from prismfolio.investmentgroup import InvestmentGroup
+from prismfolio.walletschema import WalletValidationError, validate_wallet_dict
 
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import gc
 import json
 import logging
 
 
 class Wallet:
+    __slots__ = ('_investment_group', '_asset_index', '_total_amount', '_version',
+                 '_layout_version')
+
     def __init__(self):
         self._investment_group = list()
+        self._asset_index = None
+        self._total_amount = None
+        self._version = 0
+        self._layout_version = 0
 
     # Public
     def get_investment_groups(self):
@@ -14,20 +27,74 @@ class Wallet:
 
     def add_investment_group(self, investment_group: InvestmentGroup):
         self._investment_group.append(investment_group)
+        investment_group._add_observer(self)
+        self._on_layout_changed()
 
     def has_investment_group(self):
         return len(self._investment_group) > 0
 
     def get_total_amount(self):
-        return sum(x.get_total_amount() for x in self._investment_group)
-
-    def update_asset_values(self, pricing_function):
-        for investment_group in self._investment_group:
-            investment_group.update_asset_values(pricing_function)
+        if self._total_amount is None:
+            self._total_amount = sum(x.get_total_amount() for x in self._investment_group)
+        return self._total_amount
+
+    def get_asset_codes(self):
+        return set(self._get_asset_index())
+
+    def get_assets_by_code(self, code):
+        return self._get_asset_index().get(code, [])
+
+    def update_asset_values(self, pricing_function, max_workers=None):
+        with instrumentation.stage('update_asset_values'):
+            self._reset_total_amount()
+            _asset_index = self._get_asset_index()
+            if max_workers is None:
+                for assets in _asset_index.values():
+                    self._update_price_of(assets, pricing_function)
+            else:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    futures = [executor.submit(self._update_price_of, assets, pricing_function)
+                               for assets in _asset_index.values()]
+
+                for future in futures:
+                    future.result()
+
+            self._update_current_participation()
+            instrumentation.increment('priced_tickers', len(_asset_index))
+
+    async def update_asset_values_async(self, pricing_function):
+        with instrumentation.stage('update_asset_values'):
+            self._reset_total_amount()
+            _asset_index = self._get_asset_index()
+            await asyncio.gather(*(self._update_price_of_async(assets, pricing_function)
+                                   for assets in _asset_index.values()))
+            self._update_current_participation()
+            instrumentation.increment('priced_tickers', len(_asset_index))
+
+    def update_asset_values_in_bulk(self, bulk_pricing_function):
+        with instrumentation.stage('fetch_prices'):
+            prices = bulk_pricing_function(self.get_asset_codes())
+        self.update_asset_values(lambda code: prices[code])
+
+    def update_asset_quotes(self, quote_function):
+        self._reset_total_amount()
+        for assets in self._get_asset_index().values():
+            quote = assets[0].update_quote(quote_function)
+            for asset in assets[1:]:
+                asset.update_quote(lambda _: quote)
+
+        self._update_current_participation()
 
     def update_asset_price_earnings(self, price_earnings_function):
-        for investment_group in self._investment_group:
-            investment_group.update_asset_price_earnings(price_earnings_function)
+        for assets in self._get_asset_index().values():
+            price_earnings = assets[0].update_price_earnings(price_earnings_function)
+            for asset in assets[1:]:
+                asset.update_price_earnings(lambda _: price_earnings)
+
+    async def update_asset_price_earnings_async(self, price_earnings_function):
+        await asyncio.gather(*(self._update_price_earnings_of_async(assets,
+                                                                    price_earnings_function)
+                               for assets in self._get_asset_index().values()))
 
     @classmethod
     def from_json(cls, json_data):
@@ -55,6 +122,93 @@ class Wallet:
 
         return _wallet
 
+    @classmethod
+    def from_dict_in_bulk(cls, dict_data):
+        errors, warnings = validate_wallet_dict(dict_data)
+        if errors:
+            raise WalletValidationError(errors)
+
+        for warning in warnings:
+            logging.warning(warning)
+
+        _wallet = cls()
+        _trusted_asset, _trusted_group = Asset._from_trusted, InvestmentGroup._from_trusted
+        _gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            _wallet._investment_group = [
+                _trusted_group(group['name'], group['target_participation'],
+                               [_trusted_asset(x['code'], x['quantity'], x['target_participation'])
+                                for x in group['assets']])
+                for group in dict_data['investment_groups']]
+        finally:
+            if _gc_was_enabled:
+                gc.enable()
+        for investment_group in _wallet._investment_group:
+            investment_group._add_observer(_wallet)
+        return _wallet
+
     # Private
     def _get_total_groups_target_participation(self):
         return sum(x.get_target_participation() for x in self._investment_group)
+
+    def _get_version(self):
+        return self._version
+
+    def _get_layout_version(self):
+        return self._layout_version
+
+    def _reset_total_amount(self):
+        self._total_amount = None
+        for investment_group in self._investment_group:
+            investment_group._reset_total_amount()
+
+    def _on_group_changed(self, investment_group: InvestmentGroup, difference):
+        if self._total_amount is not None and difference is not None:
+            self._total_amount += difference
+        else:
+            self._total_amount = None
+        self._version += 1
+
+    def _on_asset_added(self, investment_group: InvestmentGroup, asset):
+        self._on_layout_changed()
+
+    def _on_layout_changed(self):
+        self._asset_index = None
+        self._total_amount = None
+        self._version += 1
+        self._layout_version += 1
+
+    def _get_asset_index(self):
+        if self._asset_index is None:
+            self._index_assets()
+        return self._asset_index
+
+    def _index_assets(self):
+        self._asset_index = dict()
+        for investment_group in self._investment_group:
+            for asset in investment_group.get_assets():
+                self._asset_index.setdefault(asset.get_code(), list()).append(asset)
+        return self._asset_index
+
+    def _update_current_participation(self):
+        for investment_group in self._investment_group:
+            investment_group.update_current_participation()
+
+    @staticmethod
+    def _update_price_of(assets, pricing_function):
+        price = assets[0].update_price(pricing_function)
+        for asset in assets[1:]:
+            asset.update_price(lambda _: price)
+
+    @staticmethod
+    async def _update_price_of_async(assets, pricing_function):
+        price = await assets[0].update_price_async(pricing_function)
+        for asset in assets[1:]:
+            asset.update_price(lambda _: price)
+
+    @staticmethod
+    async def _update_price_earnings_of_async(assets, price_earnings_function):
+        price_earnings = await assets[0].update_price_earnings_async(price_earnings_function)
+        for asset in assets[1:]:
+            asset.update_price_earnings(lambda _: price_earnings)
@@ -0,0 +1,126 @@
+from prismfolio.wallet import Wallet
+
+import json
+
+CHUNK_SIZE = 1 << 16
+NDJSON = 'ndjson'
+JSON = 'json'
+_MAX_TRUNCATED_TOKEN = 16
+
+
+class WalletDocumentError(Exception):
+    pass
+
+
+def iter_wallets(fp, format=None, chunk_size=CHUNK_SIZE):
+    for document in iter_documents(fp, format, chunk_size):
+        yield Wallet.from_dict_in_bulk(document)
+
+
+def iter_documents(fp, format=None, chunk_size=CHUNK_SIZE):
+    if isinstance(fp, str):
+        with open(fp, encoding="utf-8") as _fp:
+            yield from iter_documents(_fp, format, chunk_size)
+        return
+
+    if format not in (None, NDJSON, JSON):
+        raise ValueError(f"Unknown wallet file format {format}. Use '{NDJSON}' or '{JSON}'.")
+
+    if format == NDJSON:
+        yield from _iter_lines(fp)
+        return
+
+    yield from _JsonStreamDecoder(fp, chunk_size)
+
+
+def _iter_lines(fp):
+    for line_number, line in enumerate(fp, start=1):
+        if not line.strip():
+            continue
+
+        try:
+            yield json.loads(line)
+        except ValueError as err:
+            raise WalletDocumentError(f"Invalid JSON on line {line_number}. {err}") from err
+
+
+def _is_truncated(err: json.JSONDecodeError):
+    return err.msg.startswith('Unterminated string') or \
+        len(err.doc) - err.pos <= _MAX_TRUNCATED_TOKEN
+
+
+class _JsonStreamDecoder:
+    def __init__(self, fp, chunk_size):
+        self._fp = fp
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._position = 0
+        self._eof = False
+
+    def __iter__(self):
+        if self._peek() != '[':
+            while self._peek() is not None:
+                yield self._decode()
+            return
+
+        self._position += 1
+        if self._peek() == ']':
+            self._position += 1
+            return self._check_end()
+
+        while True:
+            yield self._decode()
+            _separator = self._peek()
+            self._position += 1
+            if _separator == ']':
+                return self._check_end()
+
+            if _separator != ',':
+                raise WalletDocumentError(f"Expected ',' or ']' in the wallet array. "
+                                          f"Got {_separator!r}")
+
+    def _check_end(self):
+        if self._peek() is not None:
+            raise WalletDocumentError("Unexpected data after the wallet array.")
+
+    def _peek(self):
+        while True:
+            while self._position < len(self._buffer) and self._buffer[self._position].isspace():
+                self._position += 1
+
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+
+            if not self._read():
+                return None
+
+    def _decode(self):
+        if self._peek() is None:
+            raise WalletDocumentError("Unexpected end of the wallet JSON.")
+
+        _chunk_size = self._chunk_size
+        while True:
+            try:
+                document, end = self._decoder.raw_decode(self._buffer, self._position)
+            except json.JSONDecodeError as err:
+                if not _is_truncated(err) or not self._read(_chunk_size):
+                    raise WalletDocumentError(f"Invalid wallet JSON. {err}") from err
+                _chunk_size *= 2
+                continue
+
+            self._position = end
+            return document
+
+    def _read(self, size=None):
+        if self._eof:
+            return False
+
+        _data = self._fp.read(size or self._chunk_size)
+        if not _data:
+            self._eof = True
+            return False
+
+        self._buffer = self._buffer[self._position:] + _data
+        self._position = 0
+        return True
@@ -0,0 +1,148 @@
+import math
+
+
+class WalletValidationError(ValueError):
+    def __init__(self, errors):
+        super().__init__(f"The wallet has {len(errors)} invalid values. " + ' '.join(errors))
+        self._errors = list(errors)
+
+    # Public
+    def get_errors(self):
+        return self._errors
+
+
+def validate_wallet_dict(dict_data):
+    errors, warnings = list(), list()
+    if not isinstance(dict_data, dict):
+        errors.append(f"Expected a dict. Got a {type(dict_data)}")
+        return errors, warnings
+
+    investment_groups = dict_data.get('investment_groups')
+    if not isinstance(investment_groups, list):
+        errors.append(f"investment_groups: Expected a list. Got a {type(investment_groups)}")
+        return errors, warnings
+
+    _total_groups_participation = 0.0
+    for group_number, group in enumerate(investment_groups):
+        if not isinstance(group, dict):
+            errors.append(f"investment_groups[{group_number}]: Expected a dict. "
+                          f"Got a {type(group)}")
+            continue
+
+        _group_errors = _get_field_errors(group, _GROUP_FIELDS)
+        if _group_errors:
+            errors.extend(f"investment_groups[{group_number}].{x}" for x in _group_errors)
+        else:
+            _total_groups_participation += group['target_participation']
+
+        assets = group.get('assets')
+        if not isinstance(assets, list):
+            errors.append(f"investment_groups[{group_number}].assets: Expected a list. "
+                          f"Got a {type(assets)}")
+            continue
+
+        _total_asset_participation = 0.0
+        for asset_number, asset in enumerate(assets):
+            if type(asset) is dict:
+                _code, _quantity = asset.get('code'), asset.get('quantity')
+                _target_participation = asset.get('target_participation')
+                if type(_code) is str and _code and type(_quantity) is int and _quantity >= 0 \
+                        and type(_target_participation) is float \
+                        and 0 <= _target_participation <= 100.0:
+                    _total_asset_participation += _target_participation
+                    continue
+
+            if not isinstance(asset, dict):
+                errors.append(f"investment_groups[{group_number}].assets[{asset_number}]: "
+                              f"Expected a dict. Got a {type(asset)}")
+                continue
+
+            _asset_errors = _get_field_errors(asset, _ASSET_FIELDS)
+            if _asset_errors:
+                errors.extend(f"investment_groups[{group_number}].assets[{asset_number}].{x}"
+                              for x in _asset_errors)
+            else:
+                _total_asset_participation += asset['target_participation']
+
+        if math.isclose(_total_asset_participation, 100.0, abs_tol=0.001):
+            continue
+
+        if _total_asset_participation > 100.0:
+            warnings.append("The total asset participation on group '%s' is %.2f%%, which is "
+                            "greater than 100%%." % (group.get('name'), _total_asset_participation))
+
+        if _total_asset_participation < 100.0:
+            warnings.append("The total asset participation on group '%s' is %.2f%%, which is "
+                            "lower than 100%%." % (group.get('name'), _total_asset_participation))
+
+    if _total_groups_participation > 100.0:
+        warnings.append("The total investment groups on wallet is %.2f%%, which is "
+                        "greater than 100%%." % _total_groups_participation)
+
+    if _total_groups_participation < 100.0:
+        warnings.append("The total investment groups participation on wallet is %.2f%%, which "
+                        "is lower than 100%%." % _total_groups_participation)
+
+    return errors, warnings
+
+
+def check_value(value, get_error):
+    error = get_error(value)
+    if error is not None:
+        raise error
+    return value
+
+
+def get_name_error(name):
+    if not isinstance(name, str):
+        return TypeError(f"Name value must be a string. Got {type(name)} {name}")
+
+    if len(name) == 0:
+        return ValueError("Name value must be a non empty string.")
+
+
+def get_code_error(code):
+    if not isinstance(code, str):
+        return TypeError(f"Code value must be a string. Got {type(code)} {code}")
+
+    if len(code) == 0:
+        return ValueError("Code value must be a non empty string.")
+
+
+def get_quantity_error(quantity):
+    if isinstance(quantity, bool) or not isinstance(quantity, int):
+        return TypeError(f"Quantity value must be an integer. Got {type(quantity)} {quantity}")
+
+    if quantity < 0:
+        return ValueError(f"Quantity value can't be negative. Received {quantity}")
+
+
+def get_target_participation_error(target_participation):
+    if not isinstance(target_participation, float):
+        return TypeError(
+            f"Participation should be a float value. Received {target_participation}")
+
+    if target_participation < 0:
+        return ValueError("Participation should not be a negative value. "
+                          f"Received {target_participation}")
+
+    if target_participation > 100.0:
+        return ValueError(f"Participation value should not be higher than 100%. "
+                          f"Received {target_participation}.")
+
+
+def _get_field_errors(dict_data, fields):
+    _errors = None
+    for field, get_error in fields:
+        error = get_error(dict_data.get(field))
+        if error is not None:
+            _errors = _errors or list()
+            _errors.append(f"{field}: {error}")
+    return _errors
+
+
+_GROUP_FIELDS = (('name', get_name_error),
+                 ('target_participation', get_target_participation_error))
+_ASSET_FIELDS = (('code', get_code_error),
+                 ('quantity', get_quantity_error),
+                 ('target_participation', get_target_participation_error))
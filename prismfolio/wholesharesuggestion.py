@@ -0,0 +1,81 @@
+from prismfolio import instrumentation
+from prismfolio.investmentsuggestion import WalletInvestmentSuggestion
+from prismfolio.wallet import Wallet
+
+import heapq
+
+
+class WholeShareInvestmentSuggestion(WalletInvestmentSuggestion):
+    __slots__ = ('_remainder',)
+
+    _TOLERANCE = 1e-9
+
+    def __init__(self, wallet: Wallet, new_contribution):
+        self._remainder = None
+        super().__init__(wallet, new_contribution)
+
+    # Public
+    def get_remainder(self):
+        self._refresh()
+        return self._remainder
+
+    # Private
+    def _build(self):
+        super()._build()
+        _total_after_new_contribution = self._wallet.get_total_amount() + self._new_contribution
+
+        _asset_suggestions = list()
+        _deficits = list()
+        for group_suggestion in self:
+            group = group_suggestion.get_investment_group()
+            _group_weight = 0.01 * group.get_target_participation()
+            for asset_suggestion in group_suggestion:
+                asset = asset_suggestion.get_asset()
+                shares = int(asset_suggestion.get_suggested_shares_buying())
+                _target_amount = (_group_weight * 0.01 * asset.get_target_participation()
+                                  * _total_after_new_contribution)
+                _asset_suggestions.append([asset_suggestion, shares])
+                _deficits.append(_target_amount
+                                 - (asset.get_quantity() + shares) * asset.get_price())
+
+        self._remainder = self._new_contribution - sum(
+            x[1] * x[0].get_asset().get_price() for x in _asset_suggestions)
+        self._spend_remainder(_asset_suggestions, _deficits)
+
+        for asset_suggestion, shares in _asset_suggestions:
+            asset_suggestion._set_whole_shares(shares)
+
+        for group_suggestion in self:
+            group_suggestion._fixed_investing = sum(
+                x.get_suggested_investment() for x in group_suggestion)
+
+    def _refresh(self):
+        if self._is_outdated():
+            with instrumentation.stage('refresh_suggestion'):
+                self._build()
+
+    def _spend_remainder(self, asset_suggestions, deficits):
+        _heap = [(-self._get_gain(deficits[i], x[0].get_asset().get_price()), i)
+                 for i, x in enumerate(asset_suggestions)
+                 if x[0].get_asset().get_price() > 0]
+        heapq.heapify(_heap)
+
+        while _heap:
+            _negative_gain, i = heapq.heappop(_heap)
+            if _negative_gain >= 0:
+                break
+
+            price = asset_suggestions[i][0].get_asset().get_price()
+            if price > self._remainder + self._TOLERANCE:
+                continue
+
+            asset_suggestions[i][1] += 1
+            deficits[i] -= price
+            self._remainder -= price
+            heapq.heappush(_heap, (-self._get_gain(deficits[i], price), i))
+
+        self._remainder = max(0.0, self._remainder)
+
+    @staticmethod
+    def _get_gain(deficit, price):
+        return price * (2 * deficit - price)
@@ -0,0 +1,41 @@
+import json
+import os
+import subprocess
+import sys
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_wallet_line(code):
+    return json.dumps({'investment_groups': [
+        {'name': 'Stocks', 'target_participation': 100.0,
+         'assets': [{'code': code, 'quantity': 1, 'target_participation': 100.0}]}]})
+
+
+def run_app(*args):
+    return subprocess.run([sys.executable, os.path.join(_ROOT, 'app.py'), *args],
+                          capture_output=True, text=True, cwd=_ROOT, timeout=120)
+
+
+def test_batch_isolates_a_malformed_line(tmp_path):
+    path = tmp_path / 'wallets.ndjson'
+    path.write_text('\n'.join([make_wallet_line('BBAS3'), '{"investment_groups": [}',
+                               make_wallet_line('ITSA4')]) + '\n', encoding='utf-8')
+
+    completed = run_app('-d', '--batch', '--processes', '1', str(path), '100')
+    assert completed.returncode == 0
+    results = {x['id']: x for x in map(json.loads, completed.stdout.splitlines())}
+    assert sorted(results) == [1, 2, 3]
+    assert 'suggestion' in results[1] and 'suggestion' in results[3]
+    assert 'error' in results[2]
+
+
+def test_batch_prints_wallets_read_before_a_malformed_json_document(tmp_path):
+    path = tmp_path / 'wallets.json'
+    path.write_text(make_wallet_line('BBAS3') + '\n{"investment_groups": [}\n',
+                    encoding='utf-8')
+
+    completed = run_app('-d', '--batch', '--processes', '1', '--input-format', 'json',
+                        str(path), '100')
+    assert [json.loads(x)['id'] for x in completed.stdout.splitlines()] == [1]
+    assert 'Invalid' in completed.stderr
@@ -1,5 +1,6 @@
 from prismfolio.asset import Asset, AssetPricingError, AssetWithNoPrice
 import json
+import pickle
 import pytest
 import requests
 
@@ -184,3 +185,20 @@ def test_asset_error_on_pricing():
 
     with pytest.raises(AssetPricingError):
         a.update_price(http_error)
+
+
+def test_asset_has_no_instance_dict():
+    a = Asset("TEST", 2, 10.0)
+    assert not hasattr(a, '__dict__')
+    assert a.get_target_participation() == 10.0
+    with pytest.raises(AttributeError):
+        a.unknown_attribute = 1
+
+
+def test_asset_pickle_round_trip():
+    a = Asset("TEST", 2, 10.0)
+    a.update_price(lambda x: 3.0)
+    b = pickle.loads(pickle.dumps(a))
+    assert b.get_code() == "TEST"
+    assert b.get_total_amount() == 6.0
+    assert b.get_target_participation() == 10.0
@@ -0,0 +1,86 @@
+from conftest import FakeSession
+from prismfolio.asset import Asset, AssetPricingError
+from prismfolio.asyncbrapi import AsyncBrapiClient
+from prismfolio.brapi import BrapiClient
+from prismfolio.investmentgroup import InvestmentGroup
+from prismfolio.wallet import Wallet
+import asyncio
+import pytest
+import time
+
+
+def make_wallet():
+    w = Wallet()
+    for i in range(3):
+        g = InvestmentGroup('G{}'.format(i), 100.0 / 3)
+        for j in range(4):
+            g.add_asset(Asset('A{}{}'.format(i, j), j + 1, 25.0))
+        w.add_investment_group(g)
+    return w
+
+
+def test_async_client_quotes():
+    session = FakeSession()
+
+    async def fetch():
+        async with AsyncBrapiClient(BrapiClient(session=session), max_concurrency=4) as client:
+            return await asyncio.gather(client.get_current_stock_price('BBAS3'),
+                                        client.get_price_earning('MXRF11'),
+                                        client.get_quotes(['BBAS3', 'MXRF11']))
+
+    price, price_earnings, quotes = asyncio.run(fetch())
+    assert price == 5.0
+    assert price_earnings == 2.0
+    assert quotes['MXRF11'].get_price() == 6.0
+    assert len(session.requested_urls) == 3
+
+
+def test_async_client_bounds_concurrency():
+    running = list()
+    peak = list()
+
+    class SlowSession(FakeSession):
+        def get(self, *args, **kwargs):
+            running.append(1)
+            peak.append(len(running))
+            time.sleep(0.01)
+            running.pop()
+            return super().get(*args, **kwargs)
+
+    async def fetch():
+        client = AsyncBrapiClient(BrapiClient(session=SlowSession()), max_concurrency=2)
+        await asyncio.gather(*(client.get_quote('A{}'.format(i)) for i in range(10)))
+        client.close()
+
+    asyncio.run(fetch())
+    assert max(peak) <= 2
+
+
+def test_wallet_async_pricing():
+    w = make_wallet()
+
+    async def pricing_function(code):
+        await asyncio.sleep(0.001)
+        return float(code[1:])
+
+    asyncio.run(w.update_asset_values_async(pricing_function))
+    asyncio.run(w.update_asset_price_earnings_async(pricing_function))
+    for g in w.get_investment_groups():
+        for a in g.get_assets():
+            assert a.get_price() == float(a.get_code()[1:])
+            assert a.get_price_earnings() == float(a.get_code()[1:])
+        assert sum(x.get_current_participation() for x in g.get_assets()) == pytest.approx(100.0)
+
+
+def test_investment_group_async_pricing_error():
+    g = InvestmentGroup('G', 100.0)
+    g.add_asset(Asset('A1', 1, 50.0))
+    g.add_asset(Asset('BAD', 1, 50.0))
+
+    async def pricing_function(code):
+        if code == 'BAD':
+            raise ValueError('no quote')
+        return 1.0
+
+    with pytest.raises(AssetPricingError, match='BAD'):
+        asyncio.run(g.update_asset_values_async(pricing_function))
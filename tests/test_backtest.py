@@ -0,0 +1,116 @@
+from conftest import make_wallet
+from prismfolio.backtest import Backtest, PriceHistory
+from prismfolio.investmentsuggestion import WalletInvestmentSuggestion
+
+import math
+import numpy as np
+import pytest
+
+
+def make_history(periods=12, seed=0):
+    _random = np.random.default_rng(seed)
+    prices = 10.0 * np.exp(np.cumsum(_random.normal(0.0, 0.05, (periods, 3)), axis=0))
+    return PriceHistory(['2020-{:02d}'.format(x + 1) for x in range(periods)],
+                        ['MXRF11', 'BBAS3', 'ITSA4'], prices.round(2))
+
+
+def test_backtest_matches_the_suggestion_rule_every_period():
+    history = make_history()
+    result = Backtest(make_wallet(priced=False), history, 500.0, carry_cash=False).run()
+
+    wallet = make_wallet(priced=False)
+    _prices = dict(zip(history.get_codes(), history.get_prices().T))
+    for period in range(len(history)):
+        wallet.update_asset_values(lambda x: float(_prices[x][period]))
+        _buys = [(x.get_asset(), int(x.get_suggested_shares_buying()))
+                 for group in WalletInvestmentSuggestion(wallet, 500.0) for x in group]
+        for asset, shares in _buys:
+            asset.buy(shares)
+
+        _quantities = [x.get_quantity() for g in wallet.get_investment_groups()
+                       for x in g.get_assets()]
+        assert result.get_quantities()[period].tolist() == _quantities
+        assert result.get_values()[period] == pytest.approx(wallet.get_total_amount())
+
+
+def test_backtest_reports_cash_and_drift():
+    history = make_history()
+    result = Backtest(make_wallet(priced=False), history, 500.0).run()
+
+    assert result.get_invested()[-1] == pytest.approx(500.0 * len(history))
+    assert (result.get_cash() >= 0).all()
+    _value, _cash, _quantities = result.get_values(), result.get_cash(), result.get_quantities()
+    assert _value[-1] == pytest.approx(np.dot(_quantities[-1], [
+        history.get_prices()[-1][history.get_codes().index(x)] for x in result.get_codes()]))
+    assert result.get_group_drifts().shape == (len(history), 2)
+    assert result.get_group_drifts()[:, 0] == pytest.approx(-result.get_group_drifts()[:, 1])
+    assert result.get_max_group_drifts()[-1] < result.get_max_group_drifts()[0] + 1e-9
+
+    rows = list(result.iter_rows())
+    assert rows[0]['date'] == '2020-01'
+    assert set(rows[0]) >= {'value', 'cash', 'invested', 'drift:Stocks', 'drift:REITs'}
+    assert result.to_dict()['final_quantities'] == dict(zip(result.get_codes(),
+                                                            _quantities[-1].tolist()))
+
+
+def test_backtest_contribution_schedule():
+    history = make_history(3)
+    result = Backtest(make_wallet(priced=False), history, [0.0, 0.0, 0.0]).run()
+    assert (result.get_quantities() == [10, 5, 20]).all()
+
+    with pytest.raises(ValueError):
+        Backtest(make_wallet(priced=False), history, [100.0, 100.0])
+    with pytest.raises(ValueError):
+        Backtest(make_wallet(priced=False), history, [100.0, -1.0, 100.0])
+
+
+def test_backtest_skips_assets_before_their_first_price():
+    history = PriceHistory(['d1', 'd2', 'd3'], ['BBAS3', 'ITSA4', 'MXRF11'],
+                           [[10.0, math.nan, 10.0], [10.0, 10.0, math.nan], [10.0, 10.0, 10.0]])
+    result = Backtest(make_wallet(priced=False), history, 100.0).run()
+    assert result.get_quantities()[0][1] == 5
+    assert result.get_asset_drifts()[0][1] == -50.0
+    assert result.get_values()[1] == pytest.approx(
+        np.dot(result.get_quantities()[1], [10.0, 10.0, 10.0]))
+
+
+def test_price_history_from_csv(tmp_path):
+    wide = tmp_path / 'wide.csv'
+    wide.write_text('date,BBAS3,ITSA4\n2020-01,10.0,\n2020-02,11.0,5.0\n')
+    history = PriceHistory.from_csv(wide)
+    assert history.get_dates() == ['2020-01', '2020-02']
+    assert history.get_codes() == ['BBAS3', 'ITSA4']
+    assert np.isnan(history.get_prices()[0][1])
+
+    long = tmp_path / 'long.csv'
+    long.write_text('date,code,price\n2020-02,BBAS3,11.0\n2020-01,BBAS3,10.0\n'
+                    '2020-02,ITSA4,5.0\n')
+    assert np.array_equal(PriceHistory.from_csv(long).get_prices(), history.get_prices(),
+                          equal_nan=True)
+
+
+def test_price_history_errors():
+    history = make_history(2)
+    with pytest.raises(KeyError):
+        history.get_prices_of(['BBAS3', 'MISSING'])
+    with pytest.raises(ValueError):
+        PriceHistory(['d1'], ['A', 'A'], [[1.0, 1.0]])
+    with pytest.raises(ValueError):
+        PriceHistory(['d1'], ['A'], [[0.0]])
+
+
+def test_price_history_forward_fills():
+    history = PriceHistory(['d1', 'd2', 'd3'], ['A'], [[math.nan], [2.0], [math.nan]])
+    assert np.array_equal(history.get_prices_of(['A']), [[math.nan], [2.0], [2.0]],
+                          equal_nan=True)
+
+
+def test_price_history_from_parquet(tmp_path):
+    pd = pytest.importorskip('pandas')
+    pytest.importorskip('pyarrow')
+    path = tmp_path / 'prices.parquet'
+    pd.DataFrame({'date': ['2020-02', '2020-01'], 'code': ['BBAS3', 'BBAS3'],
+                  'price': [11.0, 10.0]}).to_parquet(path)
+    history = PriceHistory.from_file(str(path))
+    assert history.get_dates() == ['2020-01', '2020-02']
+    assert history.get_prices_of(['BBAS3']).ravel().tolist() == [10.0, 11.0]
@@ -0,0 +1,128 @@
+from prismfolio.batch import BatchRebalancer
+from prismfolio.investmentsuggestion import WalletInvestmentSuggestion
+from prismfolio.wallet import Wallet
+from prismfolio.wholesharesuggestion import WholeShareInvestmentSuggestion
+
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+
+
+def make_wallet_data(codes):
+    return {'investment_groups': [
+        {'name': 'Stocks', 'target_participation': 60.0,
+         'assets': [{'code': x, 'quantity': 1, 'target_participation': 100.0 / len(codes)}
+                    for x in codes]},
+        {'name': 'Funds', 'target_participation': 40.0,
+         'assets': [{'code': 'MXRF11', 'quantity': 2, 'target_participation': 100.0}]}]}
+
+
+def price_by_length(codes):
+    return {x: float(len(x)) for x in codes}
+
+
+@pytest.fixture
+def executor():
+    with ThreadPoolExecutor(max_workers=2) as _executor:
+        yield _executor
+
+
+def test_batch_matches_single_wallet_suggestion(executor):
+    documents = [('w{}'.format(i), make_wallet_data(['BBAS3', 'A{}'.format(i)]), 100.0 * i)
+                 for i in range(1, 6)]
+    rebalancer = BatchRebalancer(price_by_length, executor=executor, window_size=2)
+    results = {x.get_wallet_id(): x for x in rebalancer.run(documents)}
+    assert len(results) == 5
+
+    for wallet_id, wallet_data, contribution in documents:
+        wallet = Wallet.from_dict(wallet_data)
+        wallet.update_asset_values_in_bulk(price_by_length)
+        assert results[wallet_id].is_ok()
+        assert results[wallet_id].get_suggestion() == \
+            WalletInvestmentSuggestion(wallet, contribution).to_dict()
+
+
+def test_batch_prices_each_ticker_once(executor):
+    priced = list()
+
+    def bulk_pricing_function(codes):
+        priced.extend(codes)
+        return price_by_length(codes)
+
+    documents = [(i, make_wallet_data(['BBAS3', 'A{}'.format(i % 3)]), 100.0)
+                 for i in range(10)]
+    rebalancer = BatchRebalancer(bulk_pricing_function, executor=executor, window_size=3)
+    assert all(x.is_ok() for x in rebalancer.run(documents))
+    assert sorted(priced) == ['A0', 'A1', 'A2', 'BBAS3', 'MXRF11']
+
+
+def test_batch_isolates_wallet_errors(executor):
+    def bulk_pricing_function(codes):
+        if 'BROKEN' in codes:
+            raise ConnectionError('upstream is down')
+        return {x: 1.0 for x in codes if x != 'MISSING'}
+
+    documents = [('ok', make_wallet_data(['BBAS3']), 100.0),
+                 ('not a dict', ['BBAS3'], 100.0),
+                 ('no assets', {'investment_groups': [{'name': 'Stocks'}]}, 100.0),
+                 ('no price', make_wallet_data(['MISSING']), 100.0),
+                 ('invalid quantity', {'investment_groups': [
+                     {'name': 'Stocks', 'target_participation': 100.0,
+                      'assets': [{'code': 'BBAS3', 'quantity': -1,
+                                  'target_participation': 100.0}]}]}, 100.0)]
+    results = {x.get_wallet_id(): x for x in BatchRebalancer(
+        bulk_pricing_function, executor=executor).run(documents)}
+    assert [x for x in results if results[x].is_ok()] == ['ok']
+    assert 'Expected a dict' in results['not a dict'].get_error()
+    assert 'MISSING' in results['no price'].get_error()
+    assert results['invalid quantity'].to_dict()['error']
+
+    results = list(BatchRebalancer(bulk_pricing_function, executor=executor).run(
+        [('broken', make_wallet_data(['BROKEN']), 100.0)]))
+    assert 'upstream is down' in results[0].get_error()
+
+
+def test_batch_retries_tickers_after_a_failed_window(executor):
+    calls = list()
+
+    def bulk_pricing_function(codes):
+        calls.append(sorted(codes))
+        if len(calls) == 1:
+            raise ConnectionError('upstream is down')
+        return price_by_length(codes)
+
+    documents = [(i, make_wallet_data(['BBAS3']), 100.0) for i in range(4)]
+    results = sorted(BatchRebalancer(bulk_pricing_function, executor=executor,
+                                     window_size=2).run(documents),
+                     key=lambda x: x.get_wallet_id())
+    assert [x.is_ok() for x in results] == [False, False, True, True]
+    assert 'upstream is down' in results[0].get_error()
+    assert calls == [['BBAS3', 'MXRF11'], ['BBAS3', 'MXRF11']]
+
+
+def test_batch_with_process_pool():
+    documents = [(i, make_wallet_data(['BBAS3', 'ITSA4']), 1000.0) for i in range(4)]
+    rebalancer = BatchRebalancer(price_by_length, WholeShareInvestmentSuggestion,
+                                 max_workers=2, window_size=2)
+    results = sorted(rebalancer.run(documents), key=lambda x: x.get_wallet_id())
+    assert [x.get_wallet_id() for x in results] == [0, 1, 2, 3]
+    assert all(x.get_suggestion() == results[0].get_suggestion() for x in results)
+    assert results[0].get_suggestion()['remainder'] < 5.0
+
+
+def test_batch_window_size_validation():
+    with pytest.raises(ValueError):
+        BatchRebalancer(price_by_length, window_size=0)
+
+
+def test_batch_yields_the_window_read_before_a_reader_error(executor):
+    def documents():
+        yield 'ok', make_wallet_data(['BBAS3']), 100.0
+        yield 'also ok', make_wallet_data(['ITSA4']), 100.0
+        raise ValueError('malformed document')
+
+    results = list()
+    with pytest.raises(ValueError, match='malformed document'):
+        for result in BatchRebalancer(price_by_length, executor=executor).run(documents()):
+            results.append(result)
+    assert sorted(x.get_wallet_id() for x in results) == ['also ok', 'ok']
+    assert all(x.is_ok() for x in results)
@@ -0,0 +1,43 @@
+from benchmarks import suite
+from benchmarks.synthetic import generate_prices, generate_wallet_dict
+from prismfolio.walletschema import validate_wallet_dict
+
+import argparse
+import pytest
+
+
+@pytest.mark.parametrize('number_of_assets, number_of_groups, number_of_codes',
+                         [(3, 3, None), (100, 7, None), (500, 10, 50)])
+def test_generate_wallet_dict(number_of_assets, number_of_groups, number_of_codes):
+    wallet_data = generate_wallet_dict(number_of_assets, number_of_groups, 1, number_of_codes)
+    assert wallet_data == generate_wallet_dict(number_of_assets, number_of_groups, 1,
+                                               number_of_codes)
+    assert wallet_data != generate_wallet_dict(number_of_assets, number_of_groups, 2,
+                                               number_of_codes)
+
+    errors, warnings = validate_wallet_dict(wallet_data)
+    assert errors == []
+    assert not any('asset participation' in x for x in warnings)
+    assert len(wallet_data['investment_groups']) == number_of_groups
+    assert sum(len(x['assets']) for x in wallet_data['investment_groups']) == number_of_assets
+
+
+def test_generate_prices():
+    assert generate_prices(['B', 'A'], 3) == generate_prices(['A', 'B'], 3)
+    assert all(1.0 <= x <= 200.0 for x in generate_prices(['A', 'B', 'C']).values())
+
+
+def test_generate_wallet_dict_needs_one_asset_per_group():
+    with pytest.raises(ValueError):
+        generate_wallet_dict(2, 3)
+
+
+def test_suite_run():
+    args = argparse.Namespace(assets=[5, 40], groups=4, codes=None, seed=0, repeat=1,
+                              contribution=1000.0, no_memory=False)
+    report = suite.run(args)
+    assert {x['stage'] for x in report['results']} == {
+        'json_load', 'from_dict', 'from_dict_in_bulk', 'update_asset_values', 'suggestion',
+        'whole_share_suggestion', 'display_suggestion'}
+    assert all(x['peak_memory_bytes'] >= 0 for x in report['results'])
+    assert report['metadata']['seed'] == 0
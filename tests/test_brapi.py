@@ -0,0 +1,187 @@
+from conftest import FakeResponse, FakeSession
+from prismfolio import brapi
+from prismfolio.throttling import CircuitBreaker, CircuitOpenError
+import pytest
+import requests
+
+
+@pytest.fixture
+def session(monkeypatch):
+    _session = FakeSession()
+    monkeypatch.setattr(brapi, '_default_client', brapi.BrapiClient(session=_session))
+    return _session
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    sleeps = list()
+    monkeypatch.setattr(brapi.time, 'sleep', sleeps.append)
+    return sleeps
+
+
+def test_split_in_batches_by_size():
+    batches = list(brapi._split_in_batches(['A{}'.format(i) for i in range(45)], 20))
+    assert [len(x) for x in batches] == [20, 20, 5]
+
+
+def test_split_in_batches_removes_duplicates():
+    batches = list(brapi._split_in_batches(['bbas3', 'BBAS3', 'MXRF11'], 20))
+    assert batches == [['BBAS3', 'MXRF11']]
+
+
+def test_split_in_batches_by_url_length(monkeypatch):
+    monkeypatch.setattr(brapi, 'MAX_URL_LENGTH', len(brapi.QUOTE_URL.format('')) + 20)
+    for batch in brapi._split_in_batches(['CODE{}'.format(i) for i in range(30)], 100):
+        assert len(','.join(batch)) <= 20
+
+
+def test_get_quotes(session):
+    quotes = brapi.get_quotes(['A{}'.format(i) for i in range(30)], batch_size=10)
+    assert len(session.requested_urls) == 3
+    assert len(quotes) == 30
+    assert quotes['A1'].get_price() == 2.0
+    assert quotes['A1'].get_price_earnings() == 2.0
+
+
+def test_get_current_stock_prices(session):
+    prices = brapi.get_current_stock_prices(['bbas3', 'MXRF11', 'MISSING'])
+    assert prices == {'bbas3': 5.0, 'MXRF11': 6.0}
+
+
+def test_get_current_stock_price_and_price_earning(session):
+    assert brapi.get_current_stock_price('bbas3') == 5.0
+    assert brapi.get_price_earning('bbas3') == 2.0
+    assert session.requested_urls == [brapi.QUOTE_URL.format('BBAS3')] * 2
+
+
+def test_client_uses_timeout():
+    _session = FakeSession()
+    brapi.BrapiClient(timeout=2.5, session=_session).get_quote('BBAS3')
+    assert _session.timeouts == [2.5]
+
+
+def test_client_retries_on_server_errors(no_sleep):
+    _session = FakeSession([FakeResponse(503, {}), FakeResponse(429, {}),
+                            requests.ConnectionError()])
+    client = brapi.BrapiClient(max_retries=3, session=_session)
+    assert client.get_current_stock_price('BBAS3') == 5.0
+    assert len(_session.requested_urls) == 4
+    assert len(no_sleep) == 3
+
+
+def test_client_honors_retry_after(no_sleep):
+    _session = FakeSession([FakeResponse(429, {}, {'Retry-After': '7'})])
+    brapi.BrapiClient(session=_session).get_quote('BBAS3')
+    assert no_sleep == [7.0]
+
+
+def test_client_backoff_is_bounded():
+    client = brapi.BrapiClient(backoff_factor=1.0, max_backoff=5.0, session=FakeSession())
+    for attempt in range(10):
+        assert 0 <= client._get_backoff(attempt) <= min(5.0, 2 ** attempt)
+
+
+def test_client_gives_up_after_max_retries(no_sleep):
+    _session = FakeSession([FakeResponse(500, {})] * 3)
+    client = brapi.BrapiClient(max_retries=2, session=_session)
+    with pytest.raises(requests.HTTPError):
+        client.get_quote('BBAS3')
+    assert len(_session.requested_urls) == 3
+
+
+def test_client_does_not_retry_client_errors(no_sleep):
+    _session = FakeSession([FakeResponse(401, {})])
+    with pytest.raises(requests.HTTPError):
+        brapi.BrapiClient(session=_session).get_quotes(['BBAS3'])
+    assert len(_session.requested_urls) == 1
+    assert no_sleep == []
+
+
+def test_client_circuit_breaker_fails_fast(no_sleep):
+    _session = FakeSession([FakeResponse(503, {})] * 2)
+    client = brapi.BrapiClient(max_retries=0, session=_session,
+                               circuit_breaker=CircuitBreaker(failure_threshold=2))
+    for _ in range(2):
+        with pytest.raises(requests.HTTPError):
+            client.get_quote('BBAS3')
+
+    with pytest.raises(CircuitOpenError):
+        client.get_quote('BBAS3')
+    assert len(_session.requested_urls) == 2
+
+
+def test_client_circuit_breaker_recovers_after_failed_trial(no_sleep):
+    clock = [0.0]
+    _session = FakeSession([requests.ConnectionError('down'),
+                            requests.exceptions.ChunkedEncodingError('truncated')])
+    client = brapi.BrapiClient(max_retries=0, session=_session, circuit_breaker=CircuitBreaker(
+        failure_threshold=1, reset_timeout=10.0, clock=lambda: clock[0]))
+    with pytest.raises(requests.ConnectionError):
+        client.get_quote('BBAS3')
+
+    clock[0] = 10.0
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        client.get_quote('BBAS3')
+    with pytest.raises(CircuitOpenError):
+        client.get_quote('BBAS3')
+
+    clock[0] = 20.0
+    assert client.get_current_stock_price('BBAS3') == 5.0
+
+
+def test_client_client_errors_do_not_open_circuit(no_sleep):
+    _session = FakeSession([FakeResponse(404, {})] * 3)
+    client = brapi.BrapiClient(session=_session,
+                               circuit_breaker=CircuitBreaker(failure_threshold=2))
+    for _ in range(3):
+        with pytest.raises(requests.HTTPError):
+            client.get_quote('UNKNOWN')
+    assert len(_session.requested_urls) == 3
+
+
+def test_client_uses_rate_limiter():
+    acquired = list()
+
+    class CountingLimiter:
+        def acquire(self):
+            acquired.append(1)
+
+    client = brapi.BrapiClient(session=FakeSession(), rate_limiter=CountingLimiter())
+    client.get_quotes(['A{}'.format(i) for i in range(30)], batch_size=10)
+    assert len(acquired) == 3
+
+
+def test_client_falls_back_to_last_quote(no_sleep):
+    _session = FakeSession()
+    client = brapi.BrapiClient(max_retries=0, session=_session, fallback_to_last_quote=True)
+    assert client.get_current_stock_price('BBAS3') == 5.0
+    assert client.get_quotes(['MXRF11'])['MXRF11'].get_price() == 6.0
+
+    _session._failures = [FakeResponse(503, {})] * 3
+    assert client.get_current_stock_price('BBAS3') == 5.0
+    assert client.get_quotes(['BBAS3', 'MXRF11'])['MXRF11'].get_price() == 6.0
+
+    with pytest.raises(requests.HTTPError):
+        client.get_quote('ITSA4')
+
+
+def test_client_raises_when_a_ticker_has_no_last_quote(no_sleep):
+    _session = FakeSession()
+    client = brapi.BrapiClient(max_retries=0, session=_session, fallback_to_last_quote=True)
+    assert client.get_current_stock_price('BBAS3') == 5.0
+
+    _session._failures = [FakeResponse(503, {'message': 'unavailable'})]
+    with pytest.raises(requests.HTTPError, match='unavailable'):
+        client.get_quotes(['BBAS3', 'ITSA4'])
+
+
+def test_client_non_json_error_body_falls_back_to_last_quote(no_sleep):
+    _session = FakeSession()
+    client = brapi.BrapiClient(max_retries=0, session=_session, fallback_to_last_quote=True)
+    assert client.get_current_stock_price('BBAS3') == 5.0
+
+    _bad_gateway = FakeResponse(503, None, text='<html>Bad Gateway</html>')
+    _session._failures = [_bad_gateway] * 2
+    assert client.get_current_stock_price('BBAS3') == 5.0
+    with pytest.raises(requests.HTTPError, match='Bad Gateway'):
+        client.get_quote('ITSA4')
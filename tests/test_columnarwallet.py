@@ -0,0 +1,147 @@
+from prismfolio.asset import AssetPricingError, AssetWithNoPrice
+from prismfolio.columnarwallet import ColumnarWallet
+from prismfolio.investmentsuggestion import WalletInvestmentSuggestion
+from prismfolio.vectorizedsuggestion import VectorizedInvestmentSuggestion
+from prismfolio.wallet import Wallet
+from prismfolio.wholesharesuggestion import WholeShareInvestmentSuggestion
+
+import numpy as np
+import pytest
+
+WALLET_DATA = {'investment_groups': [
+    {'name': 'Stocks', 'target_participation': 60.0,
+     'assets': [{'code': 'BBAS3', 'quantity': 3, 'target_participation': 50.0},
+                {'code': 'ITSA4', 'quantity': 10, 'target_participation': 30.0},
+                {'code': 'WEGE3', 'quantity': 1, 'target_participation': 20.0}]},
+    {'name': 'Empty', 'target_participation': 0.0, 'assets': []},
+    {'name': 'Funds', 'target_participation': 40.0,
+     'assets': [{'code': 'MXRF11', 'quantity': 20, 'target_participation': 60.0},
+                {'code': 'BBAS3', 'quantity': 2, 'target_participation': 40.0}]}]}
+
+
+def price_by_length(code):
+    return float(len(code))
+
+
+@pytest.fixture
+def wallets():
+    columnar_wallet = ColumnarWallet.from_dict(WALLET_DATA)
+    wallet = Wallet.from_dict(WALLET_DATA)
+    columnar_wallet.update_asset_values(price_by_length)
+    wallet.get_investment_groups().pop(1)
+    wallet.update_asset_values(price_by_length)
+    return columnar_wallet, wallet
+
+
+def test_columnar_wallet_layout():
+    w = ColumnarWallet.from_dict(WALLET_DATA)
+    assert w.get_codes().tolist() == ['BBAS3', 'ITSA4', 'WEGE3', 'MXRF11', 'BBAS3']
+    assert w.get_group_offsets().tolist() == [0, 3, 3, 5]
+    assert w.get_group_index().tolist() == [0, 0, 0, 2, 2]
+    assert w.get_asset_codes() == {'BBAS3', 'ITSA4', 'WEGE3', 'MXRF11'}
+    assert [x.get_name() for x in w.get_investment_groups()] == ['Stocks', 'Empty', 'Funds']
+    assert [len(x.get_assets()) for x in w.get_investment_groups()] == [3, 0, 2]
+    assert w.get_investment_groups() is w.get_investment_groups()
+    assert not w.get_investment_groups()[1].has_asset()
+    assert w.to_dict() == WALLET_DATA
+
+
+def test_columnar_wallet_aggregates(wallets):
+    columnar_wallet, wallet = wallets
+    assert columnar_wallet.get_total_amount() == wallet.get_total_amount()
+    assert columnar_wallet.get_group_total_amounts().tolist() == [70.0, 0.0, 130.0]
+    assert columnar_wallet.get_investment_groups()[2].get_total_amount() == 130.0
+
+    _assets = [x for group in wallet.get_investment_groups() for x in group.get_assets()]
+    assert columnar_wallet.get_current_participations().tolist() == \
+        [x.get_current_participation() for x in _assets]
+    assert columnar_wallet.get_investment_groups()[0].get_assets()[0].get_current_participation() \
+        == _assets[0].get_current_participation()
+
+
+def test_columnar_wallet_prices_each_code_once():
+    priced = list()
+
+    def pricing_function(code):
+        priced.append(code)
+        return 2.0
+
+    w = ColumnarWallet.from_dict(WALLET_DATA)
+    w.update_asset_values(pricing_function, max_workers=2)
+    assert sorted(priced) == ['BBAS3', 'ITSA4', 'MXRF11', 'WEGE3']
+    assert [x.get_price() for x in w.get_assets_by_code('BBAS3')] == [2.0, 2.0]
+
+    w.update_asset_values_in_bulk(lambda codes: {x: 3.0 for x in codes})
+    assert w.get_total_amount() == 3.0 * 36
+
+
+def test_columnar_wallet_without_prices():
+    w = ColumnarWallet.from_dict(WALLET_DATA)
+    with pytest.raises(AssetWithNoPrice):
+        w.get_total_amount()
+    assert not w.get_investment_groups()[0].get_assets()[0].has_current_price()
+
+    with pytest.raises(AssetPricingError):
+        w.update_asset_values_in_bulk(lambda codes: {'BBAS3': 1.0})
+
+
+@pytest.mark.parametrize('suggestion_class',
+                         [WalletInvestmentSuggestion, WholeShareInvestmentSuggestion])
+def test_columnar_wallet_suggestion(wallets, suggestion_class):
+    columnar_wallet, wallet = wallets
+    columnar_suggestion = suggestion_class(columnar_wallet, 1000.0).to_dict()
+    expected = suggestion_class(wallet, 1000.0).to_dict()
+    assert columnar_suggestion['remainder'] == pytest.approx(expected['remainder'])
+    columnar_suggestion['investment_groups'].pop(1)
+    assert columnar_suggestion['investment_groups'] == expected['investment_groups']
+
+
+def test_columnar_wallet_incremental_suggestion(wallets):
+    columnar_wallet, wallet = wallets
+    suggestion = WalletInvestmentSuggestion(columnar_wallet, 1000.0)
+    suggestion.to_dict()
+
+    columnar_wallet.get_investment_groups()[0].get_assets()[1].buy(5)
+    wallet.get_investment_groups()[0].get_assets()[1].buy(5)
+    columnar_wallet.get_investment_groups()[2].get_assets()[0].update_price(lambda x: 9.0)
+    wallet.get_investment_groups()[1].get_assets()[0].update_price(lambda x: 9.0)
+
+    groups = suggestion.to_dict()['investment_groups']
+    groups.pop(1)
+    expected = WalletInvestmentSuggestion(wallet, 1000.0).to_dict()['investment_groups']
+    for group, expected_group in zip(groups, expected):
+        assert group['investment'] == pytest.approx(expected_group['investment'])
+        assert [x['shares'] for x in group['assets']] == \
+            [x['shares'] for x in expected_group['assets']]
+
+
+def test_columnar_wallet_vectorized_suggestion(wallets):
+    columnar_wallet, wallet = wallets
+    np.testing.assert_allclose(
+        VectorizedInvestmentSuggestion(columnar_wallet, 1000.0).get_asset_investments(),
+        VectorizedInvestmentSuggestion(wallet, 1000.0).get_asset_investments())
+
+
+def test_columnar_wallet_round_trip(wallets):
+    columnar_wallet, wallet = wallets
+    assert columnar_wallet.to_wallet().get_total_amount() == wallet.get_total_amount()
+    assert ColumnarWallet.from_wallet(wallet).get_total_amount() == wallet.get_total_amount()
+
+
+@pytest.mark.parametrize('asset, error', [
+    ({'code': '', 'quantity': 1, 'target_participation': 10.0}, ValueError),
+    ({'code': 1, 'quantity': 1, 'target_participation': 10.0}, TypeError),
+    ({'code': 'A', 'quantity': -1, 'target_participation': 10.0}, ValueError),
+    ({'code': 'A', 'quantity': 1.0, 'target_participation': 10.0}, TypeError),
+    ({'code': 'A', 'quantity': 1, 'target_participation': 101.0}, ValueError),
+    ({'code': 'A', 'quantity': 1, 'target_participation': 10}, TypeError),
+])
+def test_columnar_wallet_validation(asset, error):
+    with pytest.raises(error):
+        ColumnarWallet.from_dict({'investment_groups': [
+            {'name': 'G', 'target_participation': 100.0, 'assets': [asset]}]})
+
+
+def test_columnar_wallet_invalid_offsets():
+    with pytest.raises(ValueError):
+        ColumnarWallet(['A', 'B'], [1, 1], [50.0, 50.0], ['G'], [100.0], [0, 1])
@@ -0,0 +1,108 @@
+from conftest import FakeClock, FakeResponse, FakeSession
+from prismfolio import brapi, instrumentation
+from prismfolio.asset import Asset
+from prismfolio.instrumentation import Metrics
+from prismfolio.investmentgroup import InvestmentGroup
+from prismfolio.investmentsuggestion import WalletInvestmentSuggestion
+from prismfolio.wallet import Wallet
+
+import json
+import pytest
+import requests
+
+
+@pytest.fixture
+def metrics(monkeypatch):
+    _metrics = Metrics(FakeClock(step=0.5))
+    monkeypatch.setattr(instrumentation, '_metrics', _metrics)
+    return _metrics
+
+
+def make_wallet():
+    w = Wallet()
+    g = InvestmentGroup('Stocks', 100.0)
+    g.add_asset(Asset('BBAS3', 1, 50.0))
+    g.add_asset(Asset('ITSA4', 2, 50.0))
+    w.add_investment_group(g)
+    return w
+
+
+def test_metrics_summaries_and_counters():
+    m = Metrics(FakeClock(step=0.5))
+    with m.timer('stage_seconds', stage='load'):
+        pass
+    m.observe('stage_seconds', 2.0, stage='load')
+    m.increment('requests')
+    m.increment('requests', 2)
+    assert m.get_summary('stage_seconds', stage='load') == \
+        {'count': 2, 'sum': 2.5, 'min': 0.5, 'max': 2.0}
+    assert m.get_summary('stage_seconds', stage='other') is None
+    assert m.get_counter('requests') == 3
+    assert json.loads(m.to_json()) == m.to_dict()
+
+
+def test_metrics_to_prometheus():
+    m = Metrics()
+    m.observe('fetch_seconds', 0.25, ticker='BBAS3')
+    m.observe('fetch_seconds', 0.5, ticker='IT"SA4')
+    m.increment('failures', ticker='BBAS3', error='HTTPError')
+    assert m.to_prometheus() == (
+        '# TYPE prismfolio_fetch_seconds summary\n'
+        'prismfolio_fetch_seconds_sum{ticker="BBAS3"} 0.25\n'
+        'prismfolio_fetch_seconds_count{ticker="BBAS3"} 1\n'
+        'prismfolio_fetch_seconds_sum{ticker="IT\\"SA4"} 0.5\n'
+        'prismfolio_fetch_seconds_count{ticker="IT\\"SA4"} 1\n'
+        '# TYPE prismfolio_failures_total counter\n'
+        'prismfolio_failures_total{error="HTTPError",ticker="BBAS3"} 1\n')
+
+
+def test_metrics_to_prometheus_counter_type_matches_samples():
+    m = Metrics()
+    m.increment('retries')
+    m.increment('retries', 2)
+    m.increment('failures', ticker='A')
+    m.observe('failures', 1.0)
+    assert m.to_prometheus().splitlines() == [
+        '# TYPE prismfolio_failures summary',
+        'prismfolio_failures_sum 1.0',
+        'prismfolio_failures_count 1',
+        '# TYPE prismfolio_failures_total counter',
+        'prismfolio_failures_total{ticker="A"} 1',
+        '# TYPE prismfolio_retries_total counter',
+        'prismfolio_retries_total 3']
+
+
+def test_instrumentation_disabled_by_default():
+    assert instrumentation.get_metrics() is None
+    assert instrumentation.stage('load') is instrumentation.timer('anything')
+    with instrumentation.stage('load'):
+        instrumentation.increment('requests')
+
+
+def test_wallet_and_suggestion_stages(metrics):
+    w = make_wallet()
+    w.update_asset_values_in_bulk(lambda codes: {x: 1.0 for x in codes})
+    suggestion = WalletInvestmentSuggestion(w, 100.0)
+    w.get_investment_groups()[0].get_assets()[0].buy(1)
+    suggestion.get_remainder()
+
+    for stage in ('fetch_prices', 'update_asset_values', 'build_suggestion',
+                  'refresh_suggestion'):
+        assert metrics.get_summary('stage_seconds', stage=stage)['count'] == 1
+    assert metrics.get_counter('priced_tickers') == 2
+
+
+def test_brapi_fetch_latency_and_failures(metrics, monkeypatch):
+    monkeypatch.setattr(brapi.time, 'sleep', lambda x: None)
+    session = FakeSession([FakeResponse(503, {})])
+    client = brapi.BrapiClient(max_retries=1, session=session)
+    client.get_quotes(['BBAS3', 'ITSA4'])
+    session._failures.append(FakeResponse(404, {}))
+    with pytest.raises(requests.HTTPError):
+        client.get_quote('MXRF11')
+
+    assert metrics.get_summary('brapi_fetch_seconds', ticker='BBAS3')['count'] == 1
+    assert metrics.get_summary('brapi_fetch_seconds', ticker='ITSA4')['count'] == 1
+    assert metrics.get_summary('brapi_request_seconds')['count'] == 2
+    assert metrics.get_counter('brapi_retries') == 1
+    assert metrics.get_counter('brapi_fetch_failures', ticker='MXRF11', error='HTTPError') == 1
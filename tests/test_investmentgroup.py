@@ -169,3 +169,44 @@ def test_pricing_with_assets_with_no_initial_quantity():
 
     ig.update_asset_values(lambda x: 0.0 if x == "test" else 10.0)
     assert ig.get_total_amount() == 0.0
+
+
+def test_total_amount_follows_asset_changes():
+    ig = InvestmentGroup('G', 100.0)
+    a1 = Asset('A1', 1, 50.0)
+    ig.add_asset(a1)
+    ig.update_asset_values(lambda x: 2.0)
+    assert ig.get_total_amount() == 2.0
+
+    a1.buy(4)
+    assert ig.get_total_amount() == 10.0
+
+    a1.update_price(lambda x: 3.0)
+    assert ig.get_total_amount() == 15.0
+
+    a2 = Asset('A2', 1, 50.0)
+    ig.add_asset(a2)
+    with pytest.raises(AssetWithNoPrice):
+        ig.get_total_amount()
+
+    a2.update_price(lambda x: 5.0)
+    assert ig.get_total_amount() == 20.0
+
+
+def test_total_amount_is_cached(monkeypatch):
+    ig = InvestmentGroup('G', 100.0)
+    for i in range(10):
+        ig.add_asset(Asset('A{}'.format(i), 1, 10.0))
+    ig.update_asset_values(lambda x: 1.0)
+
+    calls = list()
+    _get_total_amount = Asset.get_total_amount
+
+    def counting_get_total_amount(self):
+        calls.append(self)
+        return _get_total_amount(self)
+
+    monkeypatch.setattr(Asset, 'get_total_amount', counting_get_total_amount)
+    for _ in range(5):
+        assert ig.get_total_amount() == 10.0
+    assert len(calls) == 0
@@ -3,6 +3,8 @@ from prismfolio.investmentgroup import InvestmentGroup
 from prismfolio.investmentsuggestion import WalletInvestmentSuggestion
 from prismfolio.wallet import Wallet
 
+import pytest
+
 
 def test_suggestion_with_assets():
     g1 = InvestmentGroup('A stocks', 50.0)
@@ -266,3 +268,127 @@ def test_suggestion_remainder_single_group_single_asset():
     assert wallet_suggestion.get_remainder() == 4
     assert wallet_suggestion[g1].get_remainder() == 4
     assert wallet_suggestion[g1][a1].get_remainder() == 4
+
+
+def test_suggestion_construction_is_linear(monkeypatch):
+    w = Wallet()
+    for i in range(10):
+        g = InvestmentGroup('G{}'.format(i), 10.0)
+        for j in range(20):
+            g.add_asset(Asset('A{}_{}'.format(i, j), 1, 5.0))
+        w.add_investment_group(g)
+    w.update_asset_values(lambda x: 1.0)
+
+    calls = list()
+    _get_total_amount = Asset.get_total_amount
+
+    def counting_get_total_amount(self):
+        calls.append(self)
+        return _get_total_amount(self)
+
+    monkeypatch.setattr(Asset, 'get_total_amount', counting_get_total_amount)
+    WalletInvestmentSuggestion(w, 1000)
+    assert len(calls) == 200
+
+
+def _assert_same_suggestion(suggestion, expected):
+    for group_suggestion, expected_group in zip(suggestion, expected):
+        assert group_suggestion.get_suggested_investment() == \
+            pytest.approx(expected_group.get_suggested_investment())
+        for asset_suggestion, expected_asset in zip(group_suggestion, expected_group):
+            assert asset_suggestion.get_suggested_investment() == \
+                pytest.approx(expected_asset.get_suggested_investment())
+            assert asset_suggestion.get_suggested_shares_buying() == \
+                expected_asset.get_suggested_shares_buying()
+
+
+def _make_wallet():
+    w = Wallet()
+    for i in range(4):
+        g = InvestmentGroup('G{}'.format(i), 25.0)
+        for j in range(5):
+            g.add_asset(Asset('A{}_{}'.format(i, j), i + j + 1, 20.0))
+        w.add_investment_group(g)
+    w.update_asset_values(lambda x: 1.0 + len(x))
+    return w
+
+
+def test_suggestion_follows_price_and_quantity_changes():
+    w = _make_wallet()
+    wallet_suggestion = WalletInvestmentSuggestion(w, 500)
+    asset = w.get_investment_groups()[1].get_assets()[2]
+
+    asset.update_price(lambda x: 50.0)
+    _assert_same_suggestion(wallet_suggestion, WalletInvestmentSuggestion(w, 500))
+
+    asset.buy(30)
+    _assert_same_suggestion(wallet_suggestion, WalletInvestmentSuggestion(w, 500))
+
+    w.add_investment_group(InvestmentGroup('G4', 0.0))
+    _assert_same_suggestion(wallet_suggestion, WalletInvestmentSuggestion(w, 500))
+    assert len(wallet_suggestion) == 5
+
+
+def test_suggestion_tick_only_recomputes_changed_group(monkeypatch):
+    w = _make_wallet()
+    wallet_suggestion = WalletInvestmentSuggestion(w, 500)
+    wallet_suggestion.get_remainder()
+    w.get_investment_groups()[1].get_assets()[2].update_price(lambda x: 50.0)
+
+    calls = list()
+    _get_total_amount = Asset.get_total_amount
+
+    def counting_get_total_amount(self):
+        calls.append(self)
+        return _get_total_amount(self)
+
+    monkeypatch.setattr(Asset, 'get_total_amount', counting_get_total_amount)
+    wallet_suggestion[w.get_investment_groups()[0]].get_suggested_investment()
+    assert len(calls) == 5
+    assert all(x in w.get_investment_groups()[1].get_assets() for x in calls)
+
+
+def test_asset_suggestion_memoizes_derived_values(monkeypatch):
+    w = _make_wallet()
+    wallet_suggestion = WalletInvestmentSuggestion(w, 500)
+    group = w.get_investment_groups()[0]
+    asset_suggestion = wallet_suggestion[group][group.get_assets()[0]]
+
+    calls = list()
+    _get_price = Asset.get_price
+
+    def counting_get_price(self):
+        calls.append(self)
+        return _get_price(self)
+
+    monkeypatch.setattr(Asset, 'get_price', counting_get_price)
+    for _ in range(3):
+        shares = asset_suggestion.get_suggested_shares_buying()
+        remainder = asset_suggestion.get_remainder()
+        percent = asset_suggestion.get_percent_to_next_share()
+    assert len(calls) == 1
+    assert percent == pytest.approx(100 * remainder / group.get_assets()[0].get_price())
+    assert shares == asset_suggestion.get_suggested_investment() // 5.0
+
+
+def test_asset_suggestion_derived_values_follow_changes():
+    w = _make_wallet()
+    wallet_suggestion = WalletInvestmentSuggestion(w, 500)
+    group = w.get_investment_groups()[0]
+    asset_suggestion = wallet_suggestion[group][group.get_assets()[0]]
+    asset_suggestion.get_remainder()
+
+    w.get_investment_groups()[1].get_assets()[0].update_price(lambda x: 80.0)
+    expected = WalletInvestmentSuggestion(w, 500)[group][group.get_assets()[0]]
+    assert asset_suggestion.get_suggested_shares_buying() == \
+        expected.get_suggested_shares_buying()
+    assert asset_suggestion.get_remainder() == pytest.approx(expected.get_remainder())
+
+
+def test_models_and_suggestions_have_no_instance_dict():
+    w = _make_wallet()
+    wallet_suggestion = WalletInvestmentSuggestion(w, 500)
+    group = w.get_investment_groups()[0]
+    objects = [w, group, group.get_assets()[0], wallet_suggestion, wallet_suggestion[group],
+               wallet_suggestion[group][group.get_assets()[0]]]
+    assert not any(hasattr(x, '__dict__') for x in objects)
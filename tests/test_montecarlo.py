@@ -0,0 +1,67 @@
+from conftest import make_wallet
+from prismfolio.asset import AssetWithNoPrice
+from prismfolio.backtest import Backtest, PriceHistory
+from prismfolio.montecarlo import MonteCarloProjection
+
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pytest
+
+
+def test_projection_without_volatility_matches_the_backtest():
+    result = MonteCarloProjection(make_wallet(), 100.0, 12, paths=3, seed=1).run()
+    history = PriceHistory(range(12), ['BBAS3', 'ITSA4', 'MXRF11'], [[5.0, 5.0, 6.0]] * 12)
+    backtest = Backtest(make_wallet(), history, 100.0).run()
+
+    _expected = backtest.get_values() + backtest.get_cash()
+    assert result.get_values().shape == (12, 3)
+    for path in range(3):
+        assert result.get_values()[:, path] == pytest.approx(_expected)
+    assert result.get_invested()[-1] == 1200.0
+    assert result.get_initial_value() == 195.0
+    assert result.get_final_values() == pytest.approx([195.0 + 1200.0] * 3)
+
+
+def test_projection_is_reproducible_across_workers():
+    def run(**kwargs):
+        return MonteCarloProjection(make_wallet(), 100.0, 24, 0.08, 0.3, paths=250, seed=7,
+                                    chunk_size=100, **kwargs).run().get_values()
+
+    _values = run(max_workers=1)
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        assert np.array_equal(run(executor=executor), _values)
+    assert np.array_equal(run(max_workers=2), _values)
+    assert _values.shape == (24, 250)
+    assert len(np.unique(_values[-1])) > 1
+
+
+def test_projection_drift_raises_the_median():
+    def median(drift):
+        result = MonteCarloProjection(make_wallet(), 100.0, 60, drift, 0.2, paths=2000,
+                                      seed=3, chunk_size=500).run()
+        return result.get_percentiles([50])[0][-1]
+
+    assert median(0.15) > median(0.0)
+
+
+def test_projection_per_ticker_parameters_and_summary():
+    result = MonteCarloProjection(
+        make_wallet(), 100.0, 12, {'BBAS3': 0.1, 'ITSA4': 0.05, 'MXRF11': 0.0},
+        {'BBAS3': 0.3, 'ITSA4': 0.2, 'MXRF11': 0.0}, paths=50, seed=0).run()
+    summary = result.to_dict()
+    assert summary['paths'] == 50
+    assert summary['periods'] == 12
+    assert set(summary['percentiles']) == {'5', '25', '50', '75', '95'}
+    assert summary['percentiles']['5'][-1] <= summary['percentiles']['95'][-1]
+    assert 0.0 <= summary['probability_below_invested'] <= 1.0
+
+
+def test_projection_errors():
+    with pytest.raises(AssetWithNoPrice):
+        MonteCarloProjection(make_wallet(priced=False), 100.0, 12)
+    with pytest.raises(KeyError):
+        MonteCarloProjection(make_wallet(), 100.0, 12, {'BBAS3': 0.1})
+    with pytest.raises(ValueError):
+        MonteCarloProjection(make_wallet(), 100.0, 12, 0.1, -0.2)
+    with pytest.raises(ValueError):
+        MonteCarloProjection(make_wallet(), 100.0, 0)
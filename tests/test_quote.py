@@ -0,0 +1,98 @@
+from prismfolio.asset import Asset, AssetPricingError
+from prismfolio.investmentgroup import InvestmentGroup
+from prismfolio.quote import Quote, QuoteBook
+from prismfolio.wallet import Wallet
+import pytest
+
+
+def test_quote_from_dict():
+    q = Quote.from_dict({'symbol': 'BBAS3', 'regularMarketPrice': 27.5, 'priceEarnings': 4.2,
+                         'shortName': 'BRASIL ON', 'currency': 'BRL',
+                         'extra_fields': 'Make no difference'})
+    assert q.get_code() == 'BBAS3'
+    assert q.get_price() == 27.5
+    assert q.get_price_earnings() == 4.2
+    assert q.get_name() == 'BRASIL ON'
+    assert q.get_currency() == 'BRL'
+    assert Quote.from_dict(q.to_dict()).to_dict() == q.to_dict()
+
+
+def test_quote_without_price_earnings():
+    q = Quote.from_json('{"symbol": "MXRF11", "regularMarketPrice": 9.5}')
+    assert q.get_price() == 9.5
+    assert q.get_price_earnings() == 0.0
+
+
+@pytest.mark.parametrize("invalid_dict", [None, 1, "foo", [], True])
+def test_quote_from_invalid_dict(invalid_dict):
+    with pytest.raises(TypeError):
+        Quote.from_dict(invalid_dict)
+
+
+def test_quote_book_fetches_each_code_once():
+    calls = list()
+
+    def quote_function(code):
+        calls.append(code)
+        return Quote(code, 10.0, 5.0)
+
+    book = QuoteBook(quote_function)
+    assert book.get_price('A1') == 10.0
+    assert book.get_price_earnings('A1') == 5.0
+    assert book.get_prices(['A1', 'A2']) == {'A1': 10.0, 'A2': 10.0}
+    assert calls == ['A1', 'A2']
+
+    book.clear()
+    book.get_price('A1')
+    assert calls == ['A1', 'A2', 'A1']
+
+
+def test_quote_book_with_bulk_function():
+    calls = list()
+
+    def bulk_quote_function(codes):
+        calls.append(set(codes))
+        return {x: Quote(x, 1.0) for x in codes if x != 'MISSING'}
+
+    book = QuoteBook(lambda x: Quote(x, 2.0), bulk_quote_function)
+    assert book.get_prices(['A1', 'A2', 'MISSING']) == {'A1': 1.0, 'A2': 1.0}
+    assert book.get_prices_earnings(['A1', 'A3']) == {'A1': 0.0, 'A3': 0.0}
+    assert calls == [{'A1', 'A2', 'MISSING'}, {'A3'}]
+
+
+def test_wallet_price_and_price_earnings_share_one_request():
+    calls = list()
+
+    def quote_function(code):
+        calls.append(code)
+        return Quote(code, 2.0, 8.0)
+
+    g1 = InvestmentGroup('G1', 100.0)
+    a1 = Asset('A1', 1, 50.0)
+    a2 = Asset('A2', 3, 50.0)
+    g1.add_asset(a1)
+    g1.add_asset(a2)
+    w = Wallet()
+    w.add_investment_group(g1)
+
+    book = QuoteBook(quote_function)
+    w.update_asset_values(book.get_price)
+    w.update_asset_price_earnings(book.get_price_earnings)
+    assert calls == ['A1', 'A2']
+    assert a1.get_price() == 2.0
+    assert a2.get_price_earnings() == 8.0
+
+
+def test_asset_update_quote():
+    a = Asset('A1', 2, 10.0)
+    quote = a.update_quote(lambda x: Quote(x, 3.0, 7.0))
+    assert quote.get_code() == 'A1'
+    assert a.get_price() == 3.0
+    assert a.get_price_earnings() == 7.0
+    assert a.get_total_amount() == 6.0
+
+    def http_error(*args):
+        raise ValueError()
+
+    with pytest.raises(AssetPricingError):
+        a.update_quote(http_error)
@@ -0,0 +1,90 @@
+from conftest import FakeClock, counting_quote_function
+from prismfolio.asset import Asset
+from prismfolio.investmentgroup import InvestmentGroup
+from prismfolio.quote import Quote
+from prismfolio.quotecache import QuoteCache
+from prismfolio.wallet import Wallet
+import pytest
+
+
+def test_cache_hits_within_ttl():
+    calls = list()
+    clock = FakeClock()
+    cache = QuoteCache(counting_quote_function(calls), ttl=10.0, clock=clock)
+
+    assert cache.get_price('BBAS3') == 10.0
+    assert cache.get_price_earnings('BBAS3') == 3.0
+    clock.now = 9.9
+    assert cache.get_price('BBAS3') == 10.0
+    assert calls == ['BBAS3']
+    assert cache.get_hits() == 2
+    assert cache.get_misses() == 1
+    assert cache.get_hit_rate() == pytest.approx(2 / 3)
+
+
+def test_cache_expires_after_ttl():
+    calls = list()
+    clock = FakeClock()
+    cache = QuoteCache(counting_quote_function(calls), ttl=10.0, clock=clock)
+
+    cache.get_price('BBAS3')
+    assert 'BBAS3' in cache
+    clock.now = 10.0
+    assert 'BBAS3' not in cache
+    cache.get_price('BBAS3')
+    assert calls == ['BBAS3', 'BBAS3']
+
+
+def test_cache_lru_eviction():
+    calls = list()
+    cache = QuoteCache(counting_quote_function(calls), max_size=2, clock=FakeClock())
+
+    cache.get_price('A1')
+    cache.get_price('A2')
+    cache.get_price('A1')
+    cache.get_price('A3')
+    assert len(cache) == 2
+    assert 'A1' in cache
+    assert 'A2' not in cache
+
+    cache.invalidate('A1')
+    assert 'A1' not in cache
+
+
+def test_cache_with_bulk_function():
+    calls = list()
+
+    def bulk_quote_function(codes):
+        calls.append(set(codes))
+        return {x: Quote(x, 2.0) for x in codes}
+
+    cache = QuoteCache(lambda x: Quote(x, 1.0), bulk_quote_function, clock=FakeClock())
+    assert cache.get_prices(['A1', 'A2']) == {'A1': 2.0, 'A2': 2.0}
+    assert cache.get_prices(['A1', 'A3']) == {'A1': 2.0, 'A3': 2.0}
+    assert calls == [{'A1', 'A2'}, {'A3'}]
+
+
+def test_cache_shared_across_wallets():
+    calls = list()
+    cache = QuoteCache(counting_quote_function(calls), clock=FakeClock())
+
+    wallets = list()
+    for i in range(10):
+        g = InvestmentGroup('G', 100.0)
+        g.add_asset(Asset('BBAS3', i + 1, 50.0))
+        g.add_asset(Asset('MXRF11', i + 1, 50.0))
+        w = Wallet()
+        w.add_investment_group(g)
+        w.update_asset_values(cache.get_price)
+        w.update_asset_price_earnings(cache.get_price_earnings)
+        wallets.append(w)
+
+    assert sorted(calls) == ['BBAS3', 'MXRF11']
+    assert cache.get_misses() == 2
+    assert cache.get_hits() == 38
+
+
+@pytest.mark.parametrize("ttl,max_size", [(0, 10), (-1.0, 10), (10.0, 0)])
+def test_cache_invalid_arguments(ttl, max_size):
+    with pytest.raises(ValueError):
+        QuoteCache(lambda x: Quote(x, 1.0), ttl=ttl, max_size=max_size)
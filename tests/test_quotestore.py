@@ -0,0 +1,106 @@
+from conftest import FakeClock, counting_quote_function
+from prismfolio.asset import Asset
+from prismfolio.investmentgroup import InvestmentGroup
+from prismfolio.quote import Quote
+from prismfolio.quotestore import QuoteNotStored, QuoteStore
+from prismfolio.wallet import Wallet
+import pytest
+
+
+@pytest.fixture
+def store_path(tmp_path):
+    return str(tmp_path / 'quotes.sqlite')
+
+
+def test_store_writes_through_and_serves_fresh_quotes(store_path):
+    calls = list()
+    clock = FakeClock(1000.0)
+    with QuoteStore(store_path, counting_quote_function(calls), max_age=60.0,
+                    clock=clock) as store:
+        assert store.get_price('BBAS3') == 10.0
+        clock.now += 59.0
+        assert store.get_price_earnings('BBAS3') == 3.0
+        assert calls == ['BBAS3']
+
+        clock.now += 2.0
+        store.get_price('BBAS3')
+        assert calls == ['BBAS3', 'BBAS3']
+
+
+def test_store_persists_between_instances(store_path):
+    calls = list()
+    clock = FakeClock(1000.0)
+    with QuoteStore(store_path, counting_quote_function(calls), clock=clock) as store:
+        store.get_prices(['BBAS3', 'MXRF11'])
+
+    with QuoteStore(store_path, counting_quote_function(calls), clock=clock) as store:
+        assert store.get_prices(['BBAS3', 'MXRF11']) == {'BBAS3': 10.0, 'MXRF11': 10.0}
+
+    assert calls == ['BBAS3', 'MXRF11']
+
+
+def test_store_offline_serves_last_snapshot(store_path):
+    clock = FakeClock(1000.0)
+    with QuoteStore(store_path, counting_quote_function(list()), clock=clock) as store:
+        store.get_price('BBAS3')
+        clock.now += 10.0
+        store.put_quotes({'BBAS3': Quote('BBAS3', 12.0)})
+
+    clock.now += 1e6
+    with QuoteStore(store_path, clock=clock) as store:
+        assert store.is_offline()
+        assert store.get_price('BBAS3') == 12.0
+        assert store.get_prices(['BBAS3', 'MXRF11']) == {'BBAS3': 12.0}
+        with pytest.raises(QuoteNotStored):
+            store.get_price('MXRF11')
+
+
+def test_store_bulk_fetches_only_missing_codes(store_path):
+    calls = list()
+
+    def bulk_quote_function(codes):
+        calls.append(set(codes))
+        return {x: Quote(x, 3.0) for x in codes}
+
+    with QuoteStore(store_path, lambda x: Quote(x, 1.0), bulk_quote_function,
+                    clock=FakeClock(1000.0)) as store:
+        g = InvestmentGroup('G', 100.0)
+        g.add_asset(Asset('A1', 1, 50.0))
+        g.add_asset(Asset('A2', 1, 50.0))
+        w = Wallet()
+        w.add_investment_group(g)
+        w.update_asset_values_in_bulk(store.get_prices)
+        assert w.get_total_amount() == 6.0
+
+        assert store.get_prices(['A1', 'A3']) == {'A1': 3.0, 'A3': 3.0}
+        assert calls == [{'A1', 'A2'}, {'A3'}]
+
+
+def test_store_prune_keeps_latest(store_path):
+    clock = FakeClock(1000.0)
+    with QuoteStore(store_path, clock=clock) as store:
+        for i in range(5):
+            store.put_quotes({'BBAS3': Quote('BBAS3', float(i))}, fetched_at=float(i))
+        store.prune()
+        assert store._connection.execute("SELECT COUNT(*) FROM quotes").fetchone()[0] == 1
+        assert store.get_price('BBAS3') == 4.0
+
+        store.clear()
+        with pytest.raises(QuoteNotStored):
+            store.get_price('BBAS3')
+
+
+def test_store_falls_back_to_stale_quote(store_path):
+    clock = FakeClock(1000.0)
+
+    def failing_quote_function(code):
+        raise ConnectionError('upstream is down')
+
+    with QuoteStore(store_path, failing_quote_function, failing_quote_function, max_age=60.0,
+                    clock=clock) as store:
+        store.put_quotes({'BBAS3': Quote('BBAS3', 12.0)})
+        clock.now += 3600.0
+        assert store.get_price('BBAS3') == 12.0
+        assert store.get_prices(['BBAS3']) == {'BBAS3': 12.0}
+        with pytest.raises(ConnectionError):
+            store.get_price('MXRF11')
@@ -0,0 +1,184 @@
+from prismfolio.asset import AssetPricingError
+from prismfolio.server import SuggestionServer, SuggestionService, UnknownWalletError
+from prismfolio.throttling import CircuitOpenError
+from prismfolio.walletschema import WalletValidationError
+
+from http.client import HTTPConnection
+import json
+import pytest
+import requests
+import threading
+
+WALLET = {'investment_groups': [
+    {'name': 'Stocks', 'target_participation': 60.0, 'assets': [
+        {'code': 'BBAS3', 'quantity': 10, 'target_participation': 50.0},
+        {'code': 'ITSA4', 'quantity': 5, 'target_participation': 50.0}]},
+    {'name': 'REITs', 'target_participation': 40.0, 'assets': [
+        {'code': 'MXRF11', 'quantity': 20, 'target_participation': 100.0}]}]}
+
+
+def counting_bulk_function(calls):
+    def bulk_function(codes):
+        calls.append(set(codes))
+        return {x: float(len(x)) for x in codes}
+    return bulk_function
+
+
+@pytest.fixture
+def server():
+    _server = SuggestionServer(('127.0.0.1', 0), SuggestionService(counting_bulk_function([])))
+    _thread = threading.Thread(target=_server.serve_forever, daemon=True)
+    _thread.start()
+    yield _server
+    _server.shutdown()
+    _server.server_close()
+
+
+def request(server, method, path, body=None):
+    connection = HTTPConnection(*server.server_address[:2], timeout=5)
+    try:
+        connection.request(method, path, None if body is None else json.dumps(body))
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        connection.close()
+
+
+def test_service_suggests_from_memory():
+    calls = list()
+    service = SuggestionService(counting_bulk_function(calls))
+    service.add_wallet('w1', WALLET)
+    suggestion = service.suggest('w1', 100.0)
+
+    assert service.get_wallet_ids() == ['w1']
+    assert suggestion['contribution'] == 100.0
+    assert [x['name'] for x in suggestion['investment_groups']] == ['Stocks', 'REITs']
+    assert sum(x['investment'] for x in suggestion['investment_groups']) == pytest.approx(100.0)
+    assert calls == [{'BBAS3', 'ITSA4', 'MXRF11'}]
+
+
+def test_service_reuses_wallet_and_follows_changes():
+    service = SuggestionService(counting_bulk_function([]))
+    wallet = service.add_wallet('w1', WALLET)
+    first = service.suggest('w1', 100.0)
+    assert service.suggest('w1', 100.0) == first
+
+    wallet.get_investment_groups()[0].get_assets()[0].buy(100)
+    assert service.suggest('w1', 100.0) != first
+    assert service.get_wallet('w1') is wallet
+
+
+def test_service_errors():
+    service = SuggestionService(counting_bulk_function([]))
+    with pytest.raises(UnknownWalletError):
+        service.suggest('missing', 100.0)
+    with pytest.raises(UnknownWalletError):
+        service.remove_wallet('missing')
+    with pytest.raises(WalletValidationError):
+        service.add_wallet('w1', {'investment_groups': [{'name': ''}]})
+
+    service.add_wallet('w1', WALLET)
+    with pytest.raises(TypeError):
+        service.suggest('w1', '100')
+    for contribution in (float('nan'), float('inf'), float('-inf')):
+        with pytest.raises(ValueError):
+            service.suggest('w1', contribution)
+    service.remove_wallet('w1')
+    assert not service.has_wallet('w1')
+
+
+def test_server_routes(server):
+    assert request(server, 'GET', '/health') == (200, {'status': 'ok'})
+    assert request(server, 'PUT', '/wallets/w1', WALLET) == (201, {'id': 'w1'})
+    assert request(server, 'GET', '/wallets') == (200, {'wallets': ['w1']})
+
+    status, suggestion = request(server, 'GET', '/wallets/w1/suggestion?contribution=100')
+    assert status == 200
+    assert request(server, 'POST', '/wallets/w1/suggestion', {'contribution': 100}) == \
+        (200, suggestion)
+    assert suggestion == server.service.suggest('w1', 100.0)
+
+    assert request(server, 'DELETE', '/wallets/w1') == (200, {'id': 'w1'})
+    assert request(server, 'GET', '/wallets/w1/suggestion?contribution=100')[0] == 404
+
+
+def test_server_rejects_bad_requests(server):
+    assert request(server, 'GET', '/unknown')[0] == 404
+    assert request(server, 'PUT', '/wallets/w1', {'investment_groups': 1})[0] == 400
+    assert request(server, 'PUT', '/wallets/w1', WALLET)[0] == 201
+    assert request(server, 'GET', '/wallets/w1/suggestion')[0] == 400
+    assert request(server, 'POST', '/wallets/w1/suggestion', {'value': 1})[0] == 400
+    assert request(server, 'POST', '/wallets/w1/suggestion', {'contribution': '1'})[0] == 400
+    for contribution in ('nan', 'inf', '-Infinity'):
+        assert request(server, 'GET', f'/wallets/w1/suggestion?contribution={contribution}') \
+            == (400, {'error': f"Contribution value must be a finite number. "
+                               f"Got {float(contribution)}"})
+    connection = HTTPConnection(*server.server_address[:2], timeout=5)
+    connection.request('POST', '/wallets/w1/suggestion', '{"contribution": NaN}')
+    assert connection.getresponse().status == 400
+    connection.close()
+
+
+def test_server_keeps_connections_in_sync(server):
+    connection = HTTPConnection(*server.server_address[:2], timeout=5)
+    try:
+        connection.request('PUT', '/wallets/w1', json.dumps(WALLET))
+        response = connection.getresponse()
+        response.read()
+        assert response.status == 201
+        for method, path, headers in (('POST', '/nope', {}), ('PUT', '/wallets', {}),
+                                      ('GET', '/health', {}), ('DELETE', '/nope', {}),
+                                      ('POST', '/wallets/w1/suggestion',
+                                       {'Content-Length': 'many'})):
+            connection.request(method, path, '{"contribution": 1}', headers)
+            response = connection.getresponse()
+            response.read()
+            assert response.getheader('Connection') == 'close'
+
+            connection.request('GET', '/health')
+            response = connection.getresponse()
+            assert (response.status, json.loads(response.read())) == (200, {'status': 'ok'})
+            assert response.getheader('Connection') is None
+
+        connection.request('POST', '/wallets/w1/suggestion', '{"contribution": 1}')
+        response = connection.getresponse()
+        assert response.status == 200 and response.getheader('Connection') is None
+        response.read()
+        connection.request('GET', '/health')
+        assert connection.getresponse().status == 200
+    finally:
+        connection.close()
+
+
+def test_server_reports_upstream_pricing_failures_as_bad_gateway(server):
+    errors = [requests.HTTPError('503 Server Error'), CircuitOpenError('circuit is open'),
+              requests.ConnectionError('connection refused'),
+              requests.JSONDecodeError('Expecting value', '<html>', 0)]
+
+    def failing_bulk_function(codes):
+        raise errors.pop(0)
+
+    server.service = SuggestionService(failing_bulk_function)
+    server.service.add_wallet('w1', WALLET)
+    for message in ('503 Server Error', 'circuit is open', 'connection refused',
+                    'Expecting value'):
+        status, body = request(server, 'GET', '/wallets/w1/suggestion?contribution=100')
+        assert status == 502
+        assert message in body['error']
+
+    server.service = SuggestionService(lambda codes: {'BBAS3': 1.0})
+    server.service.add_wallet('w1', WALLET)
+    status, body = request(server, 'POST', '/wallets/w1/suggestion', {'contribution': 100})
+    assert status == 502 and 'ITSA4' in body['error']
+    with pytest.raises(AssetPricingError):
+        server.service.suggest('w1', 100.0)
+
+
+def test_server_reports_computation_failures_as_internal_errors(server):
+    def failing_suggestion_class(wallet, contribution):
+        raise ValueError('broken suggestion')
+
+    server.service = SuggestionService(counting_bulk_function([]), failing_suggestion_class)
+    server.service.add_wallet('w1', WALLET)
+    assert request(server, 'GET', '/wallets/w1/suggestion?contribution=100') == \
+        (500, {'error': 'broken suggestion'})
@@ -0,0 +1,53 @@
+from conftest import make_wallet
+from prismfolio.investmentsuggestion import WalletInvestmentSuggestion
+from prismfolio.suggestionoutput import (ASSET_FIELDS, CSV, JSON, NDJSON, TABLE,
+                                         format_suggestion, iter_asset_rows, write_suggestion)
+
+import csv
+import io
+import json
+import pytest
+
+
+@pytest.fixture
+def suggestion():
+    return WalletInvestmentSuggestion(make_wallet(), 100.0)
+
+
+def test_table_output(suggestion):
+    lines = format_suggestion(suggestion, TABLE).splitlines()
+    assert len(lines) == 7
+    assert lines[0] == 'Stocks\t Investment: R$ {:5.2f}'.format(
+        suggestion.to_dict()['investment_groups'][0]['investment'])
+    assert lines[1].startswith('asset\t| investment')
+    assert lines[2].startswith('BBAS3 \t| R$ ')
+    assert lines[6].startswith('MXRF11\t| R$ ')
+
+
+def test_json_output(suggestion):
+    assert json.loads(format_suggestion(suggestion, JSON)) == suggestion.to_dict()
+    assert json.loads(format_suggestion(suggestion, JSON, wallet_id='w1'))['wallet'] == 'w1'
+
+
+def test_ndjson_output(suggestion):
+    rows = [json.loads(x) for x in format_suggestion(suggestion, NDJSON).splitlines()]
+    assert rows == list(iter_asset_rows(suggestion))
+    assert [(x['group'], x['code']) for x in rows] == \
+        [('Stocks', 'BBAS3'), ('Stocks', 'ITSA4'), ('REITs', 'MXRF11')]
+    assert set(rows[0]) == set(ASSET_FIELDS)
+
+
+def test_csv_output(suggestion):
+    rows = list(csv.DictReader(io.StringIO(format_suggestion(suggestion, CSV))))
+    assert [x['code'] for x in rows] == ['BBAS3', 'ITSA4', 'MXRF11']
+    assert float(rows[0]['investment']) == \
+        suggestion.to_dict()['investment_groups'][0]['assets'][0]['investment']
+
+    output = io.StringIO()
+    write_suggestion(suggestion, output, CSV, header=False, wallet_id=7)
+    assert output.getvalue().splitlines()[0].startswith('7,Stocks,BBAS3,')
+
+
+def test_unknown_output_format(suggestion):
+    with pytest.raises(ValueError):
+        format_suggestion(suggestion, 'xml')
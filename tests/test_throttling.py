@@ -0,0 +1,80 @@
+from conftest import FakeClock
+from prismfolio.throttling import CircuitBreaker, CircuitOpenError, RateLimiter, TokenBucket
+import pytest
+
+
+def test_token_bucket():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2.0, capacity=2, clock=clock)
+    assert bucket.try_acquire()
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+    assert bucket.get_wait_time() == pytest.approx(0.5)
+
+    clock.now = 0.5
+    assert bucket.try_acquire()
+    clock.now = 100.0
+    assert bucket.try_acquire()
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+
+
+@pytest.mark.parametrize("rate,capacity", [(0, 1), (-1.0, 1), (1.0, 0)])
+def test_token_bucket_invalid_arguments(rate, capacity):
+    with pytest.raises(ValueError):
+        TokenBucket(rate, capacity)
+
+
+def test_rate_limiter_per_second():
+    clock = FakeClock()
+    limiter = RateLimiter(per_second=5, clock=clock, sleep=clock.sleep)
+    for _ in range(25):
+        limiter.acquire()
+    assert clock.now == pytest.approx(4.0)
+
+
+def test_rate_limiter_per_minute():
+    clock = FakeClock()
+    limiter = RateLimiter(per_second=100, per_minute=60, clock=clock, sleep=clock.sleep)
+    for _ in range(61):
+        limiter.acquire()
+    assert clock.now == pytest.approx(1.0)
+
+    limiter = RateLimiter(clock=clock, sleep=clock.sleep)
+    limiter.acquire()
+
+
+def test_circuit_breaker_opens_and_recovers():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10.0, clock=clock)
+
+    for _ in range(2):
+        breaker.before_call()
+        breaker.record_failure()
+    assert breaker.get_state() == CircuitBreaker.CLOSED
+
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.get_state() == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    clock.now = 10.0
+    assert breaker.get_state() == CircuitBreaker.HALF_OPEN
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record_success()
+    assert breaker.get_state() == CircuitBreaker.CLOSED
+    breaker.before_call()
+
+
+def test_circuit_breaker_reopens_when_trial_fails():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10.0, clock=clock)
+    breaker.record_failure()
+    clock.now = 10.0
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.get_state() == CircuitBreaker.OPEN
@@ -0,0 +1,138 @@
+from conftest import make_random_wallet
+from prismfolio.asset import Asset
+from prismfolio.investmentgroup import InvestmentGroup
+from prismfolio.investmentsuggestion import WalletInvestmentSuggestion
+from prismfolio.vectorizedsuggestion import (ContributionSweep, VectorizedInvestmentSuggestion,
+                                               WalletArrays, allocate_amounts, get_group_matrix,
+                                               sum_by_group)
+from prismfolio.wallet import Wallet
+import numpy as np
+import pytest
+
+
+def assert_matches_object_engine(w, contribution):
+    expected = WalletInvestmentSuggestion(w, contribution)
+    actual = VectorizedInvestmentSuggestion(w, contribution)
+
+    group_investments = actual.get_group_investments()
+    asset_investments = actual.get_asset_investments()
+    shares = actual.get_suggested_shares_buying()
+    remainders = actual.get_remainders()
+    i = 0
+    for g, group_suggestion in enumerate(expected):
+        assert group_investments[g] == pytest.approx(group_suggestion.get_suggested_investment())
+        for asset_suggestion in group_suggestion:
+            assert asset_investments[i] == pytest.approx(
+                asset_suggestion.get_suggested_investment())
+            assert shares[i] == asset_suggestion.get_suggested_shares_buying()
+            assert remainders[i] == pytest.approx(asset_suggestion.get_remainder(), abs=1e-6)
+            i += 1
+
+    assert actual.get_remainder() == pytest.approx(expected.get_remainder(), abs=1e-6)
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("contribution", [0, 100, 2200.5, 1e6])
+def test_matches_object_engine(seed, contribution):
+    assert_matches_object_engine(
+        make_random_wallet(seed, assets_per_group=8, vary_group_sizes=True), contribution)
+
+
+def test_single_group_and_multiple_asset():
+    w = Wallet()
+    g1 = InvestmentGroup('G1', 100.0)
+    for code in ['A1', 'A2', 'A3', 'A4', 'A5']:
+        g1.add_asset(Asset(code, 1, 20.0))
+    w.add_investment_group(g1)
+    prices = {'A1': 1.0, 'A2': 2.0, 'A3': 3.0, 'A4': 4.0, 'A5': 7.0}
+    w.update_asset_values(prices.get)
+
+    suggestion = VectorizedInvestmentSuggestion(w, 117)
+    assert suggestion.get_group_investments().tolist() == [117.0]
+    assert suggestion.get_asset_investments().sum() == pytest.approx(117.0)
+    assert_matches_object_engine(w, 117)
+
+
+def test_group_without_assets():
+    w = Wallet()
+    g1 = InvestmentGroup('G1', 50.0)
+    g1.add_asset(Asset('A1', 10, 100.0))
+    w.add_investment_group(g1)
+    w.add_investment_group(InvestmentGroup('G2', 50.0))
+    w.update_asset_values(lambda x: 10.0)
+
+    suggestion = VectorizedInvestmentSuggestion(w, 100)
+    assert len(suggestion) == 2
+    assert suggestion.get_group_investments().tolist() == pytest.approx([0.0, 100.0])
+    assert suggestion.get_asset_investments().tolist() == [0.0]
+    assert suggestion.get_group_remainders().tolist() == [0.0, 0.0]
+
+
+def test_empty_wallet():
+    suggestion = VectorizedInvestmentSuggestion(Wallet(), 100)
+    assert len(suggestion) == 0
+    assert suggestion.get_remainder() == 0
+
+
+def test_wallet_arrays():
+    w = make_random_wallet(0, number_of_groups=3, assets_per_group=8,
+                           vary_group_sizes=True)
+    arrays = WalletArrays.from_wallet(w)
+    assert arrays.get_number_of_groups() == 3
+    assert arrays.get_group_names() == ['G0', 'G1', 'G2']
+    assert arrays.get_codes()[0] == 'A0_0'
+    assert arrays.get_number_of_assets() == sum(len(x.get_assets())
+                                                for x in w.get_investment_groups())
+    assert np.all(np.diff(arrays.get_group_index()) >= 0)
+    assert float((arrays.get_prices() * arrays.get_quantities()).sum()) == \
+        pytest.approx(w.get_total_amount())
+
+    suggestion = VectorizedInvestmentSuggestion(arrays, 100)
+    assert suggestion.get_wallet_arrays() is arrays
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_contribution_sweep_matches_single_suggestions(seed):
+    w = make_random_wallet(seed, assets_per_group=8, vary_group_sizes=True)
+    contributions = [0, 1000, 2000, 7500.5, 50000]
+    sweep = ContributionSweep(w, contributions)
+
+    assert len(sweep) == 5
+    assert sweep.get_asset_investments().shape == (5, WalletArrays.from_wallet(w)
+                                                   .get_number_of_assets())
+    for i, contribution in enumerate(contributions):
+        single = VectorizedInvestmentSuggestion(w, contribution)
+        np.testing.assert_allclose(sweep.get_group_investments()[i],
+                                   single.get_group_investments())
+        np.testing.assert_allclose(sweep.get_asset_investments()[i],
+                                   single.get_asset_investments())
+        np.testing.assert_array_equal(sweep.get_suggested_shares_buying()[i],
+                                      single.get_suggested_shares_buying())
+        assert sweep.get_remainder()[i] == pytest.approx(single.get_remainder(), abs=1e-6)
+
+
+def test_contribution_sweep_spends_each_contribution():
+    w = make_random_wallet(3, assets_per_group=8, vary_group_sizes=True)
+    contributions = np.arange(1000, 51000, 1000)
+    sweep = ContributionSweep(w, contributions)
+    np.testing.assert_allclose(sweep.get_asset_investments().sum(axis=1), contributions)
+    np.testing.assert_array_equal(sweep.get_contributions(), contributions)
+
+
+def test_allocate_amounts_with_group_matrix():
+    arrays = WalletArrays.from_wallet(make_random_wallet(3, assets_per_group=8,
+                                                         vary_group_sizes=True))
+    _groups = arrays.get_number_of_groups()
+    _matrix = get_group_matrix(arrays.get_group_index(), _groups)
+    _rng = np.random.default_rng(0)
+    asset_amounts = arrays.get_prices() * _rng.integers(0, 50, (4, arrays.get_number_of_assets()))
+    group_amounts = sum_by_group(asset_amounts, arrays.get_group_index(), _groups)
+    assert sum_by_group(asset_amounts, arrays.get_group_index(), _groups, _matrix) == \
+        pytest.approx(group_amounts)
+
+    _arguments = (asset_amounts, group_amounts, group_amounts.sum(axis=-1, keepdims=True),
+                  arrays.get_asset_targets(), arrays.get_group_targets(), arrays.get_group_index(),
+                  np.array([0.0, 10.0, 100.0, 1000.0]))
+    for expected, actual in zip(allocate_amounts(*_arguments),
+                                allocate_amounts(*_arguments, group_matrix=_matrix)):
+        assert actual == pytest.approx(expected)
@@ -1,7 +1,9 @@
 from prismfolio.wallet import Wallet
-from prismfolio.asset import Asset
+from prismfolio.walletschema import WalletValidationError
+from prismfolio.asset import Asset, AssetPricingError
 from prismfolio.investmentgroup import InvestmentGroup
 import pytest
+import time
 
 
 def test_wallet_complete_intialization():
@@ -21,3 +23,225 @@ def test_wallet_complete_intialization():
 
     w.update_asset_values(lambda _: 1.0)
     w.update_asset_price_earnings(lambda _: 1.0)
+
+
+def test_wallet_bulk_pricing():
+    g1 = InvestmentGroup('G1', 60.0)
+    a1 = Asset('A1', 2, 100.0)
+    g1.add_asset(a1)
+
+    g2 = InvestmentGroup('G2', 40.0)
+    a2 = Asset('A2', 10, 20.0)
+    a3 = Asset('A3', 5, 80.0)
+    g2.add_asset(a2)
+    g2.add_asset(a3)
+
+    w = Wallet()
+    w.add_investment_group(g1)
+    w.add_investment_group(g2)
+
+    requested = list()
+
+    def bulk_pricing_function(codes):
+        requested.append(set(codes))
+        return {'A1': 1.0, 'A2': 2.0, 'A3': 3.0}
+
+    assert w.get_asset_codes() == {'A1', 'A2', 'A3'}
+    w.update_asset_values_in_bulk(bulk_pricing_function)
+    assert requested == [{'A1', 'A2', 'A3'}]
+    assert a1.get_price() == 1.0
+    assert a2.get_price() == 2.0
+    assert a3.get_price() == 3.0
+    assert w.get_total_amount() == 2 * 1.0 + 10 * 2.0 + 5 * 3.0
+
+
+def test_wallet_bulk_pricing_with_missing_asset():
+    g1 = InvestmentGroup('G1', 100.0)
+    g1.add_asset(Asset('A1', 2, 50.0))
+    g1.add_asset(Asset('A2', 2, 50.0))
+
+    w = Wallet()
+    w.add_investment_group(g1)
+
+    with pytest.raises(AssetPricingError):
+        w.update_asset_values_in_bulk(lambda codes: {'A1': 1.0})
+
+
+def test_wallet_concurrent_pricing():
+    w = Wallet()
+    assets = list()
+    for i in range(4):
+        g = InvestmentGroup('G{}'.format(i), 25.0)
+        for j in range(5):
+            a = Asset('A{}{}'.format(i, j), i + j + 1, 20.0)
+            g.add_asset(a)
+            assets.append(a)
+        w.add_investment_group(g)
+
+    def pricing_function(code):
+        time.sleep(0.01)
+        return float(code[1:])
+
+    w.update_asset_values(pricing_function, max_workers=8)
+    for a in assets:
+        assert a.get_price() == float(a.get_code()[1:])
+
+    for g in w.get_investment_groups():
+        assert sum(x.get_current_participation() for x in g.get_assets()) == pytest.approx(100.0)
+
+
+def test_wallet_concurrent_pricing_error_is_per_asset():
+    g1 = InvestmentGroup('G1', 100.0)
+    g1.add_asset(Asset('A1', 1, 50.0))
+    g1.add_asset(Asset('BAD', 1, 50.0))
+    w = Wallet()
+    w.add_investment_group(g1)
+
+    def pricing_function(code):
+        if code == 'BAD':
+            raise ValueError('no quote')
+        return 1.0
+
+    with pytest.raises(AssetPricingError, match='BAD'):
+        w.update_asset_values(pricing_function, max_workers=2)
+
+
+def test_wallet_prices_each_code_once():
+    g1 = InvestmentGroup('G1', 50.0)
+    a1 = Asset('ETF', 1, 50.0)
+    a2 = Asset('A2', 1, 50.0)
+    g1.add_asset(a1)
+    g1.add_asset(a2)
+
+    g2 = InvestmentGroup('G2', 50.0)
+    a3 = Asset('ETF', 4, 100.0)
+    g2.add_asset(a3)
+
+    w = Wallet()
+    w.add_investment_group(g1)
+    w.add_investment_group(g2)
+
+    calls = list()
+
+    def pricing_function(code):
+        calls.append(code)
+        return 2.0
+
+    w.update_asset_values(pricing_function)
+    assert sorted(calls) == ['A2', 'ETF']
+    assert a1.get_price() == a3.get_price() == 2.0
+
+    calls.clear()
+    w.update_asset_values(pricing_function, max_workers=4)
+    assert sorted(calls) == ['A2', 'ETF']
+
+    calls.clear()
+    w.update_asset_price_earnings(pricing_function)
+    assert sorted(calls) == ['A2', 'ETF']
+    assert a3.get_price_earnings() == 2.0
+
+
+def test_wallet_asset_index():
+    g1 = InvestmentGroup('G1', 50.0)
+    a1 = Asset('ETF', 1, 100.0)
+    g1.add_asset(a1)
+    g2 = InvestmentGroup('G2', 50.0)
+    a2 = Asset('ETF', 1, 50.0)
+    a3 = Asset('A3', 1, 50.0)
+    g2.add_asset(a2)
+    g2.add_asset(a3)
+
+    w = Wallet()
+    w.add_investment_group(g1)
+    assert w.get_assets_by_code('ETF') == [a1]
+
+    w.add_investment_group(g2)
+    assert w.get_assets_by_code('ETF') == [a1, a2]
+    assert w.get_assets_by_code('A3') == [a3]
+    assert w.get_assets_by_code('UNKNOWN') == []
+    assert w.get_asset_codes() == {'ETF', 'A3'}
+
+
+def test_wallet_asset_index_is_rebuilt_only_after_layout_changes(monkeypatch):
+    indexed = list()
+    _index_assets = Wallet._index_assets
+
+    def counting_index_assets(self):
+        indexed.append(1)
+        return _index_assets(self)
+
+    monkeypatch.setattr(Wallet, '_index_assets', counting_index_assets)
+    g1 = InvestmentGroup('G1', 100.0)
+    g1.add_asset(Asset('A1', 1, 100.0))
+    w = Wallet()
+    w.add_investment_group(g1)
+    for _ in range(3):
+        w.update_asset_values_in_bulk(lambda codes: {x: 1.0 for x in codes})
+        w.update_asset_price_earnings(lambda _: 2.0)
+    assert len(indexed) == 1
+
+    g1.add_asset(Asset('A2', 1, 0.0))
+    assert w.get_asset_codes() == {'A1', 'A2'}
+    assert len(indexed) == 2
+
+
+def test_wallet_total_amount_follows_asset_changes():
+    g1 = InvestmentGroup('G1', 50.0)
+    a1 = Asset('A1', 1, 100.0)
+    g1.add_asset(a1)
+    g2 = InvestmentGroup('G2', 50.0)
+    a2 = Asset('A2', 2, 100.0)
+    g2.add_asset(a2)
+
+    w = Wallet()
+    w.add_investment_group(g1)
+    w.add_investment_group(g2)
+    w.update_asset_values(lambda x: 1.0)
+    assert w.get_total_amount() == 3.0
+
+    a2.buy(3)
+    assert w.get_total_amount() == 6.0
+    a1.update_price(lambda x: 10.0)
+    assert w.get_total_amount() == 15.0
+
+    a3 = Asset('A3', 1, 50.0)
+    a3.update_price(lambda x: 7.0)
+    g2.add_asset(a3)
+    assert w.get_total_amount() == 22.0
+    assert w.get_assets_by_code('A3') == [a3]
+
+
+def test_wallet_from_dict_in_bulk_matches_from_dict():
+    wallet_data = {'investment_groups': [
+        {'name': 'G{}'.format(i), 'target_participation': 25.0,
+         'assets': [{'code': 'A{}'.format(j), 'quantity': i + j + 1,
+                     'target_participation': 20.0} for j in range(5)]}
+        for i in range(4)]}
+    strict = Wallet.from_dict(wallet_data)
+    bulk = Wallet.from_dict_in_bulk(wallet_data)
+    for w in (strict, bulk):
+        w.update_asset_values(lambda x: float(len(x)))
+
+    assert bulk.get_total_amount() == strict.get_total_amount()
+    assert bulk.get_asset_codes() == strict.get_asset_codes()
+    assert len(bulk.get_assets_by_code('A1')) == 4
+    for bulk_group, strict_group in zip(bulk.get_investment_groups(),
+                                        strict.get_investment_groups()):
+        assert bulk_group.get_name() == strict_group.get_name()
+        assert bulk_group.get_target_participation() == strict_group.get_target_participation()
+        assert [x.get_current_participation() for x in bulk_group.get_assets()] == \
+            [x.get_current_participation() for x in strict_group.get_assets()]
+
+    bulk.get_investment_groups()[0].get_assets()[0].buy(10)
+    strict.get_investment_groups()[0].get_assets()[0].buy(10)
+    assert bulk.get_total_amount() == strict.get_total_amount()
+
+
+def test_wallet_from_dict_in_bulk_reports_all_errors():
+    with pytest.raises(WalletValidationError) as error:
+        Wallet.from_dict_in_bulk({'investment_groups': [
+            {'name': 'G', 'target_participation': 100.0,
+             'assets': [{'code': '', 'quantity': 1, 'target_participation': 50.0},
+                        {'code': 'A', 'quantity': -1, 'target_participation': 50.0}]}]})
+    assert len(error.value.get_errors()) == 2
+    assert isinstance(error.value, ValueError)
@@ -0,0 +1,109 @@
+from prismfolio import walletloader
+from prismfolio.wallet import Wallet
+
+import io
+import json
+import pytest
+
+
+def make_wallet_data(code):
+    return {'investment_groups': [
+        {'name': 'Stocks', 'target_participation': 100.0,
+         'assets': [{'code': code, 'quantity': 1, 'target_participation': 100.0}]}]}
+
+
+DOCUMENTS = [make_wallet_data('A{}'.format(i)) for i in range(20)]
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 64, walletloader.CHUNK_SIZE])
+@pytest.mark.parametrize('text', [
+    json.dumps(DOCUMENTS),
+    json.dumps(DOCUMENTS, indent=4),
+    '\n'.join(json.dumps(x) for x in DOCUMENTS) + '\n',
+    '\n\n'.join(json.dumps(x, indent=2) for x in DOCUMENTS),
+])
+def test_iter_documents(text, chunk_size):
+    documents = walletloader.iter_documents(io.StringIO(text), chunk_size=chunk_size)
+    assert list(documents) == DOCUMENTS
+
+
+def test_iter_documents_ndjson():
+    text = '\n'.join(json.dumps(x) for x in DOCUMENTS) + '\n\n'
+    documents = walletloader.iter_documents(io.StringIO(text), walletloader.NDJSON)
+    assert list(documents) == DOCUMENTS
+
+
+def test_iter_documents_single_and_empty():
+    assert list(walletloader.iter_documents(io.StringIO(json.dumps(DOCUMENTS[0])))) == \
+        DOCUMENTS[:1]
+    assert list(walletloader.iter_documents(io.StringIO('  [ ] '))) == []
+    assert list(walletloader.iter_documents(io.StringIO(''))) == []
+
+
+def test_iter_documents_from_path(tmp_path):
+    path = tmp_path / 'wallets.json'
+    path.write_text(json.dumps(DOCUMENTS), encoding='utf-8')
+    assert list(walletloader.iter_documents(str(path))) == DOCUMENTS
+
+
+@pytest.mark.parametrize('text, format', [
+    ('[{"a": 1} {"b": 2}]', None),
+    ('[{"a": 1},', None),
+    ('[{"a": 1}] {"b": 2}', None),
+    ('{"a": 1}\n{"b": ', None),
+    ('{"a": 1}\n{"b": \n', walletloader.NDJSON),
+])
+def test_iter_documents_invalid(text, format):
+    with pytest.raises(walletloader.WalletDocumentError):
+        list(walletloader.iter_documents(io.StringIO(text), format, chunk_size=4))
+
+
+def test_iter_documents_invalid_format():
+    with pytest.raises(ValueError):
+        list(walletloader.iter_documents(io.StringIO('[]'), 'xml'))
+
+
+def test_iter_documents_is_lazy_and_bounded():
+    text = json.dumps([make_wallet_data('A{}'.format(i)) for i in range(5000)])
+    decoder = walletloader._JsonStreamDecoder(io.StringIO(text), 256)
+    documents = iter(decoder)
+    for _ in range(1000):
+        next(documents)
+        assert len(decoder._buffer) < 1024
+    assert len(list(documents)) == 4000
+
+
+class CountingReader(io.StringIO):
+    def __init__(self, text):
+        super().__init__(text)
+        self.read_size = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.read_size += len(data)
+        return data
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 5, 7, 64])
+def test_iter_documents_tokens_split_across_chunks(chunk_size):
+    documents = [{'a': True, 'b': None, 'c': False, 'd': -1.5e-3, 'e': 'caf\u00e9 "x"'}] * 3
+    text = json.dumps(documents, ensure_ascii=True)
+    assert list(walletloader.iter_documents(io.StringIO(text), chunk_size=chunk_size)) == \
+        documents
+
+
+@pytest.mark.parametrize('malformed', ['{"a": ]}', '{"a": 1,, "b": 2}', '{"a": "x\n"}'])
+def test_iter_documents_malformed_stops_reading(malformed):
+    valid = [json.dumps(make_wallet_data('A{}'.format(i))) for i in range(20000)]
+    text = '[' + ', '.join(valid[:1] + [malformed] + valid) + ']'
+    reader = CountingReader(text)
+    with pytest.raises(walletloader.WalletDocumentError):
+        list(walletloader.iter_documents(reader, chunk_size=1024))
+    assert reader.read_size <= 4 * 1024
+
+
+def test_iter_wallets():
+    wallets = list(walletloader.iter_wallets(io.StringIO(json.dumps(DOCUMENTS))))
+    assert len(wallets) == 20
+    assert all(isinstance(x, Wallet) for x in wallets)
+    assert wallets[3].get_asset_codes() == {'A3'}
@@ -0,0 +1,55 @@
+from prismfolio.walletschema import validate_wallet_dict
+
+import pytest
+
+
+def make_wallet_data(assets, group_target_participation=100.0):
+    return {'investment_groups': [{'name': 'Stocks',
+                                   'target_participation': group_target_participation,
+                                   'assets': assets}]}
+
+
+def test_validate_wallet_dict_valid():
+    errors, warnings = validate_wallet_dict(make_wallet_data(
+        [{'code': 'BBAS3', 'quantity': 1, 'target_participation': 60.0},
+         {'code': 'ITSA4', 'quantity': 0, 'target_participation': 40.0}]))
+    assert errors == []
+    assert warnings == []
+
+
+def test_validate_wallet_dict_collects_all_errors():
+    errors, _ = validate_wallet_dict({'investment_groups': [
+        {'name': '', 'target_participation': 10,
+         'assets': [{'code': 'BBAS3', 'quantity': -1, 'target_participation': 50.0},
+                    {'code': 1, 'quantity': True, 'target_participation': 150.0},
+                    'ITSA4']},
+        {'name': 'Funds', 'target_participation': 50.0, 'assets': None},
+        []]})
+    assert errors == [
+        "investment_groups[0].name: Name value must be a non empty string.",
+        "investment_groups[0].target_participation: Participation should be a float value. "
+        "Received 10",
+        "investment_groups[0].assets[0].quantity: Quantity value can't be negative. Received -1",
+        "investment_groups[0].assets[1].code: Code value must be a string. Got <class 'int'> 1",
+        "investment_groups[0].assets[1].quantity: Quantity value must be an integer. "
+        "Got <class 'bool'> True",
+        "investment_groups[0].assets[1].target_participation: Participation value should not "
+        "be higher than 100%. Received 150.0.",
+        "investment_groups[0].assets[2]: Expected a dict. Got a <class 'str'>",
+        "investment_groups[1].assets: Expected a list. Got a <class 'NoneType'>",
+        "investment_groups[2]: Expected a dict. Got a <class 'list'>"]
+
+
+@pytest.mark.parametrize('dict_data', [None, [], {}, {'investment_groups': {}}])
+def test_validate_wallet_dict_invalid_document(dict_data):
+    errors, _ = validate_wallet_dict(dict_data)
+    assert len(errors) == 1
+
+
+def test_validate_wallet_dict_warnings():
+    _, warnings = validate_wallet_dict(make_wallet_data(
+        [{'code': 'BBAS3', 'quantity': 1, 'target_participation': 60.0}], 90.0))
+    assert warnings == [
+        "The total asset participation on group 'Stocks' is 60.00%, which is lower than 100%.",
+        "The total investment groups participation on wallet is 90.00%, which is lower than "
+        "100%."]
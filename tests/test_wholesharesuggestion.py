@@ -0,0 +1,93 @@
+from conftest import make_random_wallet
+from prismfolio import wholesharesuggestion
+from prismfolio.asset import Asset
+from prismfolio.investmentgroup import InvestmentGroup
+from prismfolio.investmentsuggestion import WalletInvestmentSuggestion
+from prismfolio.wholesharesuggestion import WholeShareInvestmentSuggestion
+from prismfolio.wallet import Wallet
+import heapq
+import pytest
+import types
+
+
+def get_squared_deviation(wallet, suggestion, contribution):
+    total = wallet.get_total_amount() + contribution
+    deviation = 0.0
+    for group_suggestion in suggestion:
+        group_weight = 0.01 * group_suggestion.get_investment_group().get_target_participation()
+        for asset_suggestion in group_suggestion:
+            asset = asset_suggestion.get_asset()
+            target = group_weight * 0.01 * asset.get_target_participation() * total
+            amount = (asset.get_quantity() + asset_suggestion.get_suggested_shares_buying()) * \
+                asset.get_price()
+            deviation += (target - amount) ** 2
+    return deviation
+
+
+def get_spent(suggestion):
+    return sum(x.get_suggested_shares_buying() * x.get_asset().get_price()
+               for group_suggestion in suggestion for x in group_suggestion)
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("contribution", [100, 2200, 50000])
+def test_whole_shares_spend_more_and_reduce_deviation(seed, contribution):
+    w = make_random_wallet(seed)
+    proportional = WalletInvestmentSuggestion(w, contribution)
+    whole_shares = WholeShareInvestmentSuggestion(w, contribution)
+
+    spent = get_spent(whole_shares)
+    assert spent <= contribution + 1e-6
+    assert spent >= get_spent(proportional) - 1e-6
+    assert whole_shares.get_remainder() == pytest.approx(contribution - spent, abs=1e-6)
+    assert get_squared_deviation(w, whole_shares, contribution) <= \
+        get_squared_deviation(w, proportional, contribution) + 1e-6
+
+    for group_suggestion in whole_shares:
+        assert group_suggestion.get_suggested_investment() == pytest.approx(
+            sum(x.get_suggested_investment() for x in group_suggestion))
+        for asset_suggestion in group_suggestion:
+            assert asset_suggestion.get_suggested_shares_buying() == \
+                int(asset_suggestion.get_suggested_shares_buying())
+            assert asset_suggestion.get_remainder() == pytest.approx(0, abs=1e-6)
+
+
+def test_whole_shares_with_expensive_shares():
+    w = Wallet()
+    g1 = InvestmentGroup('G1', 100.0)
+    a1 = Asset('A1', 1, 50.0)
+    a2 = Asset('A2', 1, 50.0)
+    g1.add_asset(a1)
+    g1.add_asset(a2)
+    w.add_investment_group(g1)
+    w.update_asset_values(lambda x: 60.0)
+
+    proportional = WalletInvestmentSuggestion(w, 100)
+    assert proportional.get_remainder() == 100
+
+    whole_shares = WholeShareInvestmentSuggestion(w, 100)
+    assert get_spent(whole_shares) == 60.0
+    assert whole_shares.get_remainder() == 40.0
+
+
+def test_whole_shares_heap_work_is_bounded_on_large_wallets(monkeypatch):
+    operations = {'heappush': 0, 'heappop': 0}
+
+    def counting(name):
+        def operation(*args):
+            operations[name] += 1
+            return getattr(heapq, name)(*args)
+        return operation
+
+    monkeypatch.setattr(wholesharesuggestion, 'heapq', types.SimpleNamespace(
+        heapify=heapq.heapify, heappush=counting('heappush'), heappop=counting('heappop')))
+    w = make_random_wallet(0, number_of_groups=10, assets_per_group=50, max_price=50.0)
+    suggestion = WholeShareInvestmentSuggestion(w, 1e6)
+    proportional = WalletInvestmentSuggestion(w, 1e6)
+    extra_shares = sum(x.get_suggested_shares_buying() - int(y.get_suggested_shares_buying())
+                       for group, proportional_group in zip(suggestion, proportional)
+                       for x, y in zip(group, proportional_group))
+
+    assert suggestion.get_remainder() < 50.0
+    assert operations['heappush'] == extra_shares <= 500
+    assert operations['heappop'] <= 500 + operations['heappush']